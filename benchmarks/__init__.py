@@ -0,0 +1,3 @@
+"""
+Microbenchmarks of the losuapi hot path, run with python -m benchmarks.
+"""
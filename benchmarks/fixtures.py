@@ -0,0 +1,356 @@
+"""
+Synthetic Osu! api response payloads shaped like real responses.
+
+Every generator is deterministic for a given seed and takes a size so the
+same payloads can be scaled up for load tests.
+"""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+EPOCH = datetime(2015, 1, 1, tzinfo=timezone.utc)
+MODS = ("HD", "DT", "HR", "NF", "EZ", "FL", "SO", "NC", "PF", "SD")
+COUNTRIES = ("US", "JP", "DE", "PL", "KR", "FR", "GB", "CA", "BR", "AU")
+
+
+def _date(rng: random.Random) -> str:
+    return (EPOCH + timedelta(seconds=rng.randrange(250_000_000))).isoformat()
+
+
+def _covers(beatmapset_id: int) -> dict:
+    base = f"https://assets.ppy.sh/beatmaps/{beatmapset_id}/covers"
+    return {
+        name: f"{base}/{name.replace('@2x', '')}{'@2x' if '@2x' in name else ''}.jpg"
+        for name in (
+            "cover",
+            "cover@2x",
+            "card",
+            "card@2x",
+            "list",
+            "list@2x",
+            "slimcover",
+            "slimcover@2x",
+        )
+    }
+
+
+def user_compact(rng: random.Random, user_id: int = None) -> dict:
+    user_id = user_id or rng.randrange(1, 30_000_000)
+    return {
+        "avatar_url": f"https://a.ppy.sh/{user_id}?1600000000.jpeg",
+        "country_code": rng.choice(COUNTRIES),
+        "default_group": "default",
+        "id": user_id,
+        "is_active": True,
+        "is_bot": False,
+        "is_deleted": False,
+        "is_online": rng.random() < 0.1,
+        "is_supporter": rng.random() < 0.3,
+        "last_visit": _date(rng),
+        "pm_friends_only": False,
+        "profile_colour": None,
+        "username": f"player{user_id}",
+    }
+
+
+def user_statistics(rng: random.Random, rank: int = None, user: bool = True) -> dict:
+    statistics = {
+        "grade_counts": {
+            key: rng.randrange(5000) for key in ("a", "s", "sh", "ss", "ssh")
+        },
+        "hit_accuracy": round(rng.uniform(90, 100), 4),
+        "is_ranked": True,
+        "level": {"current": rng.randrange(90, 110), "progress": rng.randrange(100)},
+        "maximum_combo": rng.randrange(1000, 8000),
+        "play_count": rng.randrange(10_000, 500_000),
+        "play_time": rng.randrange(100_000, 10_000_000),
+        "pp": round(rng.uniform(5000, 25000), 3),
+        "global_rank": rank or rng.randrange(1, 1_000_000),
+        "ranked_score": rng.randrange(10**9, 10**11),
+        "replays_watched_by_others": rng.randrange(100_000),
+        "total_hits": rng.randrange(10**6, 10**8),
+        "total_score": rng.randrange(10**10, 10**12),
+    }
+    if user:
+        statistics["user"] = user_compact(rng)
+    return statistics
+
+
+def beatmap_compact(rng: random.Random, beatmap_id: int = None) -> dict:
+    return {
+        "beatmapset_id": rng.randrange(1, 2_000_000),
+        "difficulty_rating": round(rng.uniform(1, 9), 2),
+        "id": beatmap_id or rng.randrange(1, 4_000_000),
+        "mode": "osu",
+        "status": "ranked",
+        "total_length": rng.randrange(60, 600),
+        "user_id": rng.randrange(1, 30_000_000),
+        "version": rng.choice(("Easy", "Normal", "Hard", "Insane", "Extra")),
+    }
+
+
+def beatmap(rng: random.Random, beatmap_id: int = None) -> dict:
+    compact = beatmap_compact(rng, beatmap_id)
+    return dict(
+        compact,
+        accuracy=round(rng.uniform(5, 10), 1),
+        ar=round(rng.uniform(5, 10), 1),
+        bpm=rng.choice((120, 150, 180, 200, 222.22)),
+        convert=False,
+        count_circles=rng.randrange(100, 2000),
+        count_sliders=rng.randrange(50, 1000),
+        count_spinners=rng.randrange(3),
+        cs=round(rng.uniform(3, 5), 1),
+        deleted_at=None,
+        drain=round(rng.uniform(4, 7), 1),
+        hit_length=compact["total_length"] - 5,
+        is_scoreable=True,
+        last_updated=_date(rng),
+        mode_int=0,
+        passcount=rng.randrange(10**6),
+        playcount=rng.randrange(10**7),
+        ranked=1,
+        url=f"https://osu.ppy.sh/beatmaps/{compact['id']}",
+    )
+
+
+def score(rng: random.Random) -> dict:
+    statistics = {
+        "count_50": rng.randrange(10),
+        "count_100": rng.randrange(50),
+        "count_300": rng.randrange(500, 2000),
+        "count_geki": rng.randrange(300),
+        "count_katu": rng.randrange(30),
+        "count_miss": rng.randrange(5),
+    }
+    return {
+        "id": rng.randrange(10**9, 4 * 10**9),
+        "best_id": rng.randrange(10**9, 4 * 10**9),
+        "user_id": rng.randrange(1, 30_000_000),
+        "accuracy": round(rng.uniform(0.9, 1), 6),
+        "mods": rng.sample(MODS[:6], rng.randrange(3)),
+        "score": rng.randrange(10**6, 10**8),
+        "max_combo": rng.randrange(500, 3000),
+        "perfect": rng.random() < 0.1,
+        "statistics": statistics,
+        "passed": True,
+        "pp": round(rng.uniform(100, 1000), 3),
+        "rank": rng.choice(("S", "SH", "A", "X")),
+        "created_at": _date(rng),
+        "mode": "osu",
+        "mode_int": 0,
+        "replay": rng.random() < 0.5,
+        "beatmap": beatmap_compact(rng),
+        "user": user_compact(rng),
+        "match": None,
+    }
+
+
+def beatmapset(rng: random.Random, beatmaps: int = 8) -> dict:
+    beatmapset_id = rng.randrange(1, 2_000_000)
+    return {
+        "artist": "Artist",
+        "artist_unicode": "アーティスト",
+        "covers": _covers(beatmapset_id),
+        "creator": "mapper",
+        "favourite_count": str(rng.randrange(10**5)),
+        "id": beatmapset_id,
+        "nsfw": False,
+        "play_count": rng.randrange(10**7),
+        "preview_url": f"//b.ppy.sh/preview/{beatmapset_id}.mp3",
+        "source": "",
+        "status": "ranked",
+        "title": "Title",
+        "title_unicode": "タイトル",
+        "user_id": rng.randrange(1, 30_000_000),
+        "video": False,
+        "beatmaps": [beatmap(rng) for _ in range(beatmaps)],
+        "ratings": [rng.randrange(1000) for _ in range(11)],
+        "availability": {"download_disabled": False, "more_information": None},
+        "bpm": 180,
+        "can_be_hyped": False,
+        "discussion_locked": False,
+        "hype": None,
+        "is_scoreable": True,
+        "last_updated": _date(rng),
+        "legacy_thread_url": "https://osu.ppy.sh/community/forums/topics/1",
+        "nominations": {"current": 2, "required": 2},
+        "ranked": 1,
+        "ranked_date": _date(rng),
+        "storyboard": False,
+        "submitted_date": _date(rng),
+        "tags": " ".join(f"tag{i}" for i in range(20)),
+    }
+
+
+def user(rng: random.Random, user_id: int = 2, history: int = 90) -> dict:
+    return dict(
+        user_compact(rng, user_id),
+        cover_url="https://assets.ppy.sh/user-profile-covers/2/cover.jpeg",
+        discord=None,
+        has_supported=True,
+        interests=None,
+        join_date=_date(rng),
+        kudosu={"total": 10, "available": 5},
+        location=None,
+        max_blocks=100,
+        max_friends=500,
+        occupation=None,
+        playmode="osu",
+        playstyle=["mouse", "keyboard"],
+        post_count=rng.randrange(10_000),
+        profile_order=["me", "recent_activity", "top_ranks", "medals", "historical"],
+        title=None,
+        title_url=None,
+        twitter=None,
+        website=None,
+        statistics=user_statistics(rng, user=False),
+        badges=[
+            {
+                "awarded_at": _date(rng),
+                "description": f"Tournament winner {i}",
+                "image_url": f"https://assets.ppy.sh/profile-badges/{i}.png",
+                "url": "",
+            }
+            for i in range(history // 6)
+        ],
+        monthly_playcounts=[
+            {
+                "start_date": f"{2010 + i // 12}-{i % 12 + 1:02}-01",
+                "count": rng.randrange(5000),
+            }
+            for i in range(history)
+        ],
+        rank_history={
+            "mode": "osu",
+            "data": [rng.randrange(1, 10**6) for _ in range(history)],
+        },
+        favourite_beatmapset_count=rng.randrange(500),
+        profile_colour=None,
+    )
+
+
+def rankings(
+    rng: random.Random, size: int = 50, page: int = 1, pages: int = 200
+) -> dict:
+    return {
+        "ranking": [
+            user_statistics(rng, rank=(page - 1) * size + i + 1) for i in range(size)
+        ],
+        "cursor": {"page": page + 1} if page < pages else None,
+        "total": size * pages,
+    }
+
+
+def beatmap_scores(rng: random.Random, size: int = 50) -> dict:
+    scores = [score(rng) for _ in range(size)]
+    return {"scores": scores, "userScore": {"position": 1, "score": scores[0]}}
+
+
+def scores(rng: random.Random, size: int = 100) -> list:
+    return [score(rng) for _ in range(size)]
+
+
+def attributes(rng: random.Random) -> dict:
+    return {
+        "attributes": {
+            "max_combo": rng.randrange(500, 3000),
+            "star_rating": round(rng.uniform(1, 9), 5),
+            "aim_difficulty": round(rng.uniform(1, 4), 5),
+            "approach_rate": 9.3,
+            "flashlight_difficulty": None,
+            "overall_difficulty": 8.5,
+            "slider_factor": 0.98,
+            "speed_difficulty": round(rng.uniform(1, 4), 5),
+            "great_hit_window": 29.3,
+            "score_multiplier": 1.0,
+        }
+    }
+
+
+def kudosu(rng: random.Random) -> dict:
+    return {
+        "id": rng.randrange(1, 10**6),
+        "action": rng.choice(("vote.give", "vote.reset", "give")),
+        "account": None,
+        "model": "beatmap_discussion",
+        "created_at": _date(rng),
+        "giver": {"url": "https://osu.ppy.sh/users/2", "username": "peppy"},
+        "post": {
+            "url": "https://osu.ppy.sh/beatmapsets/1/discussion",
+            "title": "Title",
+        },
+    }
+
+
+def event(rng: random.Random) -> dict:
+    return {
+        "created_at": _date(rng),
+        "id": rng.randrange(1, 10**9),
+        "type": "rank",
+        "scoreRank": rng.choice(("S", "A", "X")),
+        "rank": rng.randrange(1, 1000),
+        "mode": "osu",
+        "beatmap": {"title": "Artist - Title [Hard]", "url": "/b/75?m=0"},
+        "user": {"username": "peppy", "url": "/u/2", "previousUsername": None},
+    }
+
+
+def beatmap_playcount(rng: random.Random) -> dict:
+    compact = beatmap_compact(rng)
+    return {
+        "beatmap_id": compact["id"],
+        "beatmap": compact,
+        "beatmapset": beatmapset(rng, beatmaps=0),
+        "count": rng.randrange(1, 1000),
+    }
+
+
+def spotlights(rng: random.Random, size: int = 50) -> dict:
+    return {
+        "spotlights": [
+            {
+                "end_date": _date(rng),
+                "id": i,
+                "mode_specific": True,
+                "participant_count": rng.randrange(10**5),
+                "name": f"Spotlight {i}",
+                "start_date": _date(rng),
+                "type": rng.choice(("monthly", "spotlight", "theme")),
+            }
+            for i in range(1, size + 1)
+        ]
+    }
+
+
+def payloads(size: int = 50, seed: int = 0) -> dict:
+    """
+    Returns a decoded payload for every benchmarked response model.
+
+    Parameters:
+        - size: int - Number of items in list payloads (rankings, scores).
+        - seed: int - Seed of the generator.
+    """
+    from losuapi.types import (
+        Attributes,
+        BeatmapScores,
+        Beatmapset,
+        Rankings,
+        Score,
+        User,
+    )
+
+    rng = random.Random(seed)
+    return {
+        "User": (User, user(rng)),
+        "Rankings": (Rankings, rankings(rng, size)),
+        "BeatmapScores": (BeatmapScores, beatmap_scores(rng, size)),
+        "list[Score]": (list[Score], scores(rng, size * 2)),
+        "Beatmapset": (Beatmapset, beatmapset(rng)),
+        "Attributes": (Attributes, attributes(rng)),
+    }
+
+
+def encode(payload) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
@@ -0,0 +1,273 @@
+"""
+Load test of AsyncOsuApi against the local fake Osu! api server.
+
+Usage: python -m benchmarks.load [--callers N] [--requests N] [--mix CALLS]
+       [--url URL] [server options]
+
+Starts benchmarks.server in a subprocess (or uses --url), runs --callers
+concurrent coroutines that each make --requests client calls picked from
+--mix, then reports throughput, latency percentiles and memory.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import httpx
+
+from losuapi import AsyncOsuApi, Metrics, Retry
+
+from .server import add_server_arguments, server_options
+
+# client calls of the load, with the arguments of one call
+CALLS = {
+    # without a mode the client requests /users/{username}/
+    "user": lambda rng: {
+        "username": rng.randrange(1, 10**7),
+        "mode": rng.choice(("osu", "")),
+    },
+    "users": lambda rng: {"user_ids": rng.sample(range(1, 10**7), 50)},
+    "beatmap": lambda rng: {"beatmap_id": rng.randrange(1, 4 * 10**6)},
+    "beatmaps": lambda rng: {"beatmap_ids": rng.sample(range(1, 4 * 10**6), 50)},
+    "beatmap_scores": lambda rng: {"beatmap_id": rng.randrange(1, 4 * 10**6)},
+    "beatmap_attributes": lambda rng: {"beatmap_id": rng.randrange(1, 4 * 10**6)},
+    "user_scores": lambda rng: {
+        "user_id": rng.randrange(1, 10**7),
+        "Type": "best",
+        "limit": 100,
+    },
+    "user_beatmaps": lambda rng: {
+        "user_id": rng.randrange(1, 10**7),
+        "Type": "most_played",
+        "limit": 50,
+    },
+    "user_recent_activity": lambda rng: {"user_id": rng.randrange(1, 10**7)},
+    "ranking": lambda rng: {
+        "mode": "osu",
+        "Type": "performance",
+        "cursor": rng.randrange(1, 200),
+    },
+}
+DEFAULT_MIX = "user,beatmap,beatmap_scores,user_scores,ranking"
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Returns the q-th percentile of sorted values, nearest rank."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))]
+
+
+def _max_rss() -> int:
+    """Peak resident memory of this process in bytes."""
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macOS
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+async def run_load(args: argparse.Namespace, url: str) -> dict:
+    api = AsyncOsuApi(
+        1,
+        "load",
+        coalesce=args.coalesce,
+        parse_mode=args.parse_mode,
+        max_connections=args.connections,
+        max_keepalive_connections=args.connections,
+        timeout=args.timeout,
+        retry=Retry(attempts=args.retries, backoff=0.05) if args.retries > 1 else None,
+        metrics=Metrics(),
+    )
+    api.BASE_URL = f"{url}/api/v2"
+    api.TOKEN_URL = f"{url}/oauth/token"
+    mix = args.mix.split(",")
+    latencies: list[float] = []
+    results = {"ok": 0, "none": 0}
+    errors: dict[str, int] = {}
+
+    async def caller(index: int) -> None:
+        rng = random.Random(args.seed * 1_000_003 + index)
+        for _ in range(args.requests):
+            name = rng.choice(mix)
+            kwargs = CALLS[name](rng)
+            started = time.perf_counter()
+            try:
+                result = await getattr(api, name)(**kwargs)
+            except Exception as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+            else:
+                results["ok" if result is not None else "none"] += 1
+            latencies.append(time.perf_counter() - started)
+
+    # the token request is not part of the measurement
+    await api.async_verify_auth()
+    rss_before = _max_rss()
+    started = time.perf_counter()
+    await asyncio.gather(*(caller(i) for i in range(args.callers)))
+    elapsed = time.perf_counter() - started
+    await api.aclose()
+
+    latencies.sort()
+    phases = {}
+    for phase in ("limiter", "connect", "ttfb", "download", "decode", "validate"):
+        total = count = 0
+        for name in mix:
+            if (histogram := api.metrics.histogram(name, phase)) is not None:
+                total += histogram.sum
+                count += histogram.count
+        phases[phase] = total / count if count else 0.0
+    return {
+        "callers": args.callers,
+        "calls": len(latencies),
+        "ok": results["ok"],
+        "failed": results["none"],
+        "errors": errors,
+        "seconds": elapsed,
+        "calls_per_second": len(latencies) / elapsed,
+        "latency": {
+            "p50": percentile(latencies, 50),
+            "p90": percentile(latencies, 90),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+        "phase_means": phases,
+        "max_rss_bytes": _max_rss(),
+        "max_rss_growth_bytes": _max_rss() - rss_before,
+    }
+
+
+def start_server(args: argparse.Namespace) -> tuple[subprocess.Popen, str]:
+    """Starts benchmarks.server on a free port and returns it with its url."""
+    command = [sys.executable, "-m", "benchmarks.server", "--port", "0"]
+    for name, value in server_options(args).items():
+        command += [f"--{name.replace('_', '-')}", str(value)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("listening on "):
+        process.kill()
+        raise RuntimeError("benchmarks.server did not start")
+    return process, line.split()[-1]
+
+
+def _format_bytes(size: float) -> str:
+    return f"{size / 2**20:.1f} MiB"
+
+
+def print_report(report: dict) -> None:
+    latency = report["latency"]
+    print(f"callers          {report['callers']}")
+    print(f"calls            {report['calls']} in {report['seconds']:.2f}s")
+    print(f"throughput       {report['calls_per_second']:,.0f} calls/s")
+    print(f"ok / failed      {report['ok']} / {report['failed']}")
+    if report["errors"]:
+        print(f"errors           {report['errors']}")
+    print(
+        "latency          "
+        + "  ".join(f"{name} {value * 1000:.1f}ms" for name, value in latency.items())
+    )
+    print(
+        "phase means      "
+        + "  ".join(
+            f"{name} {value * 1000:.2f}ms"
+            for name, value in report["phase_means"].items()
+        )
+    )
+    print(
+        f"memory           max rss {_format_bytes(report['max_rss_bytes'])}"
+        f" (+{_format_bytes(report['max_rss_growth_bytes'])} during the load)"
+    )
+    if "python_heap_peak_bytes" in report:
+        print(f"python heap peak {_format_bytes(report['python_heap_peak_bytes'])}")
+    if "server" in report:
+        print(f"server           {report['server']}")
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.load", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument(
+        "--callers", type=int, default=2000, help="concurrent callers (default 2000)"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=5, help="calls per caller (default 5)"
+    )
+    parser.add_argument(
+        "--mix",
+        default=DEFAULT_MIX,
+        help=f"comma separated client methods, from {', '.join(CALLS)} (default {DEFAULT_MIX})",
+    )
+    parser.add_argument(
+        "--url",
+        help="url of a running benchmarks.server, started in a subprocess if not given",
+    )
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=100,
+        help="max_connections of the client (default 100)",
+    )
+    parser.add_argument(
+        "--parse-mode",
+        default="validate",
+        help="parse_mode of the client (default validate)",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="attempts per call, 1 for no retry (default 3)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=60.0,
+        help="client timeout in seconds (default 60)",
+    )
+    parser.add_argument(
+        "--coalesce", action="store_true", help="share identical requests in flight"
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="also report the python heap peak, slows the load down",
+    )
+    parser.add_argument(
+        "--json", metavar="PATH", help="write the report to a json file"
+    )
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+    if unknown := set(args.mix.split(",")) - set(CALLS):
+        parser.error(f"unknown --mix calls: {', '.join(sorted(unknown))}")
+
+    process, url = (None, args.url) if args.url else start_server(args)
+    try:
+        if args.tracemalloc:
+            tracemalloc.start()
+        report = asyncio.run(run_load(args, url))
+        if args.tracemalloc:
+            report["python_heap_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        try:
+            report["server"] = httpx.get(f"{url}/_stats").json()
+        except Exception:
+            pass
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""
+Benchmarks of the request builders, response model parsing and end to end
+client calls over an in-memory transport.
+
+Usage: python -m benchmarks [-k FILTER] [--group GROUP] [--json PATH] [--compare PATH]
+
+Every benchmark reports operations per second (best of --repeat runs of
+timeit's autorange) and the peak memory allocated by one operation
+(tracemalloc).
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+from typing import Callable, Iterator, NamedTuple
+
+import httpx
+from pydantic import parse_obj_as
+
+from losuapi import AsyncOsuApi, OsuApi
+from losuapi.BaseOsuApi import BaseOsuApi
+from losuapi.endpoints import ENDPOINTS
+from losuapi.parsing import decode_struct, parse
+
+from . import fixtures
+
+GROUPS = ("build", "parse", "e2e")
+
+# arguments of every request builder, kept in sync with losuapi.endpoints
+BUILDER_ARGS: dict[str, dict] = {
+    "lookup_beatmap": {
+        "beatmap_id": 75,
+        "checksum": "a5b99395a42bd55bc5eb1d2411cbdf8b",
+    },
+    "user_beatmap_score": {"beatmap_id": 75, "user_id": 2, "mode": "osu"},
+    "user_beatmap_scores": {"beatmap_id": 75, "user_id": 2, "mode": "osu"},
+    "beatmap_scores": {"beatmap_id": 75, "mode": "osu", "mods": "HD"},
+    "beatmaps": {"beatmap_ids": list(range(1, 51))},
+    "beatmap": {"beatmap_id": 75},
+    "beatmap_attributes": {"beatmap_id": 75, "mods": ["HD", "DT"], "ruleset": "osu"},
+    "user_kudosu": {"user_id": 2, "limit": 10, "offset": "5"},
+    "user_scores": {"user_id": 2, "Type": "best", "mode": "osu", "limit": 100},
+    "user_beatmaps": {"user_id": 2, "Type": "favourite", "limit": 100, "offset": 0},
+    "user_recent_activity": {"user_id": 2, "limit": 50},
+    "user": {"username": "peppy", "mode": "osu"},
+    "users": {"user_ids": list(range(1, 51))},
+    "ranking": {"mode": "osu", "Type": "performance", "cursor": 2},
+    "spotlights": {},
+}
+
+# client calls of the end to end benchmarks and the fixture they are served
+E2E_CALLS: dict[str, tuple[str, dict]] = {
+    "user": ("User", BUILDER_ARGS["user"]),
+    "ranking": ("Rankings", BUILDER_ARGS["ranking"]),
+    "beatmap_scores": ("BeatmapScores", BUILDER_ARGS["beatmap_scores"]),
+    "user_scores": ("list[Score]", BUILDER_ARGS["user_scores"]),
+}
+
+
+class Benchmark(NamedTuple):
+    group: str
+    name: str
+    function: Callable[[], object]
+
+
+class Result(NamedTuple):
+    name: str
+    ops: float
+    peak_bytes: int
+
+
+def has_msgspec() -> bool:
+    try:
+        import msgspec  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _authorize(api: BaseOsuApi) -> None:
+    """Gives a client a token that does not expire during the run."""
+    api.authorization = "Bearer benchmark"
+    api.expired_time = time.time() + 10**6
+
+
+def builder_benchmarks() -> Iterator[Benchmark]:
+    missing = {endpoint.name for endpoint in ENDPOINTS} - set(BUILDER_ARGS)
+    if missing:
+        raise RuntimeError(f"no benchmark arguments for {', '.join(sorted(missing))}")
+    api = BaseOsuApi(1, "benchmark")
+    _authorize(api)
+    for name, kwargs in BUILDER_ARGS.items():
+        builder = getattr(api, name)
+        yield Benchmark(
+            "build", name, lambda builder=builder, kwargs=kwargs: builder(**kwargs)
+        )
+
+
+def parse_benchmarks(payloads: dict) -> Iterator[Benchmark]:
+    for name, (Type, obj) in payloads.items():
+        content = fixtures.encode(obj)
+        yield Benchmark(
+            "parse", f"{name}:parse_obj_as", lambda T=Type, o=obj: parse_obj_as(T, o)
+        )
+        for mode in ("lazy", "construct"):
+            yield Benchmark(
+                "parse", f"{name}:{mode}", lambda T=Type, o=obj, m=mode: parse(T, o, m)
+            )
+        if has_msgspec():
+            yield Benchmark(
+                "parse",
+                f"{name}:msgspec",
+                lambda T=Type, c=content: decode_struct(T, c),
+            )
+
+
+def mock_transport(payloads: dict) -> httpx.MockTransport:
+    """
+    Transport answering every E2E_CALLS request with its encoded fixture.
+    """
+    bodies = {name: fixtures.encode(obj) for name, (_, obj) in payloads.items()}
+    routes = {
+        "/api/v2/users/peppy/osu": bodies["User"],
+        "/api/v2/rankings/osu/performance": bodies["Rankings"],
+        "/api/v2/beatmaps/75/scores": bodies["BeatmapScores"],
+        "/api/v2/users/2/scores/best": bodies["list[Score]"],
+    }
+    headers = {"Content-Type": "application/json"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        content = routes.get(request.url.path)
+        if content is None:
+            return httpx.Response(404, content=b'{"error":null}', headers=headers)
+        return httpx.Response(200, content=content, headers=headers)
+
+    return httpx.MockTransport(handler)
+
+
+def e2e_benchmarks(
+    payloads: dict, loop: asyncio.AbstractEventLoop
+) -> Iterator[Benchmark]:
+    modes = ("validate", "lazy", "construct") + (("msgspec",) if has_msgspec() else ())
+    transport = mock_transport(payloads)
+    for mode in modes:
+        api = OsuApi(1, "benchmark", parse_mode=mode, transport=transport)
+        _authorize(api)
+        for name, (_, kwargs) in E2E_CALLS.items():
+            method = getattr(api, name)
+            yield Benchmark(
+                "e2e", f"OsuApi.{name}:{mode}", lambda m=method, k=kwargs: m(**k)
+            )
+
+        aapi = AsyncOsuApi(
+            1, "benchmark", coalesce=False, parse_mode=mode, transport=transport
+        )
+        _authorize(aapi)
+        for name, (_, kwargs) in E2E_CALLS.items():
+            method = getattr(aapi, name)
+            yield Benchmark(
+                "e2e",
+                f"AsyncOsuApi.{name}:{mode}",
+                lambda m=method, k=kwargs: loop.run_until_complete(m(**k)),
+            )
+
+
+def measure(benchmark: Benchmark, repeat: int) -> Result:
+    """
+    Times a benchmark with timeit then runs it once more under tracemalloc.
+    """
+    if benchmark.function() is None:
+        raise RuntimeError(f"{benchmark.name} returned None")
+    timer = timeit.Timer(benchmark.function)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        benchmark.function()
+        peak = tracemalloc.get_traced_memory()[1] - start
+    finally:
+        tracemalloc.stop()
+    return Result(benchmark.name, 1 / best, peak)
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024 or unit == "MiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        action="append",
+        default=[],
+        help="only run benchmarks whose name contains this, can be repeated",
+    )
+    parser.add_argument(
+        "--group",
+        choices=GROUPS,
+        action="append",
+        help="only run this group, can be repeated",
+    )
+    parser.add_argument(
+        "--size", type=int, default=50, help="items per list payload (default 50)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="timing runs per benchmark, the best is kept (default 5)",
+    )
+    parser.add_argument(
+        "--json", metavar="PATH", help="write the results to a json file"
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="PATH",
+        help="compare with the results of an earlier --json run",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="slowdown reported as a regression by --compare (default 0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    groups = args.group or GROUPS
+    payloads = fixtures.payloads(size=args.size)
+    loop = asyncio.new_event_loop()
+    benchmarks = []
+    if "build" in groups:
+        benchmarks += builder_benchmarks()
+    if "parse" in groups:
+        benchmarks += parse_benchmarks(payloads)
+    if "e2e" in groups:
+        benchmarks += e2e_benchmarks(payloads, loop)
+    if args.filter:
+        benchmarks = [b for b in benchmarks if any(f in b.name for f in args.filter)]
+    if not has_msgspec():
+        print("msgspec is not installed, skipping the msgspec benchmarks\n")
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = {r["name"]: r for r in json.load(file)["results"]}
+
+    results, regressions = [], []
+    width = max((len(b.name) for b in benchmarks), default=0) + 2
+    group = None
+    for benchmark in benchmarks:
+        if benchmark.group != group:
+            group = benchmark.group
+            print(
+                f"{'[' + group + ']':<{width}}{'ops/sec':>12}{'usec/op':>12}{'peak mem/op':>14}"
+                + (f"{'vs base':>10}" if baseline else "")
+            )
+        result = measure(benchmark, args.repeat)
+        results.append(result)
+        line = f"{result.name:<{width}}{result.ops:>12,.0f}{1e6 / result.ops:>12.2f}{_format_bytes(result.peak_bytes):>14}"
+        if (old := baseline.get(result.name)) is not None:
+            change = old["ops"] / result.ops - 1
+            line += f"{change:>+10.1%}"
+            if change > args.threshold:
+                regressions.append(result.name)
+                line += "  REGRESSION"
+        print(line)
+    loop.close()
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(
+                {
+                    "python": sys.version.split()[0],
+                    "platform": platform.platform(),
+                    "size": args.size,
+                    "results": [r._asdict() for r in results],
+                },
+                file,
+                indent=2,
+            )
+    if regressions:
+        print(
+            f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}"
+        )
+        return 1
+    return 0
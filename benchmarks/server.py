@@ -0,0 +1,362 @@
+"""
+Local stand-in for the Osu! api serving synthetic payloads, with injected
+429/5xx responses and latency.
+
+Usage: python -m benchmarks.server [--port PORT] [--size N] [--latency S]
+       [--jitter S] [--error-rate P] [--throttle-rate P]
+
+Every endpoint of losuapi.endpoints is served under /api/v2 plus
+/oauth/token, which hands out a token to any client. GET /_stats returns
+the number of requests and responses by status.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+from urllib.parse import parse_qsl, urlsplit
+
+from . import fixtures
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+}
+
+
+def _join(items: list[bytes]) -> bytes:
+    return b"[" + b",".join(items) + b"]"
+
+
+class FakeOsuServer:
+    """
+    asyncio http/1.1 server answering Osu! api requests with pre-encoded
+    synthetic payloads.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        size: int = 50,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 0,
+    ) -> None:
+        """
+        Parameters:
+            - host: str - Address to listen on.
+            - port: int - Port to listen on, 0 for any free port.
+            - size: int - Items in list responses (rankings, scores, ...).
+            - latency: float - Seconds every api response is delayed.
+            - jitter: float - Up to this many random seconds added to latency.
+            - error_rate: float - Share of api requests answered with a 500, 502 or 503.
+            - throttle_rate: float - Share of api requests answered with a 429.
+            - retry_after: float - Retry-After header of the 429 responses.
+            - seed: int - Seed of the payloads and faults.
+        """
+        if not 0 <= error_rate + throttle_rate <= 1:
+            raise ValueError(
+                "param<error_rate> + param<throttle_rate> must be within 0 and 1"
+            )
+        self.host: str = host
+        self.port: int = port
+        self.size: int = size
+        self.latency: float = latency
+        self.jitter: float = jitter
+        self.error_rate: float = error_rate
+        self.throttle_rate: float = throttle_rate
+        self.retry_after: float = retry_after
+        self.stats: dict[str, int] = {"requests": 0}
+        self._rng = random.Random(seed)
+        self._server: asyncio.AbstractServer | None = None
+        self._build_payloads(random.Random(seed))
+        self._routes = [
+            ("POST", re.compile(r"/oauth/token"), self._token),
+            ("GET", re.compile(r"/_stats"), self._stats),
+            ("GET", re.compile(r"/api/v2/beatmaps/lookup"), self._beatmap),
+            (
+                "GET",
+                re.compile(r"/api/v2/beatmaps/\d+/scores/users/\d+/all"),
+                self._user_beatmap_scores,
+            ),
+            (
+                "GET",
+                re.compile(r"/api/v2/beatmaps/\d+/scores/users/\d+"),
+                self._user_beatmap_score,
+            ),
+            ("GET", re.compile(r"/api/v2/beatmaps/\d+/scores"), self._beatmap_scores),
+            ("POST", re.compile(r"/api/v2/beatmaps/\d+/attributes"), self._attributes),
+            ("GET", re.compile(r"/api/v2/beatmaps/(\d+)"), self._beatmap),
+            ("GET", re.compile(r"/api/v2/beatmaps"), self._beatmaps),
+            ("GET", re.compile(r"/api/v2/users/\d+/kudosu"), self._list("kudosu")),
+            (
+                "GET",
+                re.compile(r"/api/v2/users/\d+/recent_activity"),
+                self._list("events"),
+            ),
+            ("GET", re.compile(r"/api/v2/users/\d+/scores/\w+"), self._list("scores")),
+            (
+                "GET",
+                re.compile(r"/api/v2/users/\d+/beatmapsets/\w+"),
+                self._list("playcounts"),
+            ),
+            ("GET", re.compile(r"/api/v2/users/[^/]+(/\w*)?"), self._user),
+            ("GET", re.compile(r"/api/v2/users"), self._users),
+            ("GET", re.compile(r"/api/v2/rankings/\w+/\w+"), self._rankings),
+            ("GET", re.compile(r"/api/v2/spotlights"), self._spotlights),
+        ]
+
+    def _build_payloads(self, rng: random.Random) -> None:
+        """Encodes the payloads once, list responses are joined from encoded items."""
+        encode = fixtures.encode
+        size = self.size
+        self._items: dict[str, list[bytes]] = {
+            "scores": [encode(fixtures.score(rng)) for _ in range(size)],
+            "kudosu": [encode(fixtures.kudosu(rng)) for _ in range(size)],
+            "events": [encode(fixtures.event(rng)) for _ in range(size)],
+            "playcounts": [
+                encode(fixtures.beatmap_playcount(rng)) for _ in range(size)
+            ],
+        }
+        self._beatmap_template = fixtures.beatmap(rng)
+        self._user_template = fixtures.user_compact(rng)
+        self._bodies: dict[str, bytes] = {
+            "user": encode(fixtures.user(rng)),
+            "beatmap": encode(self._beatmap_template),
+            "beatmap_scores": encode(fixtures.beatmap_scores(rng, size)),
+            "user_beatmap_score": encode({"position": 1, "score": fixtures.score(rng)}),
+            "attributes": encode(fixtures.attributes(rng)),
+            "spotlights": encode(fixtures.spotlights(rng)),
+        }
+        self._bodies["user_beatmap_scores"] = (
+            b'{"scores":' + _join(self._items["scores"]) + b"}"
+        )
+        self._ranking = fixtures.rankings(rng, size)
+        self._ranking_pages: dict[int, bytes] = {}
+
+    # routes, return the status and body of a response
+
+    def _token(self, params: dict, path: str) -> tuple[int, bytes]:
+        return 200, b'{"token_type":"Bearer","access_token":"fake","expires_in":86400}'
+
+    def _stats(self, params: dict, path: str) -> tuple[int, bytes]:
+        return 200, json.dumps(self.stats).encode()
+
+    def _beatmap(self, params: dict, path: str) -> tuple[int, bytes]:
+        return 200, self._bodies["beatmap"]
+
+    def _beatmap_scores(self, params: dict, path: str) -> tuple[int, bytes]:
+        return 200, self._bodies["beatmap_scores"]
+
+    def _user_beatmap_score(self, params: dict, path: str) -> tuple[int, bytes]:
+        return 200, self._bodies["user_beatmap_score"]
+
+    def _user_beatmap_scores(self, params: dict, path: str) -> tuple[int, bytes]:
+        return 200, self._bodies["user_beatmap_scores"]
+
+    def _attributes(self, params: dict, path: str) -> tuple[int, bytes]:
+        return 200, self._bodies["attributes"]
+
+    def _user(self, params: dict, path: str) -> tuple[int, bytes]:
+        return 200, self._bodies["user"]
+
+    def _spotlights(self, params: dict, path: str) -> tuple[int, bytes]:
+        return 200, self._bodies["spotlights"]
+
+    def _beatmaps(self, params: dict, path: str) -> tuple[int, bytes]:
+        beatmaps = [
+            dict(self._beatmap_template, id=int(i)) for i in params.get("ids[]", [])
+        ]
+        return 200, fixtures.encode({"beatmaps": beatmaps})
+
+    def _users(self, params: dict, path: str) -> tuple[int, bytes]:
+        users = [dict(self._user_template, id=int(i)) for i in params.get("ids[]", [])]
+        return 200, fixtures.encode({"users": users})
+
+    def _list(self, name: str):
+        """Route of an offset paginated list, empty past 10 pages."""
+
+        def route(params: dict, path: str) -> tuple[int, bytes]:
+            items = self._items[name]
+            limit = int(params.get("limit", [len(items)])[0])
+            offset = int(params.get("offset", ["0"])[0])
+            if offset >= 10 * len(items):
+                return 200, b"[]"
+            return 200, _join([items[(offset + i) % len(items)] for i in range(limit)])
+
+        return route
+
+    def _rankings(self, params: dict, path: str) -> tuple[int, bytes]:
+        page = int(params.get("cursor[page]", ["1"])[0])
+        if (body := self._ranking_pages.get(page)) is None:
+            cursor = {"page": page + 1} if page < 200 else None
+            body = self._ranking_pages[page] = fixtures.encode(
+                dict(self._ranking, cursor=cursor)
+            )
+        return 200, body
+
+    async def _respond(self, method: str, target: str) -> tuple[int, dict, bytes]:
+        """Returns the status, extra headers and body of a response."""
+        url = urlsplit(target)
+        params: dict[str, list[str]] = {}
+        for name, value in parse_qsl(url.query, keep_blank_values=True):
+            params.setdefault(name, []).append(value)
+        for route_method, pattern, route in self._routes:
+            if route_method == method and pattern.fullmatch(url.path):
+                break
+        else:
+            return 404, {}, b'{"error":null}'
+        if url.path.startswith("/api/"):
+            if self.latency or self.jitter:
+                await asyncio.sleep(self.latency + self._rng.uniform(0, self.jitter))
+            fault = self._rng.random()
+            if fault < self.throttle_rate:
+                return (
+                    429,
+                    {"Retry-After": str(self.retry_after)},
+                    b'{"error":"Too Many Requests"}',
+                )
+            if fault < self.throttle_rate + self.error_rate:
+                status = self._rng.choice((500, 502, 503))
+                return status, {}, b'{"error":"fault injected"}'
+        status, body = route(params, url.path)
+        return status, {}, body
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while line := await reader.readline():
+                method, target, _ = line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (header := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if length := int(headers.get("content-length", 0)):
+                    await reader.readexactly(length)
+                status, extra, body = await self._respond(method, target)
+                self.stats["requests"] += 1
+                self.stats[str(status)] = self.stats.get(str(status), 0) + 1
+                head = [
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                    "Content-Type: application/json",
+                    f"Content-Length: {len(body)}",
+                    *(f"{name}: {value}" for name, value in extra.items()),
+                ]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        """Starts listening, port is set to the bound port."""
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port, backlog=4096
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adds the payload and fault options of FakeOsuServer to a parser."""
+    parser.add_argument(
+        "--size", type=int, default=50, help="items per list response (default 50)"
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="seconds every api response is delayed",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.0,
+        help="up to this many random seconds added to latency",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="share of api requests answered with a 5xx",
+    )
+    parser.add_argument(
+        "--throttle-rate",
+        type=float,
+        default=0.0,
+        help="share of api requests answered with a 429",
+    )
+    parser.add_argument(
+        "--retry-after",
+        type=float,
+        default=1.0,
+        help="Retry-After seconds of the 429 responses",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def server_options(args: argparse.Namespace) -> dict:
+    return {
+        "size": args.size,
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+        "throttle_rate": args.throttle_rate,
+        "retry_after": args.retry_after,
+        "seed": args.seed,
+    }
+
+
+async def serve(args: argparse.Namespace) -> None:
+    server = FakeOsuServer(host=args.host, port=args.port, **server_options(args))
+    await server.start()
+    # the load driver reads this line to find the port
+    print(f"listening on {server.url}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.server", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument(
+        "--port", type=int, default=8000, help="0 for any free port (default 8000)"
+    )
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
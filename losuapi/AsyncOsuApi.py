@@ -1,425 +1,380 @@
-from typing import Type, TypeVar
+from typing import Any, AsyncIterator, Iterable, Type, TypeVar
+import asyncio
 import functools
+import inspect
+import time
 import httpx
-from pydantic import parse_obj_as
-from .BaseOsuApi import BaseOsuApi
-from .types import (
-    Beatmap,
-    Beatmaps,
-    Rankings,
-    User,
-    Scores,
-    Score,
-    ScoreTypes,
-    GameMode,
-    GameModeInt,
-    RankingType,
-    ScoreTypes,
-    BeatmapUserScore,
-    BeatmapScores,
-    Attributes,
-    KudosuHistory,
-    BeatmapType,
-    BeatmapPlaycount,
-    Beatmapset,
-    Users,
-    Event,
-    Spotlights,
-)
+from .BaseOsuApi import BaseOsuApi, BatchResult
+from .Metrics import NO_TIMER
+from .endpoints import CHUNK_DOC, ENDPOINTS, Endpoint
+from .utility import chunked, request_key
 
 T = TypeVar("T")
 
 
 class AsyncOsuApi(BaseOsuApi):
-    def __init__(self, client_id: int, client_secret: str):
-        self.Client = httpx.AsyncClient(timeout=None)
-        super().__init__(client_id=client_id, client_secret=client_secret)
-
-    def request(Type: Type[T]):
-        """async http request"""
-
-        def decorator(func):
-            @functools.wraps(func)
-            async def wrapper(self, *args, **kwargs):
-                data = func(self, *args, **kwargs)
-                response = await self.Client.request(
-                    method=data["method"],
-                    url=data["url"],
-                    params=data["params"],
-                    headers=data["headers"],
-                )
-                if "error" in (res := response.json()) or "authentication" in res:
-                    return None
-                return parse_obj_as(type_=Type, obj=response.json())
-
-            return wrapper
-
-        return decorator
-
-    ##########
-    #
-    # Async beatmap methods
-    #
-    #########
-    @request(Type=Beatmap)
-    def lookup_beatmap(
-        self, beatmap_id: int, checksum: str = None, filename: str = None
-    ) -> Beatmap:
+    # tokens are refreshed this many seconds early so the blocking refresh in
+    # BaseOsuApi.verify_auth is never reached from the event loop
+    REFRESH_MARGIN = 60
+
+    CHUNK_PARAMS = (
+        (
+            inspect.Parameter(
+                "max_concurrency",
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                default=4,
+                annotation=int,
+            ),
+            "- max_concurrency: int - Maximum number of chunk requests in flight.",
+        ),
+    )
+    CHUNK_NOTE = CHUNK_DOC.replace("MAX_IDS.", "MAX_IDS concurrently.")
+
+    def __init__(
+        self, client_id: int, client_secret: str, coalesce: bool = True, **kwargs
+    ):
         """
-        Returns beatmap information.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#lookup-beatmap
-
         Parameters:
-            - beatmap_id: int - ID of an Osu! beatmap.
-            - checksum: str | None - Osu! beatmap checksum value.
-            - filename: str | None - Filename to lookup.
-
-        Returns: losuapi.types.Beatmap
-
-        Returns None if http request errors out.
+            - client_id: int - Osu! OAuth client ID.
+            - client_secret: str - Osu! OAuth client secret.
+            - coalesce: bool - Share one http request and parsed result between
+              identical requests that are in flight at the same time.
+            - **kwargs - Client options, see BaseOsuApi.__init__.
         """
-        return super().lookup_beatmap(
-            beatmap_id=beatmap_id, checksum=checksum, filename=filename
-        )
-
-    @request(Type=BeatmapUserScore)
-    def user_beatmap_score(
-        self,
-        beatmap_id: int,
-        user_id: int,
-        mode: GameMode | str = None,
-        mods: str = None,
-    ) -> BeatmapUserScore:
-        """
-        Return a User's score on a Beatmap.
+        super().__init__(client_id=client_id, client_secret=client_secret, **kwargs)
+        self.Client = httpx.AsyncClient(**self._client_options())
+        self.coalesce: bool = coalesce
+        self._auth_lock = asyncio.Lock()
+        self._in_flight: dict[tuple, asyncio.Future] = {}
 
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-a-user-beatmap-score
-
-        Parameters:
-            - beatmap_id: int - ID of an Osu! beatmap.
-            - user_id: int - ID of an Osu! user.
-            - mode: GameMode | str | None - Osu! gamemode.
-                - (osu, taiko, mania, fruits)
-            - mods: str | None - String of mods (undocumented).
+    async def aclose(self) -> None:
+        """Closes the pooled connections of the client."""
+        await self.Client.aclose()
 
-        Returns: losuapi.types.BeatmapUserScore
+    def _new_auth(self) -> None:
+        raise RuntimeError("AsyncOsuApi tokens are fetched with async_verify_auth")
 
-        Returns None if http request errors out.
+    async def async_verify_auth(self) -> None:
         """
-        return super().user_beatmap_score(
-            beatmap_id=beatmap_id, user_id=user_id, mode=mode, mods=mods
-        )
+        Fetches a new auth token through the async client if there is none or
+        it is about to expire.
 
-    @request(Type=Scores)
-    def user_beatmap_scores(
-        self, beatmap_id: int, user_id: int, mode: GameMode | str = None
-    ) -> Scores:
+        Concurrent callers share a single token request.
         """
-        Return a User's scores on a Beatmap.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-a-user-beatmap-scores
-
-        Parameters:
-            - beatmap_id: int - ID of an Osu! beatmap.
-            - user_id: int - ID of an Osu! user.
-            - mode: GameMode | str | None - Osu! gamemode.
-                - (osu, taiko, mania, fruits)
-
-        - Returns: losuapi.types.Scores
-
-        Returns None if http request errors out.
+        if time.time() < self.expired_time - self.REFRESH_MARGIN:
+            return
+        async with self._auth_lock:
+            if time.time() < self.expired_time - self.REFRESH_MARGIN:
+                return
+            if self._cached_auth(self.REFRESH_MARGIN):
+                return
+            response = await self.Client.post(
+                url=self.TOKEN_URL, json=self._auth_body(), headers=self.base_headers
+            )
+            self._set_auth(self.decode(response.content))
+
+    async def _gather_chunks(
+        self, fetch, ids: list[int], max_concurrency: int, **kwargs
+    ):
         """
-        return super().user_beatmap_scores(
-            beatmap_id=beatmap_id, user_id=user_id, mode=mode
-        )
-
-    @request(Type=BeatmapScores)
-    def beatmap_scores(
-        self,
-        beatmap_id: int,
-        mode: GameMode | str = None,
-        mods: str = None,
-        Type: str = None,
-    ) -> BeatmapScores:
+        Runs fetch on every MAX_IDS sized chunk of ids, at most max_concurrency
+        at a time, and returns the results in chunk order.
         """
-        Returns the top scores for a beatmap.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-beatmap-scores
-
-        Parameters:
-            - beatmap_id: int - ID of an Osu! beatmap.
-            - mode: GameMode | str | None - Osu! gamemode.
-                - (osu, taiko, mania, fruits)
-            - mods: str | None - String of mods (undocumented).
-            - Type: str | None - Beatmap score ranking type (undocumented).
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-        Returns: losuapi.types.BeatmapScores
+        async def fetch_chunk(chunk):
+            async with semaphore:
+                return await fetch(chunk, **kwargs)
 
-        Returns None if http request errors out.
-        """
-        return super().beatmap_scores(
-            beatmap_id=beatmap_id, mode=mode, mods=mods, Type=Type
+        return await asyncio.gather(
+            *(fetch_chunk(chunk) for chunk in chunked(ids, self.MAX_IDS))
         )
 
-    @request(Type=Beatmaps)
-    def beatmaps(self, beatmap_ids: list[int]) -> Beatmaps:
+    async def batch_as_completed(
+        self, calls: Iterable[tuple[str, dict]], max_concurrency: int = 10
+    ) -> AsyncIterator[BatchResult]:
         """
-        Returns a list of beatmaps.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-beatmaps
+        Runs many client method calls with bounded concurrency and yields their
+        results as they complete.
 
         Parameters:
-            - beatmap_ids: list[int] - Array of beatmap IDs.
+            - calls: Iterable[tuple[str, dict]] - (method name, kwargs) pairs, e.g. ("user", {"username": 2}).
+                - calls are read lazily, so a generator can be given.
+            - max_concurrency: int - Maximum number of calls running at once.
 
-        Returns: losuapi.types.Beatmaps
+        Yields: losuapi.AsyncOsuApi.BatchResult, in completion order.
 
-        Returns None if http request errors out.
+        An exception raised by a call is reported in its BatchResult.error
+        instead of being raised.
         """
-        return super().beatmaps(beatmap_ids=beatmap_ids)
-
-    @request(Type=Beatmap)
-    def beatmap(self, beatmap_id: int) -> Beatmap:
+        if max_concurrency < 1:
+            raise ValueError("param<max_concurrency> must be at least 1")
+        pending = enumerate(calls)
+        results: asyncio.Queue[BatchResult | None] = asyncio.Queue()
+
+        async def worker():
+            try:
+                for index, call in pending:
+                    try:
+                        name, kwargs = call
+                        result = await getattr(self, name)(**kwargs)
+                    except Exception as e:
+                        await results.put(BatchResult(index, call, None, e))
+                    else:
+                        await results.put(BatchResult(index, call, result, None))
+            finally:
+                await results.put(None)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(max_concurrency)]
+        try:
+            running = len(workers)
+            while running:
+                if (item := await results.get()) is None:
+                    running -= 1
+                else:
+                    yield item
+        finally:
+            for task in workers:
+                task.cancel()
+
+    async def batch(
+        self, calls: Iterable[tuple[str, dict]], max_concurrency: int = 10
+    ) -> list[BatchResult]:
         """
-        Gets beatmap data for the specified beatmap ID.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-beatmap
+        Runs many client method calls with bounded concurrency.
 
         Parameters:
-            - beatmap_id: int - ID of an Osu! beatmap.
+            - calls: Iterable[tuple[str, dict]] - (method name, kwargs) pairs, e.g. ("user", {"username": 2}).
+            - max_concurrency: int - Maximum number of calls running at once.
 
-        - Returns: losuapi.types.Beatmap
+        Returns: list[losuapi.AsyncOsuApi.BatchResult], in the order of calls.
 
-        Returns None if http request errors out.
+        An exception raised by a call is reported in its BatchResult.error
+        instead of being raised.
         """
-        return super().beatmap(beatmap_id=beatmap_id)
-
-    @request(Type=Attributes)
-    def beatmap_attributes(
-        self,
-        beatmap_id: int,
-        mods: list[str] = None,
-        ruleset: GameMode | str = None,
-        ruleset_id: GameModeInt | int = None,
-    ) -> Attributes:
+        results = [
+            item async for item in self.batch_as_completed(calls, max_concurrency)
+        ]
+        return sorted(results, key=lambda item: item.index)
+
+    async def paginate(
+        self, endpoint: str, max_items: int = None, page_size: int = None, **kwargs
+    ) -> AsyncIterator[Any]:
         """
-        Returns difficulty attributes of beatmap with specific mode and mods combination.
+        Yields the items of every page of a paginated endpoint.
 
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-beatmap-attributes
+        The next page is requested in a background task while the items of
+        the current one are consumed.
 
         Parameters:
-            - beatmap_id: int - ID of an Osu! beatmap.
-            - mods: list[str] | None - Array of mod strings.
-            - ruleset: GameMode | str | None - Osu! gamemode.
-                - (osu, taiko, mania, fruits)
-            - ruleset_id: GameModeInt | int | None - Osu! gamemode int.
-                - (osu=0,taiko=1,mania=2,fruits=3)
+            - endpoint: str - Name of the method to page through.
+                - ('user_scores', 'user_beatmaps', 'user_kudosu', 'user_recent_activity', 'ranking')
+            - max_items: int | None - Stop after this many items.
+            - page_size: int | None - Items per request for offset endpoints, defaults to PAGE_SIZE.
+            - **kwargs - Arguments of the endpoint method, offset/cursor set the first page.
 
-        Returns: losuapi.types.Attributes
+        Yields: the items the endpoint returns, Rankings pages yield their ranking entries
+        (or beatmapsets for 'charts').
 
-        Returns None if http request errors out.
+        Stops early if an http request errors out.
         """
-        return super().beatmap_attributes(
-            beatmap_id=beatmap_id, mods=mods, ruleset=ruleset, ruleset_id=ruleset_id
-        )
-
-    ##########
-    #
-    # Async user methods
-    #
-    #########
-    @request(Type=list[KudosuHistory])
-    def user_kudosu(
-        self, user_id: int, limit: int = None, offset: str = None
-    ) -> list[KudosuHistory]:
-        """
-        Returns kudosu history.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-user-kudosu
-
-        Parameters:
-            user_id: int - ID of an Osu! user.
-            limit: int | None - Maximum numbers of results.
-            offset: str | None - Result offset for pagination.
-
-        Returns: list[losuapi.types.KudosuHistory]
-
-        Returns None if http request errors out.
+        position, kwargs = self._page_start(endpoint, kwargs)
+        method = getattr(self, endpoint)
+        page_size = page_size or self.PAGE_SIZE
+        remaining = max_items
+
+        page = self._page_kwargs(endpoint, kwargs, position, page_size, remaining)
+        task = asyncio.ensure_future(method(**page))
+        try:
+            while task is not None:
+                items, position = self._page_items(endpoint, page, position, await task)
+                task = None
+                if remaining is not None:
+                    items = items[:remaining]
+                    remaining -= len(items)
+                if position is not None and remaining != 0:
+                    page = self._page_kwargs(
+                        endpoint, kwargs, position, page_size, remaining
+                    )
+                    task = asyncio.ensure_future(method(**page))
+                for item in items:
+                    yield item
+        finally:
+            if task is not None:
+                task.cancel()
+
+    async def _fetch(self, endpoint: str, key: tuple, Type, data: dict, timer=NO_TIMER):
         """
-        return super().user_kudosu(user_id, limit, offset)
-
-    @request(Type=list[Score])
-    def user_scores(
-        self,
-        user_id: int,
-        Type: ScoreTypes | str,
-        include_fails: bool = False,
-        mode: GameMode | str = None,
-        limit: int = None,
-        offset: int = None,
-    ) -> list[Score]:
+        Sends a request built by BaseOsuApi and parses its response.
         """
-        Returns an array of scores of a specified user.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-user-scores
-
-        Parameters:
-            - user_id: int - ID of an Osu! user.
-            - Type: ScoreTypes | str - Score type.
-                - ('best', 'first', 'recent')
-            - include_fails: bool | None - Only for recent score type, include scores of failed plays, defaults to False.
-            - mode: GameMode | str | None - Game mode of scores to be returned.
-            - limit: int | None - Maximum numbers of results.
-            - offset: int | None - Result offset for pagination.
-
-        Returns: list[losuapi.types.Score]
-
-        Returns None if http request errors out.
+        response = None
+        try:
+            response = await self._send(endpoint, data, timer)
+            result = self._parse_response(
+                endpoint,
+                key,
+                Type,
+                response.content,
+                response.status_code,
+                timer,
+                store=False,
+            )
+            if result is not None and self._persists(endpoint):
+                await asyncio.to_thread(self._store, endpoint, key, response.content)
+        except (Exception, asyncio.CancelledError) as e:
+            # timeouts, transport errors and open circuits are recorded too
+            timer.finish(response, error=e)
+            raise
+        timer.finish(response)
+        return result
+
+    async def _send(self, endpoint: str, data: dict, timer=NO_TIMER) -> httpx.Response:
         """
-        return super().user_scores(user_id, Type, include_fails, mode, limit, offset)
-
-    @request(Type=list[BeatmapPlaycount])
-    def user_beatmaps(
-        self,
-        user_id: int,
-        Type: BeatmapType | str,
-        limit: int = None,
-        offset: int = None,
-    ) -> list[BeatmapPlaycount] | list[Beatmapset]:
+        Sends a request built by BaseOsuApi, again after a failure if the
+        retry policy allows it.
         """
-        Returns the beatmaps of a specified user.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-user-beatmaps
-
-        Parameters:
-            - user_id: int - ID of an Osu! user.
-            - Type: BeatmapType | str - Osu! beatmap status.
-                - (favourite, graveyard, loved, most_played, pending, ranked)
-            - limit: int | None - Maximum numbers of results.
-            - offset: int | None - Result offset for pagination.
-
-        Returns: list[losuapi.types.BeatmapPlaycount] | list[losuapi.types.BeatmapPlaycount]
-
-        Returns None if http request errors out.
+        attempt = 0
+        while True:
+            attempt += 1
+            timer.attempts = attempt
+            self._check_circuit()
+            if self.rate_limiter:
+                started = time.perf_counter()
+                await self.rate_limiter.acquire_async()
+                timer.add("limiter", time.perf_counter() - started)
+            request = self.Client.build_request(
+                method=data["method"],
+                url=data["url"],
+                params=data["params"],
+                headers=data["headers"],
+                timeout=self._timeout(endpoint),
+                extensions=timer.extensions(is_async=True),
+            )
+            try:
+                response = await self._receive(request, timer)
+            except httpx.TransportError:
+                if (delay := self._retry_delay(data, attempt)) is None:
+                    raise
+            else:
+                if self.rate_limiter:
+                    self.rate_limiter.update(response.status_code, response.headers)
+                if (delay := self._retry_delay(data, attempt, response)) is None:
+                    return response
+            await asyncio.sleep(delay)
+
+    async def _receive(self, request: httpx.Request, timer=NO_TIMER) -> httpx.Response:
         """
-        return super().user_beatmaps(
-            user_id=user_id, Type=Type, limit=limit, offset=offset
-        )
-
-    @request(Type=list[Event])
-    def user_recent_activity(
-        self, user_id: int, limit: int = None, offset: str = None
-    ) -> list[Event]:
+        Sends a request and reads its body, timing the wait for the response
+        headers and the download separately.
         """
-        Returns recent activity.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-user-recent-activity
-
-        Parameters:
-            - user_id: int - ID of an Osu! user.
-            - limit: int | None - Maximum numbers of results.
-            - offset: int | None - Result offset for pagination.
-
-        Returns: list[losuapi.types.Event]
-
-        Returns None if http request errors out.
+        started = time.perf_counter()
+        response = await self.Client.send(request, stream=True)
+        received = time.perf_counter()
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        timer.add("ttfb", received - started)
+        timer.add("download", time.perf_counter() - received)
+        return response
+
+    async def _fetch_shared(
+        self, endpoint: str, key: tuple, Type, data: dict, timer=NO_TIMER
+    ):
         """
-        return super().user_recent_activity(user_id=user_id, limit=limit, offset=offset)
+        Joins an identical request that is already in flight, or starts one
+        that later identical requests can join.
 
-    @request(Type=User)
-    def user(
-        self, username: int | str, mode: GameMode | str = "", key: str = ""
-    ) -> User:
+        The shared request keeps running if one of its callers is cancelled.
         """
-        Returns the detail of a specified user.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-user
+        # a fields= projection is parsed into a different type than the full
+        # response, so only requests with the same response type are shared
+        in_flight_key = (endpoint, key, Type)
+        if (future := self._in_flight.get(in_flight_key)) is not None:
+            try:
+                result = await asyncio.shield(future)
+            except (Exception, asyncio.CancelledError) as e:
+                timer.finish(cache="shared", error=e)
+                raise
+            timer.finish(cache="shared")
+            return result
+        future = asyncio.ensure_future(self._fetch(endpoint, key, Type, data, timer))
+        self._in_flight[in_flight_key] = future
+
+        def done(future):
+            del self._in_flight[in_flight_key]
+            if not future.cancelled():
+                # retrieved so an error is not reported as unhandled when
+                # every caller was cancelled
+                future.exception()
+
+        future.add_done_callback(done)
+        return await asyncio.shield(future)
 
-        Parameters:
-            - username: int | str - ID or username of an Osu! user.
-            - mode: GameMode | str | None - Osu! gamemode.
-                - (osu, taiko, mania, fruits)
-            - key: str | None - type of username given.
-                - ('id', 'username')
-
-        Returns: losuapi.types.User
-
-        Returns None if http request errors out.
-        """
-        return super().user(username=username, mode=mode, key=key)
+    def request(Type: Type[T]):
+        """async http request"""
 
-    @request(Type=Users)
-    def users(self, user_ids: list[int]) -> Users:
-        """
-        Returns list of user information.
+        def decorator(func):
+            endpoint = func.__name__.lstrip("_")
 
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-users
+            @functools.wraps(func)
+            async def wrapper(self, *args, **kwargs):
+                timer = self._timer(endpoint)
+                try:
+                    started = time.perf_counter()
+                    await self.async_verify_auth()
+                    response_type = self._response_type(
+                        Type, kwargs.pop("fields", None)
+                    )
+                    data = func(self, *args, **kwargs)
+                    timer.add("auth", time.perf_counter() - started)
+                    key = request_key(data)
+                except (Exception, asyncio.CancelledError) as e:
+                    timer.finish(error=e)
+                    raise
+                cached = self._memory_cached(endpoint, key, response_type)
+                if cached is None and self._persists(endpoint):
+                    # sqlite waits up to its timeout for a write lock held by
+                    # another process, which must not stall the event loop
+                    cached = await asyncio.to_thread(
+                        self._stored, endpoint, key, response_type
+                    )
+                if cached is not None:
+                    timer.finish(cache="hit")
+                    return cached
+                if self.coalesce:
+                    return await self._fetch_shared(
+                        endpoint, key, response_type, data, timer
+                    )
+                return await self._fetch(endpoint, key, response_type, data, timer)
 
-        Parameters:
-            - user_ids: list[int] - List of Osu! user IDs.
+            return wrapper
 
-        Returns: losuapi.types.Users
+        return decorator
 
-        Returns None if http request errors out.
+    @classmethod
+    def _chunked_method(
+        cls, endpoint: Endpoint, method, chunked_signature: inspect.Signature
+    ):
         """
-        return super().users(user_ids=user_ids)
-
-    ##########
-    #
-    # Async ranking methods
-    #
-    #########
-    @request(Type=Rankings)
-    def ranking(
-        self,
-        mode: GameMode | str,
-        Type: RankingType | str,
-        Filter: str = "all",
-        country: int = None,
-        cursor: int = None,
-        spotlight_id: int = None,
-        variant: str = None,
-    ) -> Rankings:
-        """
-        Gets the current ranking for the specified type and game mode.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-ranking
-
-        Parameters:
-            - mode: GameMode | str | None - Osu! gamemode.
-                - (osu, taiko, mania, fruits)
-            - Type: RankingType | str - Ranking type.
-                - ('charts', 'country', 'performance', 'score')
-            - Filter: str | None - 'all' or 'friends', defaults to 'all'.
-            - country: int | None - Country code, only available for Type 'performance'.
-            - cursor: int | None - https://osu.ppy.sh/docs/index.html#cursor
-            - spotlight_id: int | None - ID of the spotlight if Type is 'charts'. Ranking for latest spotlight if not specified.
-            - variant: str | None - Filter ranking by specified mode variant, only for mode of 'mania', Type must be 'performance'.
-
-        Returns: losuapi.types.Rankings
-
-        Returns None if http request errors out.
+        Returns the public coroutine method of an id list endpoint, requesting
+        at most max_concurrency chunks at a time.
         """
-        return super().ranking(
-            mode=mode,
-            Type=Type,
-            Filter=Filter,
-            country=country,
-            cursor=cursor,
-            spotlight_id=spotlight_id,
-            variant=variant,
-        )
 
-    @request(Type=Spotlights)
-    def spotlights(self) -> Spotlights:
-        """
-        Gets the list of spotlights.
+        async def chunked_method(self, *args, **kwargs):
+            ids, fields, arguments = self._chunk_arguments(
+                endpoint, chunked_signature, args, kwargs
+            )
+            results = await self._gather_chunks(
+                functools.partial(method, self),
+                ids,
+                arguments["max_concurrency"],
+                fields=fields,
+            )
+            return self._chunked_result(endpoint, ids, results)
 
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-spotlights
+        return chunked_method
 
-        Parameters: None
-        Returns: losuapi.types.Spotlights
 
-        Returns None if http request errors out.
-        """
-        return super().spotlights()
+for endpoint in ENDPOINTS:
+    AsyncOsuApi._add_endpoint(endpoint)
@@ -0,0 +1,49 @@
+import functools
+from .BaseOsuApiPool import BaseOsuApiPool
+from .AsyncOsuApi import AsyncOsuApi
+from .endpoints import ENDPOINTS
+
+
+class AsyncOsuApiPool(BaseOsuApiPool):
+    """
+    AsyncOsuApi that spreads its requests over several OAuth clients.
+
+    Has the endpoint coroutine methods, batch and batch_as_completed of
+    AsyncOsuApi.
+    """
+
+    client_class = AsyncOsuApi
+
+    async def _call(self, name: str, args: tuple, kwargs: dict):
+        tried = set()
+        while True:
+            index = self._acquire(tried)
+            try:
+                result = await getattr(self.clients[index], name)(*args, **kwargs)
+            finally:
+                self._release(index)
+            if not self._fail_over(index, result, tried):
+                return result
+
+    batch_as_completed = AsyncOsuApi.batch_as_completed
+    batch = AsyncOsuApi.batch
+
+    async def aclose(self) -> None:
+        """Closes the pooled connections of every client."""
+        for client in self.clients:
+            await client.aclose()
+
+    @classmethod
+    def _add_endpoint(cls, name: str) -> None:
+        """Adds a coroutine method dispatching an AsyncOsuApi endpoint method to a credential."""
+
+        @functools.wraps(getattr(AsyncOsuApi, name))
+        async def method(self, *args, **kwargs):
+            return await self._call(name, args, kwargs)
+
+        method.__qualname__ = f"{cls.__name__}.{name}"
+        setattr(cls, name, method)
+
+
+for endpoint in ENDPOINTS:
+    AsyncOsuApiPool._add_endpoint(endpoint.name)
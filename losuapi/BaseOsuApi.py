@@ -1,31 +1,54 @@
 from functools import wraps
-import re
+from typing import Any, Callable, NamedTuple
+import importlib.util
+import inspect
+import threading
 import time
 import httpx
-from .types import (
-    Beatmap,
-    Beatmaps,
-    Rankings,
-    User,
-    Scores,
-    Score,
-    ScoreTypes,
-    GameMode,
-    GameModeInt,
-    RankingType,
-    ScoreTypes,
-    BeatmapUserScore,
-    BeatmapScores,
-    Attributes,
-    KudosuHistory,
-    BeatmapType,
-    BeatmapPlaycount,
-    Beatmapset,
-    Users,
-    Event,
-    Spotlights,
-)
+from .types import Beatmap
 from .utility import c_TypeError
+from .endpoints import (
+    CHUNK_DOC,
+    ENDPOINTS,
+    FIELDS_DOC,
+    FIELDS_PARAMETER,
+    Endpoint,
+    compile_builder,
+    docstring,
+    signature,
+)
+from .parsing import (
+    PARSE_MODES,
+    decode_struct,
+    get_decoder,
+    is_error,
+    parse,
+    projection,
+    struct_type,
+)
+from .RateLimiter import RateLimiter
+from .Retry import Retry
+from .CircuitBreaker import CircuitBreaker
+from .TokenCache import TokenCache
+from .Metrics import Metrics, NO_TIMER
+from .ResponseCache import ResponseCache
+from .SqliteCache import SqliteCache
+
+
+class BatchResult(NamedTuple):
+    """
+    Outcome of one call submitted to OsuApi.map or AsyncOsuApi.batch.
+
+    - index: int - Position of the call in the submitted calls.
+    - call: tuple[str, dict] - The submitted (method name, kwargs) pair.
+    - result: Any - Return value of the method, None if it failed.
+    - error: Exception | None - Exception raised by the call.
+    """
+
+    index: int
+    call: tuple[str, dict]
+    result: Any
+    error: Exception | None
 
 
 class BaseOsuApi:
@@ -37,630 +60,571 @@ class BaseOsuApi:
     BASE_URL = "https://osu.ppy.sh/api/v2"
     TOKEN_URL = "https://osu.ppy.sh/oauth/token"
 
-    def __init__(self, client_id: int, client_secret: str) -> None:
+    # maximum number of ids the api accepts in a single beatmaps/users request
+    MAX_IDS = 50
+
+    # how paginate() walks the pages of an endpoint, "offset" endpoints take
+    # limit/offset params and "cursor" endpoints return the next page cursor
+    PAGE_STYLES = {
+        endpoint.name: endpoint.paging for endpoint in ENDPOINTS if endpoint.paging
+    }
+    # endpoints whose offset param is a string
+    STR_OFFSETS = tuple(
+        endpoint.name
+        for endpoint in ENDPOINTS
+        for param in endpoint.params
+        if param.name == "offset" and param.types == (str,)
+    )
+    PAGE_SIZE = 50
+
+    # extra (parameter, doc line) pairs and docstring note of the public
+    # methods of id list endpoints
+    CHUNK_PARAMS: tuple[tuple[inspect.Parameter, str], ...] = ()
+    CHUNK_NOTE = CHUNK_DOC
+
+    def __init__(
+        self,
+        client_id: int,
+        client_secret: str,
+        json_decoder: str = "json",
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        persistent_cache: SqliteCache | None = None,
+        parse_mode: str = "validate",
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        keepalive_expiry: float | None = 5.0,
+        http2: bool = False,
+        timeout: float | None = 30.0,
+        timeouts: dict[str, float] | None = None,
+        retry: Retry | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        token_cache: TokenCache | None = None,
+        metrics: Metrics | None = None,
+        transport: httpx.BaseTransport | httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """
+        Parameters:
+            - client_id: int - Osu! OAuth client ID.
+            - client_secret: str - Osu! OAuth client secret.
+            - json_decoder: str - JSON decoder backend used for responses.
+                - ('json', 'orjson', 'msgspec')
+            - rate_limiter: RateLimiter | None - Throttles requests, can be
+              shared between several clients.
+            - cache: ResponseCache | None - In-memory cache of parsed responses.
+            - persistent_cache: SqliteCache | None - On-disk cache of responses
+              that rarely change.
+            - parse_mode: str - How responses are turned into objects.
+                - 'validate': pydantic models, validated up front.
+                - 'lazy': losuapi.parsing.LazyModel objects that validate each
+                  field the first time it is read.
+                - 'msgspec': compact msgspec Structs with the same fields as the
+                  models, decoded straight from the response bytes.
+                - 'construct': pydantic models built without validation, only
+                  for responses that are trusted to match the models.
+            - max_connections: int | None - Maximum number of open connections, None for no limit.
+            - max_keepalive_connections: int | None - Maximum number of idle connections kept open.
+            - keepalive_expiry: float | None - Seconds an idle connection is kept open.
+            - http2: bool - Multiplex requests over HTTP/2 connections (pip install losuapi[http2]).
+            - timeout: float | None - Seconds to wait for a connection or response, None for no limit.
+            - timeouts: dict[str, float] | None - Per endpoint timeout overrides, by client method name.
+            - retry: Retry | None - Sends idempotent requests again after transport
+              errors and 429/5xx responses, None for a single attempt.
+            - circuit_breaker: CircuitBreaker | None - Fails requests fast with
+              CircuitOpenError while the api keeps failing, can be shared
+              between several clients.
+            - token_cache: TokenCache | None - File of tokens that new processes
+              reuse instead of requesting their own.
+            - metrics: Metrics | None - Records timings, sizes, status codes and
+              cache results of every call, can be shared between several clients.
+            - transport: httpx.BaseTransport | httpx.AsyncBaseTransport | None - Sends
+              the requests instead of the pooled http connections, e.g. a
+              CassetteTransport. The connection pool and http2 options do not
+              apply to it.
+
+        No auth token is requested until the first api request.
+        """
         self.__client_id: int = client_id
         self.__client_secret: str = client_secret
-        self.authorization, self.expires_in = self.__new_auth()
-        self.expired_time: int = time.time() + self.expires_in
+        self.decode = get_decoder(json_decoder)
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.persistent_cache = persistent_cache
+        if parse_mode not in PARSE_MODES:
+            raise ValueError(
+                f"param<parse_mode> must be one of {', '.join(PARSE_MODES)}"
+            )
+        self.parse_mode: str = parse_mode
+        if parse_mode == "msgspec":
+            # fails early if msgspec is not installed
+            struct_type(Beatmap)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        if http2 and importlib.util.find_spec("h2") is None:
+            raise ImportError(
+                "http2=True requires the h2 package (pip install losuapi[http2])"
+            )
+        self.http2: bool = http2
+        self.timeout: float | None = timeout
+        self.timeouts: dict[str, float] = dict(timeouts or {})
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        self.token_cache = token_cache
+        self.metrics = metrics
+        self.transport = transport
+        self._refresh_lock = threading.Lock()
+        self.authorization: str | None = None
+        self.expires_in: int = 0
+        self.expired_time: float = 0
+
+    def _client_options(self) -> dict:
+        """
+        Returns the options of the pooled httpx client, shared by the sync and
+        async clients.
+        """
+        return {
+            "timeout": self.timeout,
+            "limits": self.limits,
+            "http2": self.http2,
+            "transport": self.transport,
+        }
+
+    def _timer(self, endpoint: str):
+        """Returns the timer of a call, a no-op one if the client has no metrics."""
+        return NO_TIMER if self.metrics is None else self.metrics.timer(endpoint)
+
+    def _timeout(self, endpoint: str) -> float | None:
+        """Returns the timeout in seconds of requests to an endpoint."""
+        return self.timeouts.get(endpoint, self.timeout)
 
-    def __new_auth(self):
+    def _check_circuit(self) -> None:
+        """Raises CircuitOpenError if the circuit breaker is open."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.check()
+
+    def _retry_delay(
+        self, data: dict, attempt: int, response: httpx.Response = None
+    ) -> float | None:
         """
-        returns string in the format "Bearer {{ token }}".
+        Records the outcome of an attempt with the circuit breaker.
 
-        Uses the client_id and client_secret set by user
-        to retrieve an auth token for the Osu! api.
+        Returns the seconds to wait before sending the request again, None if
+        it should not be retried. response is None after a transport error.
+        """
+        status_code = None if response is None else response.status_code
+        if self.circuit_breaker is not None:
+            if status_code is None or status_code >= 500:
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
+        if self.retry is None or not self.retry.retries(
+            data["method"], attempt, status_code
+        ):
+            return None
+        return self.retry.delay(attempt, None if response is None else response.headers)
+
+    def _auth_body(self) -> dict:
+        """
+        Returns the json body of a client credentials token request.
 
         Api documentation: https://osu.ppy.sh/docs/index.html#client-credentials-grant
         """
-        body_params = {
+        return {
             "client_id": self.__client_id,
             "client_secret": self.__client_secret,
             "grant_type": "client_credentials",
             "scope": "public",
         }
 
-        response = httpx.post(
-            url=self.TOKEN_URL, json=body_params, headers=self.base_headers
-        ).json()
+    def _set_auth(self, response: dict) -> None:
+        """
+        Stores the "Bearer {{ token }}" string and expiry time from a decoded
+        token response.
+        """
         if "error" in response:
             raise ConnectionError(f'error: {response["error"]}')
-        return (response["token_type"] + " " + response["access_token"], response["expires_in"])
+        self.authorization = response["token_type"] + " " + response["access_token"]
+        self.expires_in = response["expires_in"]
+        self.expired_time = time.time() + self.expires_in
+        if self.token_cache is not None:
+            self.token_cache.set(
+                self.__client_id,
+                self.__client_secret,
+                self.authorization,
+                self.expired_time,
+            )
+
+    def _cached_auth(self, margin: float = 0) -> bool:
+        """
+        Loads a token from the token cache, True if one valid for at least
+        margin more seconds was found.
+        """
+        if self.token_cache is None:
+            return False
+        cached = self.token_cache.get(self.__client_id, self.__client_secret)
+        if cached is None or cached[1] - margin <= time.time():
+            return False
+        self.authorization, self.expired_time = cached
+        self.expires_in = int(self.expired_time - time.time())
+        return True
+
+    def _new_auth(self) -> None:
+        """
+        Uses the client_id and client_secret set by user
+        to retrieve an auth token for the Osu! api.
+
+        The token request goes through the pooled client of the instance.
+        """
+        response = self.Client.post(
+            url=self.TOKEN_URL, json=self._auth_body(), headers=self.base_headers
+        )
+        self._set_auth(self.decode(response.content))
+
+    def _refresh_auth(self) -> None:
+        """
+        Fetches a new auth token if it is still expired once the refresh lock
+        is held, so threads racing on an expired token share one request.
+        """
+        with self._refresh_lock:
+            if self.auth_expired and not self._cached_auth():
+                self._new_auth()
+
+    @property
+    def auth_expired(self) -> bool:
+        """
+        True if no token has been fetched yet or the current one has expired.
+        """
+        return not self.authorization or time.time() >= self.expired_time
 
     def verify_auth(func):
         """
-        Verifies that Auth token exists and adds it to a headers dictionary
+        Verifies that Auth token exists and adds it to a new headers dictionary
         """
 
         @wraps(func)
         def wrapper(self, *args, **kwargs):
-            if not self.authorization:
-                self.authorization, self.expires_in = self.__new_auth()
-            if time.time() >= self.expired_time:
-                self.authorization, self.expires_in = self.__new_auth()
-            headers = self.base_headers
-            headers["Authorization"] = self.authorization
+            if self.auth_expired:
+                self._refresh_auth()
+            headers = {**self.base_headers, "Authorization": self.authorization}
             return func(self, headers, *args, **kwargs)
 
         return wrapper
 
-    # ? https://osu.ppy.sh/docs/index.html#lookup-beatmap
-    @verify_auth
-    def lookup_beatmap(
-        self, headers, beatmap_id: int, checksum: str = None, filename: str = None
-    ) -> Beatmap:
-        query_params = {}
-
-        if not isinstance(beatmap_id, int):
-            raise c_TypeError(
-                param_name="beatmap_id", correct="int", wrong=type(beatmap_id).__name__
-            )
-        query_params["id"] = beatmap_id
-
-        if checksum:
-            if not isinstance(checksum, str):
-                raise c_TypeError(
-                    param_name="checksum", correct="str", wrong=type(checksum).__name__
-                )
-            query_params["checksum"] = checksum
-
-        if filename:
-            if not isinstance(filename, str):
-                raise c_TypeError(
-                    param_name="filename", correct="str", wrong=type(filename).__name__
-                )
-            query_params["filename"] = filename
-
-        return {
-            "method": "GET",
-            "url": self.BASE_URL + "/beatmaps/lookup",
-            "params": query_params,
-            "headers": headers,
-        }
-
-    # ? https://osu.ppy.sh/docs/index.html#get-a-user-beatmap-score
-    @verify_auth
-    def user_beatmap_score(
-        self,
-        headers,
-        beatmap_id: int,
-        user_id: int,
-        mode: GameMode | str = None,
-        mods: str = None,
-    ) -> BeatmapUserScore:
-        query_params = {}
-
-        if not isinstance(beatmap_id, int):
-            raise c_TypeError(
-                param_name="beatmap_id", correct="int", wrong=type(beatmap_id).__name__
-            )
-        if not isinstance(user_id, int):
-            raise c_TypeError(
-                param_name="user_id", correct="int", wrong=type(user_id).__name__
-            )
-
-        if mode:
-            if not isinstance(mode, (GameMode, str)):
-                raise c_TypeError(
-                    param_name="mode", correct="GameMode|str", wrong=type(mode).__name__
-                )
-            if isinstance(mode, GameMode):
-                mode = mode.value
-            query_params["mode"] = mode
-
-        if mods:
-            if not isinstance(mods, str):
-                raise c_TypeError(
-                    param_name="mods", correct="str", wrong=type(mods).__name__
-                )
-            query_params["mods"] = mods
-
-        return {
-            "method": "GET",
-            "url": self.BASE_URL + f"/beatmaps/{beatmap_id}/scores/users/{user_id}",
-            "params": query_params,
-            "headers": headers,
-        }
-
-    # ? https://osu.ppy.sh/docs/index.html#get-a-user-beatmap-scores
-    @verify_auth
-    def user_beatmap_scores(
-        self, headers, beatmap_id: int, user_id: int, mode: GameMode | str = None
-    ) -> Scores:
-        query_params = {}
+    def _parse_body(self, Type, content: bytes):
+        """
+        Builds the response type from a raw response body in the client's
+        parse mode.
+        """
+        if self.parse_mode == "msgspec":
+            return decode_struct(Type, content)
+        return parse(Type, self.decode(content), self.parse_mode)
 
-        if not isinstance(beatmap_id, int):
-            raise c_TypeError(
-                param_name="beatmap_id", correct="int", wrong=type(beatmap_id).__name__
-            )
-        if not isinstance(user_id, int):
-            raise c_TypeError(
-                param_name="user_id", correct="int", wrong=type(user_id).__name__
-            )
+    def _cached(self, endpoint: str, key: tuple, Type):
+        """
+        Returns a cached response for a request, None if neither the in-memory
+        nor the persistent cache holds one.
+        """
+        if (result := self._memory_cached(endpoint, key, Type)) is not None:
+            return result
+        return self._stored(endpoint, key, Type)
 
-        if mode:
-            if not isinstance(mode, (GameMode, str)):
-                raise c_TypeError(
-                    param_name="mode", correct="GameMode|str", wrong=type(mode).__name__
-                )
-            if isinstance(mode, GameMode):
-                mode = mode.value
-            query_params["mode"] = mode
+    def _memory_cached(self, endpoint: str, key: tuple, Type):
+        """Returns the in-memory cached response for a request, None on a miss."""
+        if self.cache is None:
+            return None
+        return self.cache.get(endpoint, (key, self.parse_mode, Type))
 
-        return {
-            "method": "GET",
-            "url": self.BASE_URL + f"/beatmaps/{beatmap_id}/scores/users/{user_id}/all",
-            "params": query_params,
-            "headers": headers,
-        }
+    def _stored(self, endpoint: str, key: tuple, Type):
+        """
+        Returns the response for a request from the persistent cache, None if
+        it holds no valid one, and keeps it in the in-memory cache.
+        """
+        if self.persistent_cache is None:
+            return None
+        if (body := self.persistent_cache.get(endpoint, key)) is None:
+            return None
+        result = self._parse_body(Type, body)
+        if self.cache is not None:
+            self.cache.set(endpoint, (key, self.parse_mode, Type), result)
+        return result
+
+    def _persists(self, endpoint: str) -> bool:
+        """True if responses of the endpoint go to the persistent cache."""
+        return self.persistent_cache is not None and self.persistent_cache.stores(
+            endpoint
+        )
+
+    def _store(self, endpoint: str, key: tuple, content: bytes, res=None) -> None:
+        """
+        Writes a response body to the persistent cache, res is the decoded
+        body if it is at hand.
+        """
+        if not self._persists(endpoint):
+            return
+        if res is None:
+            res = self.decode(content)
+        self.persistent_cache.set(endpoint, key, content, res)
 
-    # ? https://osu.ppy.sh/docs/index.html#get-beatmap-scores
-    @verify_auth
-    def beatmap_scores(
+    def _parse_response(
         self,
-        headers,
-        beatmap_id: int,
-        mode: GameMode | str = None,
-        mods: str = None,
-        Type: str = None,
-    ) -> BeatmapScores:
-        query_params = {}
-
-        if not isinstance(beatmap_id, int):
-            raise c_TypeError(
-                param_name="beatmap_id", correct="int", wrong=type(beatmap_id).__name__
-            )
-
-        if mode:
-            if not isinstance(mode, (GameMode, str)):
-                raise c_TypeError(
-                    param_name="mode", correct="GameMode|str", wrong=type(mode).__name__
-                )
-            if isinstance(mode, GameMode):
-                mode = mode.value
-            query_params["mode"] = mode
-
-        if mods:
-            if not isinstance(mods, str):
-                raise c_TypeError(
-                    param_name="mods", correct="str", wrong=type(mods).__name__
-                )
-            query_params["mods"] = mods
-
-        if Type:
-            if not isinstance(Type, str):
-                raise c_TypeError(
-                    param_name="Type", correct="str", wrong=type(Type).__name__
-                )
-
-        return {
-            "method": "GET",
-            "url": self.BASE_URL + f"/beatmaps/{beatmap_id}/scores",
-            "params": query_params,
-            "headers": headers,
-        }
-
-    # ? https://osu.ppy.sh/docs/index.html#get-beatmaps
-    @verify_auth
-    def beatmaps(self, headers, beatmap_ids: list[int]) -> Beatmaps:
-        query_params = {}
-
-        if not isinstance(beatmap_ids, list):
-            raise c_TypeError(
-                param_name="beatmap_ids",
-                correct="list",
-                wrong=type(beatmap_ids).__name__,
-            )
-        if not isinstance(beatmap_ids[0], int):
-            raise c_TypeError(
-                param_name="beatmap_ids[elements]",
-                correct="int",
-                wrong=type(beatmap_ids[0]).__name__,
-            )
-        query_params["ids[]"] = beatmap_ids
-
-        return {
-            "method": "GET",
-            "url": self.BASE_URL + "/beatmaps",
-            "params": query_params,
-            "headers": headers,
-        }
+        endpoint: str,
+        key: tuple,
+        Type,
+        content: bytes,
+        status_code: int = 200,
+        timer=NO_TIMER,
+        store: bool = True,
+    ):
+        """
+        Decodes and validates a response body and stores it in the caches.
 
-    # ? https://osu.ppy.sh/docs/index.html#get-beatmap
-    @verify_auth
-    def beatmap(self, headers, beatmap_id: int) -> Beatmap:
-        if not isinstance(beatmap_id, int):
-            raise c_TypeError(
-                param_name="beatmap_id", correct="int", wrong=type(beatmap_id).__name__
+        Returns None if the api responded with an error. The persistent cache
+        is left to the caller if store is False.
+        """
+        if status_code >= 400:
+            # error bodies can decode into response types whose fields are all
+            # optional (Rankings, fields= projections) in msgspec mode
+            return None
+        res = None
+        started = time.perf_counter()
+        if self.parse_mode == "msgspec":
+            try:
+                result = decode_struct(Type, content)
+            except ValueError:
+                # error bodies do not match the response type
+                if is_error(res := self.decode(content)):
+                    return None
+                raise
+            finally:
+                timer.add("decode", time.perf_counter() - started)
+        else:
+            res = self.decode(content)
+            decoded = time.perf_counter()
+            timer.add("decode", decoded - started)
+            if is_error(res):
+                return None
+            result = parse(Type, res, self.parse_mode)
+            timer.add("validate", time.perf_counter() - decoded)
+        if store:
+            self._store(endpoint, key, content, res)
+        if self.cache is not None:
+            self.cache.set(endpoint, (key, self.parse_mode, Type), result)
+        return result
+
+    def _page_start(self, endpoint: str, kwargs: dict) -> tuple[int, dict]:
+        """
+        Returns the starting position of paginate() and the endpoint kwargs
+        without the paging params.
+        """
+        if endpoint not in self.PAGE_STYLES:
+            raise ValueError(
+                f"param<endpoint> must be one of {', '.join(self.PAGE_STYLES)}"
             )
-
-        return {
-            "method": "GET",
-            "url": self.BASE_URL + f"/beatmaps/{beatmap_id}",
-            "params": {},
-            "headers": headers,
-        }
-
-    # ? https://osu.ppy.sh/docs/index.html#get-beatmap-attributes
-    @verify_auth
-    def beatmap_attributes(
+        kwargs = dict(kwargs)
+        if self.PAGE_STYLES[endpoint] == "cursor":
+            # the next page is found from the cursor of a fields= projection too
+            fields = kwargs.get("fields")
+            if isinstance(fields, (list, tuple)) and not (
+                "cursor" in fields or "cursor.page" in fields
+            ):
+                kwargs["fields"] = [*fields, "cursor.page"]
+            return kwargs.pop("cursor", None) or 0, kwargs
+        kwargs.pop("limit", None)
+        return int(kwargs.pop("offset", None) or 0), kwargs
+
+    def _page_kwargs(
         self,
-        headers,
-        beatmap_id: int,
-        mods: list[str] = None,
-        ruleset: GameMode | str = None,
-        ruleset_id: GameModeInt | int = None,
-    ) -> Attributes:
-        query_params = {}
-
-        if not isinstance(beatmap_id, int):
+        endpoint: str,
+        kwargs: dict,
+        position: int,
+        page_size: int,
+        remaining: int | None,
+    ) -> dict:
+        """
+        Returns the endpoint kwargs that request the page at position.
+        """
+        if self.PAGE_STYLES[endpoint] == "cursor":
+            return {**kwargs, "cursor": position or None}
+        if remaining is not None:
+            page_size = min(page_size, remaining)
+        offset = position or None
+        if offset and endpoint in self.STR_OFFSETS:
+            offset = str(offset)
+        return {**kwargs, "limit": page_size, "offset": offset}
+
+    def _page_items(
+        self, endpoint: str, page_kwargs: dict, position: int, result
+    ) -> tuple[list, int | None]:
+        """
+        Returns the items of a page and the position of the next page, None
+        if it was the last one.
+        """
+        if result is None:
+            return [], None
+        if self.PAGE_STYLES[endpoint] == "cursor":
+            # fields= projections only hold the selected list
+            items = getattr(result, "ranking", None)
+            if items is None:
+                items = getattr(result, "beatmapsets", None)
+            cursor = getattr(result, "cursor", None)
+            return items or [], cursor.page if cursor else None
+        if len(result) < page_kwargs["limit"]:
+            return result, None
+        return result, position + len(result)
+
+    @staticmethod
+    def _response_type(Type, fields: list[str] | None):
+        """
+        Returns the type a response is parsed into, the projection of Type if
+        fields are selected.
+        """
+        if fields is None:
+            return Type
+        if not isinstance(fields, (list, tuple)):
             raise c_TypeError(
-                param_name="beatmap_id", correct="int", wrong=type(beatmap_id).__name__
+                param_name="fields", correct="list", wrong=type(fields).__name__
             )
-
-        if mods:
-            if not isinstance(mods, list):
-                raise c_TypeError(
-                    param_name="mods", correct="list", wrong=type(mods).__name__
-                )
-            if not isinstance(mods[0], int):
+        for field in fields:
+            if not isinstance(field, str):
                 raise c_TypeError(
-                    param_name="mods[elements]",
+                    param_name="fields[elements]",
                     correct="str",
-                    wrong=type(mods[0]).__name__,
-                )
-            query_params["mods"] = mods
-
-        if ruleset:
-            if not isinstance(ruleset, (GameMode, str)):
-                raise c_TypeError(
-                    param_name="ruleset",
-                    correct="GameMode|str",
-                    wrong=type(ruleset).__name__,
-                )
-            if isinstance(ruleset, GameMode):
-                ruleset = ruleset.value
-            query_params["ruleset"] = ruleset
-
-        if ruleset_id:
-            if not isinstance(ruleset_id, (GameModeInt, int)):
-                raise c_TypeError(
-                    param_name="ruleset_id",
-                    correct="GameMode|int",
-                    wrong=type(ruleset_id).__name__,
-                )
-            query_params["ruleset_id"] = ruleset_id
-
-        return {
-            "method": "POST",
-            "url": self.BASE_URL + f"/beatmaps/{beatmap_id}/attributes",
-            "params": query_params,
-            "headers": headers,
-        }
-
-    # ? https://osu.ppy.sh/docs/index.html#get-user-kudosu
-    @verify_auth
-    def user_kudosu(
-        self, headers, user_id: int, limit: int = None, offset: str = None
-    ) -> list[KudosuHistory]:
-        query_params = {}
-
-        if not isinstance(user_id, int):
-            raise c_TypeError(
-                param_name="user_id", correct="int", wrong=type(user_id).__name__
-            )
-
-        if limit:
-            if not isinstance(limit, int):
-                raise c_TypeError(
-                    param_name="limit", correct="int", wrong=type(limit).__name__
-                )
-            query_params["limit"] = limit
-
-        if offset:
-            if not isinstance(offset, str):
-                raise c_TypeError(
-                    param_name="offset", correct="str", wrong=type(offset).__name__
-                )
-            query_params["offset"] = offset
-
-        return {
-            "method": "GET",
-            "url": self.BASE_URL + f"/users/{user_id}/kudosu",
-            "params": query_params,
-            "headers": headers,
-        }
-
-    # ? https://osu.ppy.sh/docs/index.html#get-user-scores
-    @verify_auth
-    def user_scores(
-        self,
-        headers,
-        user_id: int,
-        Type: ScoreTypes | str,
-        include_fails: bool = False,
-        mode: GameMode | str = None,
-        limit: int = None,
-        offset: int = None,
-    ) -> list[Score]:
-        query_params = {}
-
-        if not isinstance(user_id, int):
-            raise c_TypeError(
-                param_name="user_id", correct="int", wrong=type(user_id).__name__
-            )
-
-        if not isinstance(Type, (ScoreTypes, str)):
-            raise c_TypeError(
-                param_name="Type", correct="ScoreTypes|str", wrong=type(Type).__name__
-            )
-        if Type not in ScoreTypes.list():
-            raise ValueError("param<Type> must be 'best', 'firsts', or 'recent'")
-
-        if include_fails != False:
-            if Type != ScoreTypes.RECENT.value:
-                raise ValueError(
-                    "param<Type> must be 'recent' in order to set include_fails"
-                )
-            query_params["include_fails"] = int(include_fails)
-
-        if mode:
-            if not isinstance(mode, (GameMode, str)):
-                raise c_TypeError(
-                    param_name="mode", correct="GameMode|str", wrong=type(mode).__name__
-                )
-            if isinstance(mode, GameMode):
-                mode = mode.value
-            query_params["mode"] = mode
-
-        if limit:
-            if not isinstance(limit, int):
-                raise c_TypeError(
-                    param_name="limit", correct="int", wrong=type(limit).__name__
-                )
-            query_params["limit"] = limit
-
-        if offset:
-            if not isinstance(offset, int):
-                raise c_TypeError(
-                    param_name="offset", correct="int", wrong=type(offset).__name__
+                    wrong=type(field).__name__,
                 )
-            query_params["offset"] = offset
-
-        return {
-            "method": "GET",
-            "url": self.BASE_URL + f"/users/{user_id}/scores/{Type}",
-            "params": query_params,
-            "headers": headers,
-        }
-
-    # ? https://osu.ppy.sh/docs/index.html#get-user-beatmaps
-    @verify_auth
-    def user_beatmaps(
-        self,
-        headers,
-        user_id: int,
-        Type: BeatmapType | str,
-        limit: int = None,
-        offset: int = None,
-    ) -> list[BeatmapPlaycount] | list[Beatmapset]:
-        query_params = {}
-
-        if not isinstance(user_id, int):
-            raise c_TypeError(
-                param_name="user_id", correct="int", wrong=type(user_id).__name__
-            )
-        if not isinstance(Type, (BeatmapType, str)):
-            raise c_TypeError(
-                param_name="Type", correct="BeatmapType|str", wrong=type(Type).__name__
-            )
-        if isinstance(Type, BeatmapType):
-            Type = Type.value
-
-        if limit:
-            if not isinstance(limit, int):
-                raise c_TypeError(
-                    param_name="limit", correct="int", wrong=type(limit).__name__
-                )
-            query_params["limit"] = limit
-
-        if offset:
-            if not isinstance(offset, int):
-                raise c_TypeError(
-                    param_name="offset", correct="int", wrong=type(offset).__name__
-                )
-            query_params["offset"] = offset
-
-        return {
-            "method": "GET",
-            "url": self.BASE_URL + f"/users/{user_id}/beatmapsets/{Type}",
-            "params": query_params,
-            "headers": headers,
-        }
-
-    # ? https://osu.ppy.sh/docs/index.html#get-user-recent-activity
-    @verify_auth
-    def user_recent_activity(
-        self, headers, user_id: int, limit: int = None, offset: str = None
-    ) -> list[Event]:
-        query_params = {}
-
-        if not isinstance(user_id, int):
-            raise c_TypeError(
-                param_name="user_id", correct="int", wrong=type(user_id).__name__
-            )
-
-        if limit:
-            if not isinstance(limit, int):
-                raise c_TypeError(
-                    param_name="limit", correct="int", wrong=type(limit).__name__
-                )
-            query_params["limit"] = limit
-
-        if offset:
-            if not isinstance(offset, str):
-                raise c_TypeError(
-                    param_name="offset", correct="str", wrong=type(offset).__name__
-                )
-            query_params["offset"] = offset
-
-        return {
-            "method": "GET",
-            "url": self.BASE_URL + f"/users/{user_id}/recent_activity",
-            "params": query_params,
-            "headers": headers,
-        }
-
-    # ? https://osu.ppy.sh/docs/index.html#get-user
-    @verify_auth
-    def user(
-        self,
-        headers,
-        username: int | str,
-        mode: GameMode | str = "",
-        key: str = "",
-    ) -> User:
-        query_params = {}
-
-        if not isinstance(username, (int, str)):
-            raise c_TypeError(
-                param_name="username", correct="int|str", wrong=type(username).__name__
-            )
-        if re.match(pattern=r"^\s*$", string=str(username)):
-            raise ValueError("param<username> cannot be blank")
-
-        if mode != "":
-            if not isinstance(mode, (GameMode, str)):
-                raise c_TypeError(
-                    param_name="mode", correct="GameMode|str", wrong=type(mode).__name__
-                )
-            if isinstance(mode, GameMode):
-                mode = mode.value
-
-        if not re.match(pattern=r"^\s*$", string=str(key)):
-            if key not in ["id", "username"]:
-                raise ValueError("param<key> can only be 'id' or 'username'")
-            query_params["key"] = key
-
-        return {
-            "method": "GET",
-            "url": self.BASE_URL + f"/users/{username}/{mode}",
-            "params": query_params,
-            "headers": headers,
-        }
-
-    # ? https://osu.ppy.sh/docs/index.html#get-users
-    @verify_auth
-    def users(
-        self,
-        headers,
-        user_ids: list[int],
-    ) -> Users:
-        query_params = {}
-
-        if not isinstance(user_ids, list):
-            raise c_TypeError(
-                param_name="user_ids", correct="list", wrong=type(user_ids).__name__
-            )
-        if not isinstance(user_ids[0], int):
-            raise c_TypeError(
-                param_name="user_ids[elements]",
-                correct="int",
-                wrong=type(user_ids[0]).__name__,
-            )
-        query_params["ids[]"] = user_ids
+        return projection(Type, tuple(fields))
+
+    @classmethod
+    def _set_method(
+        cls, name: str, method, doc: str, method_signature: inspect.Signature
+    ) -> None:
+        """Adds a generated method to the client class under name."""
+        method.__name__ = name
+        method.__qualname__ = f"{cls.__name__}.{name}"
+        method.__doc__ = doc
+        method.__signature__ = method_signature
+        setattr(cls, name, method)
+
+    @classmethod
+    def _add_endpoint(cls, endpoint: Endpoint) -> None:
+        """
+        Adds the method of an endpoint, the builder wrapped by the request
+        decorator of the client class.
 
-        return {
-            "method": "GET",
-            "url": self.BASE_URL + "/users",
-            "params": query_params,
-            "headers": headers,
-        }
+        Id list endpoints get it as _{name} and a public method requesting the
+        ids in chunks of MAX_IDS, built by the client's _chunked_method.
+        """
+        method = cls.request(Type=endpoint.response)(getattr(BaseOsuApi, endpoint.name))
+        cls._set_method(
+            endpoint.name if endpoint.chunked is None else f"_{endpoint.name}",
+            method,
+            docstring(endpoint, FIELDS_DOC),
+            signature(endpoint, FIELDS_PARAMETER),
+        )
+        if endpoint.chunked is None:
+            return
+        chunked_signature = signature(
+            endpoint,
+            *(parameter for parameter, _ in cls.CHUNK_PARAMS),
+            FIELDS_PARAMETER.replace(kind=inspect.Parameter.POSITIONAL_OR_KEYWORD),
+        )
+        cls._set_method(
+            endpoint.name,
+            cls._chunked_method(endpoint, method, chunked_signature),
+            docstring(
+                endpoint,
+                *(doc for _, doc in cls.CHUNK_PARAMS),
+                FIELDS_DOC,
+                note=cls.CHUNK_NOTE,
+            ),
+            chunked_signature,
+        )
+
+    @classmethod
+    def _chunked_method(
+        cls, endpoint: Endpoint, method, chunked_signature: inspect.Signature
+    ) -> Callable:
+        """
+        Returns the public method of an id list endpoint, calling method on
+        every chunk of ids.
+        """
+        raise NotImplementedError
 
-    # ? https://osu.ppy.sh/docs/index.html#get-ranking
-    @verify_auth
-    def ranking(
-        self,
-        headers,
-        mode: GameMode | str,
-        Type: RankingType | str,
-        Filter: str = "all",
-        country: int = None,
-        cursor: int = None,
-        spotlight_id: int = None,
-        variant: str = None,
-    ) -> Rankings:
-        query_params = {}
-
-        if not isinstance(mode, (GameMode, str)):
-            raise c_TypeError(
-                param_name="mode", correct="GameMode|str", wrong=type(mode).__name__
-            )
-        if isinstance(mode, GameMode):
-            mode = mode.value
+    def _chunk_arguments(
+        self, endpoint: Endpoint, chunked_signature: inspect.Signature, args, kwargs
+    ) -> tuple[list[int], list[str] | None, dict]:
+        """
+        Binds a call of a chunked method and returns its unique ids, the
+        fields requested for every chunk and all of its arguments.
+        """
+        bound = chunked_signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        param_name = endpoint.params[0].name
+        ids = self._unique_ids(param_name, arguments[param_name])
+        return ids, self._chunk_fields(endpoint.chunked, arguments["fields"]), arguments
+
+    @staticmethod
+    def _chunk_fields(name: str, fields: list[str] | None) -> list[str] | None:
+        """
+        Adds the item id, needed to merge chunks, to a field selection.
+        """
+        if fields is None or f"{name}.id" in fields or name in fields:
+            return fields
+        return [*fields, f"{name}.id"]
 
-        if not isinstance(Type, (RankingType, str)):
+    @staticmethod
+    def _unique_ids(param_name: str, ids: list[int]) -> list[int]:
+        """
+        Validates an id list and returns it without duplicates, in order.
+        """
+        if not isinstance(ids, list):
             raise c_TypeError(
-                param_name="Type", correct="RankingType|str", wrong=type(Type).__name__
+                param_name=param_name, correct="list", wrong=type(ids).__name__
             )
-        if isinstance(Type, RankingType):
-            Type = Type.value
-
-        if Filter not in ["all", "friends"]:
-            raise ValueError("param<Filter> must be 'all' or 'friends'")
-        query_params["filter"] = Filter
-
-        if cursor:
-            if not isinstance(cursor, int):
+        for id in ids:
+            if not isinstance(id, int):
                 raise c_TypeError(
-                    param_name="cursor", correct="int", wrong=type(cursor).__name__
+                    param_name=f"{param_name}[elements]",
+                    correct="int",
+                    wrong=type(id).__name__,
                 )
-            if cursor < 0:
-                raise ValueError("param<cursor> must be greater that -1")
-            query_params["cursor"] = cursor
+        return list(dict.fromkeys(ids))
 
-        if country:
-            if not isinstance(country, int):
-                raise c_TypeError(
-                    param_name="country", correct="int", wrong=type(country).__name__
-                )
-            if Type != RankingType.PERFORMANCE.value:
-                raise ValueError(
-                    "param<Type> must be 'performance' in order to set a country code."
-                )
-            query_params["country"] = country
+    def _chunked_result(self, endpoint: Endpoint, ids: list[int], results: list):
+        """
+        Merges chunked responses and wraps their items in the response type, a
+        Struct in msgspec mode like every other response.
 
-        if spotlight_id:
-            if Type != RankingType.CHARTS.value:
-                raise ValueError(
-                    "param<Type> must be 'charts' in order to set a spotlight_id."
-                )
-            query_params["spotlight"] = spotlight_id
+        Returns None if any chunk request errored out.
+        """
+        name, Type = endpoint.chunked, endpoint.response
+        items = self._merge_chunks(
+            ids,
+            [None if result is None else getattr(result, name) for result in results],
+        )
+        if items is None:
+            return None
+        if self.parse_mode == "msgspec":
+            return struct_type(Type)(**{name: items})
+        return Type.construct(**{name: items})
+
+    @staticmethod
+    def _merge_chunks(ids: list[int], chunks: list[list | None]) -> list | None:
+        """
+        Merges the items of chunked responses back into the order of ids.
 
-        if variant:
-            if Type != RankingType.PERFORMANCE.value:
-                raise ValueError("param<Type> must be 'performance' to use variant")
-            if mode != GameMode.MANIA.value:
-                raise ValueError("param<mode> must be 'mania' to use variant")
-            if variant not in ["4k", "7k"]:
-                raise ValueError("variant can only be '4k' or '7k'")
-            query_params["variant"] = variant
+        Returns None if any chunk request errored out.
+        """
+        if any(chunk is None for chunk in chunks):
+            return None
+        by_id = {item.id: item for chunk in chunks for item in chunk}
+        return [by_id[id] for id in ids if id in by_id]
 
-        return {
-            "method": "GET",
-            "url": self.BASE_URL + f"/rankings/{mode}/{Type}",
-            "params": query_params,
-            "headers": headers,
-        }
 
-    # ? https://osu.ppy.sh/docs/index.html#get-spotlights
-    @verify_auth
-    def spotlights(
-        self,
-        headers,
-    ) -> Spotlights:
-        return {
-            "method": "GET",
-            "url": self.BASE_URL + "/spotlights",
-            "params": {},
-            "headers": headers,
-        }
+for endpoint in ENDPOINTS:
+    setattr(
+        BaseOsuApi, endpoint.name, BaseOsuApi.verify_auth(compile_builder(endpoint))
+    )
@@ -0,0 +1,112 @@
+import threading
+from typing import Any, Iterable
+from .BaseOsuApi import BaseOsuApi
+from .RateLimiter import RateLimiter
+
+
+class BaseOsuApiPool:
+    """
+    Spreads requests over several OAuth clients, each with its own token and
+    rate limiter.
+
+    Subclasses set client_class and send the calls.
+    """
+
+    STRATEGIES = ("least_loaded", "round_robin")
+    client_class: type[BaseOsuApi] = BaseOsuApi
+
+    def __init__(
+        self,
+        credentials: Iterable[tuple[int, str]],
+        strategy: str = "least_loaded",
+        rate: float = 1.0,
+        burst: int = 60,
+        **kwargs,
+    ) -> None:
+        """
+        Parameters:
+            - credentials: Iterable[tuple[int, str]] - (client_id, client_secret) pairs.
+            - strategy: str - How a credential is picked for each request.
+                - 'least_loaded': the one with the fewest requests in flight
+                  among those that can send straight away.
+                - 'round_robin': the next one that is not throttled.
+            - rate: float - Requests per second of each credential's RateLimiter.
+            - burst: int - Burst size of each credential's RateLimiter.
+            - **kwargs - Client options shared by every credential, see BaseOsuApi.__init__.
+
+        A request that fails while its credential got throttled (a 429 or an
+        exhausted X-RateLimit-Remaining) is sent again with another credential.
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(
+                f"param<strategy> must be one of {', '.join(self.STRATEGIES)}"
+            )
+        if "rate_limiter" in kwargs:
+            raise ValueError(
+                "param<rate_limiter> can not be shared, every credential has its own"
+            )
+        self.strategy: str = strategy
+        self.clients: list[BaseOsuApi] = [
+            self.client_class(
+                client_id,
+                client_secret,
+                rate_limiter=RateLimiter(rate=rate, burst=burst),
+                **kwargs,
+            )
+            for client_id, client_secret in credentials
+        ]
+        if not self.clients:
+            raise ValueError("param<credentials> must not be empty")
+        self._in_flight: list[int] = [0] * len(self.clients)
+        self._next: int = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def _acquire(self, tried: set[int]) -> int:
+        """
+        Picks the credential for a request among those not tried yet and
+        counts the request as in flight.
+        """
+        with self._lock:
+            candidates = [i for i in range(len(self.clients)) if i not in tried]
+            waits = {i: self.clients[i].rate_limiter.wait_time() for i in candidates}
+            if self.strategy == "round_robin":
+                candidates.sort(key=lambda i: (i - self._next) % len(self.clients))
+                index = next((i for i in candidates if not waits[i]), None)
+                if index is None:
+                    index = min(candidates, key=waits.__getitem__)
+                self._next = (index + 1) % len(self.clients)
+            else:
+                index = min(candidates, key=lambda i: (waits[i], self._in_flight[i]))
+            self._in_flight[index] += 1
+            tried.add(index)
+            return index
+
+    def _release(self, index: int) -> None:
+        with self._lock:
+            self._in_flight[index] -= 1
+
+    def _fail_over(self, index: int, result: Any, tried: set[int]) -> bool:
+        """
+        True if a request should be sent again with another credential.
+        """
+        return (
+            result is None
+            and len(tried) < len(self.clients)
+            and self.clients[index].rate_limiter.throttled
+        )
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Returns the in flight requests and throttle state of every credential."""
+        with self._lock:
+            in_flight = list(self._in_flight)
+        return [
+            {
+                "in_flight": count,
+                "wait_time": client.rate_limiter.wait_time(),
+                "throttled": client.rate_limiter.throttled,
+            }
+            for client, count in zip(self.clients, in_flight)
+        ]
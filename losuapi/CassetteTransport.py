@@ -0,0 +1,265 @@
+import asyncio
+import base64
+import gzip
+import json
+import random
+import threading
+import time
+import httpx
+
+# response headers stored in a cassette, the rest are dropped
+RECORDED_HEADERS = ("content-type", "retry-after")
+
+
+class CassetteMissError(LookupError):
+    """
+    Raised when a replayed request was never recorded.
+
+    - key: tuple - Spec key of the request.
+    """
+
+    def __init__(self, key: tuple) -> None:
+        super().__init__(f"no recorded response for {key[0]} {key[1]} {dict(key[2])}")
+        self.key: tuple = key
+
+
+def spec_key(request: httpx.Request) -> tuple:
+    """
+    Returns the key of a request: its method, url without the query and the
+    sorted query params, the same shape as losuapi.utility.request_key.
+
+    Headers are left out, so the auth token never takes part in the key.
+    """
+    values: dict[str, list[str]] = {}
+    for name, value in request.url.params.multi_items():
+        values.setdefault(name, []).append(value)
+    params = tuple(
+        sorted(
+            (name, tuple(value) if name.endswith("[]") or len(value) > 1 else value[0])
+            for name, value in values.items()
+        )
+    )
+    return (request.method, str(request.url.copy_with(query=None)), params)
+
+
+class CassetteTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    httpx transport that records api responses to a cassette file, or
+    replays them without any network access.
+
+    Pass it as the transport option of OsuApi or AsyncOsuApi. A cassette is
+    a gzip compressed file with one json line per response, keyed on the
+    request spec (method, url and params). Requests for the same key are
+    replayed in the order they were recorded, the last one is repeated once
+    they run out.
+
+    Token requests are never recorded, replay answers them with a fake token.
+    """
+
+    MODES = ("record", "replay")
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "replay",
+        latency: float | str = 0.0,
+        jitter: float = 0.0,
+        transport: httpx.BaseTransport = None,
+        async_transport: httpx.AsyncBaseTransport = None,
+    ) -> None:
+        """
+        Parameters:
+            - path: str - Path of the cassette file.
+            - mode: str - What the transport does with requests.
+                - 'record': sends them to the api and writes the responses,
+                  replacing the cassette.
+                - 'replay': answers them from the cassette.
+            - latency: float | str - Seconds every replayed response is delayed,
+              'recorded' to wait as long as the recorded request took.
+            - jitter: float - Up to this many random seconds added to latency.
+            - transport: httpx.BaseTransport | None - Transport used to record
+              sync requests, defaults to httpx.HTTPTransport().
+            - async_transport: httpx.AsyncBaseTransport | None - Transport used
+              to record async requests, defaults to httpx.AsyncHTTPTransport().
+
+        A recorded cassette is complete once the client is closed.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"param<mode> must be one of {', '.join(self.MODES)}")
+        if latency != "recorded" and (
+            not isinstance(latency, (int, float)) or latency < 0
+        ):
+            raise ValueError("param<latency> must be at least 0 or 'recorded'")
+        if jitter < 0:
+            raise ValueError("param<jitter> must be at least 0")
+        self.path: str = path
+        self.mode: str = mode
+        self.latency: float | str = latency
+        self.jitter: float = jitter
+        self._transport = transport
+        self._async_transport = async_transport
+        self._lock = threading.Lock()
+        self._file = None
+        self._responses: dict[tuple, list[dict]] = {}
+        self._served: dict[tuple, int] = {}
+        if mode == "record":
+            self._file = gzip.open(path, "wt", encoding="utf-8")
+        else:
+            self._load()
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                params = tuple(
+                    (name, tuple(value) if isinstance(value, list) else value)
+                    for name, value in entry["params"]
+                )
+                key = (entry["method"], entry["url"], params)
+                self._responses.setdefault(key, []).append(entry)
+
+    def __len__(self) -> int:
+        """Number of recorded responses."""
+        return sum(len(entries) for entries in self._responses.values())
+
+    @staticmethod
+    def _is_token_request(request: httpx.Request) -> bool:
+        return request.url.path.endswith("/oauth/token")
+
+    @staticmethod
+    def _token_response() -> httpx.Response:
+        return httpx.Response(
+            200,
+            json={
+                "token_type": "Bearer",
+                "access_token": "replay",
+                "expires_in": 86400,
+            },
+        )
+
+    # replay
+
+    def _replay(self, request: httpx.Request) -> tuple[httpx.Response, float]:
+        """Returns the recorded response of a request and the seconds to delay it."""
+        if self._is_token_request(request):
+            return self._token_response(), 0.0
+        key = spec_key(request)
+        entries = self._responses.get(key)
+        if not entries:
+            raise CassetteMissError(key)
+        with self._lock:
+            index = self._served.get(key, 0)
+            self._served[key] = index + 1
+        entry = entries[min(index, len(entries) - 1)]
+        if entry.get("encoding") == "base64":
+            content = base64.b64decode(entry["body"])
+        else:
+            content = entry["body"].encode()
+        delay = entry["elapsed"] if self.latency == "recorded" else self.latency
+        if self.jitter:
+            delay += random.uniform(0, self.jitter)
+        response = httpx.Response(
+            entry["status"], headers=entry["headers"], content=content
+        )
+        return response, delay
+
+    # record
+
+    def _record(
+        self, request: httpx.Request, response: httpx.Response, elapsed: float
+    ) -> httpx.Response:
+        """
+        Writes a response read in full to the cassette and returns a copy of
+        it for the client.
+        """
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name.lower() not in ("content-encoding", "content-length")
+        ]
+        if not self._is_token_request(request):
+            method, url, params = spec_key(request)
+            try:
+                body, encoding = response.content.decode("utf-8"), None
+            except UnicodeDecodeError:
+                body, encoding = base64.b64encode(response.content).decode(), "base64"
+            entry = {
+                "method": method,
+                "url": url,
+                "params": params,
+                "status": response.status_code,
+                "headers": {
+                    name: value
+                    for name, value in headers
+                    if name.lower() in RECORDED_HEADERS
+                },
+                "body": body,
+                "elapsed": round(elapsed, 6),
+            }
+            if encoding is not None:
+                entry["encoding"] = encoding
+            line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False)
+            with self._lock:
+                if self._file is None:
+                    raise RuntimeError(f"cassette {self.path} is closed")
+                self._file.write(line + "\n")
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=response.content,
+            extensions={
+                "http_version": response.extensions.get("http_version", b"HTTP/1.1")
+            },
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self.mode == "replay":
+            response, delay = self._replay(request)
+            if delay:
+                time.sleep(delay)
+            return response
+        if self._transport is None:
+            self._transport = httpx.HTTPTransport()
+        started = time.perf_counter()
+        response = self._transport.handle_request(request)
+        try:
+            response.read()
+        finally:
+            response.close()
+        return self._record(request, response, time.perf_counter() - started)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.mode == "replay":
+            response, delay = self._replay(request)
+            if delay:
+                await asyncio.sleep(delay)
+            return response
+        if self._async_transport is None:
+            self._async_transport = httpx.AsyncHTTPTransport()
+        started = time.perf_counter()
+        response = await self._async_transport.handle_async_request(request)
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        return self._record(request, response, time.perf_counter() - started)
+
+    def _close_file(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def close(self) -> None:
+        """Closes the recording transport and finishes the cassette."""
+        if self._transport is not None:
+            self._transport.close()
+        self._close_file()
+
+    async def aclose(self) -> None:
+        """Closes the async recording transport and finishes the cassette."""
+        if self._async_transport is not None:
+            await self._async_transport.aclose()
+        self._close_file()
@@ -0,0 +1,86 @@
+import threading
+import time
+
+
+class CircuitOpenError(ConnectionError):
+    """
+    Raised instead of sending a request while a CircuitBreaker is open.
+
+    - retry_in: float - Seconds until the breaker lets a trial request through.
+    """
+
+    def __init__(self, retry_in: float) -> None:
+        super().__init__(
+            f"osu! api circuit is open, requests are failing fast for {retry_in:.1f}s"
+        )
+        self.retry_in: float = retry_in
+
+
+class CircuitBreaker:
+    """
+    Fails requests fast while the Osu! api keeps failing.
+
+    The breaker opens after failure_threshold consecutive failures (transport
+    errors and 5xx responses). While open every request raises
+    CircuitOpenError straight away. After reset_timeout seconds one trial
+    request is let through: the breaker closes if it succeeds and opens
+    again if it fails.
+
+    One instance can be shared by several clients, like RateLimiter.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """
+        Parameters:
+            - failure_threshold: int - Consecutive failures that open the breaker.
+            - reset_timeout: float - Seconds the breaker stays open before a trial request.
+        """
+        if failure_threshold < 1:
+            raise ValueError("param<failure_threshold> must be at least 1")
+        if reset_timeout < 0:
+            raise ValueError("param<reset_timeout> must not be negative")
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+        self.failures: int = 0
+        self.opened_at: float = 0.0
+        self._state: str = self.CLOSED
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half_open' while a trial request is in flight."""
+        return self._state
+
+    def check(self) -> None:
+        """
+        Raises CircuitOpenError if a request may not be sent right now.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            now = time.monotonic()
+            retry_in = self.opened_at + self.reset_timeout - now
+            if retry_in > 0:
+                raise CircuitOpenError(retry_in)
+            # let a single trial request through, and another one later if it
+            # never reports back
+            self._state = self.HALF_OPEN
+            self.opened_at = now
+
+    def record_success(self) -> None:
+        """Closes the breaker and resets the failure count."""
+        with self._lock:
+            self.failures = 0
+            self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        """Counts a failure, opening the breaker at the threshold."""
+        with self._lock:
+            self.failures += 1
+            if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self.opened_at = time.monotonic()
@@ -0,0 +1,76 @@
+import contextlib
+import os
+import struct
+import time
+from typing import Iterator
+from .RateLimiter import RateLimiter
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - windows
+    fcntl = None
+
+# rate, tokens, updated
+_STATE = struct.Struct("<3d")
+
+
+class FileRateLimiter(RateLimiter):
+    """
+    Token bucket rate limiter shared by every process on a machine.
+
+    The bucket lives in a small file that is locked with flock(2) while a
+    token is taken, so any number of worker processes using the same path
+    stay under one budget together. It has the same interface as
+    RateLimiter and can be passed wherever one is accepted.
+
+    Only available on platforms with fcntl (Linux, macOS, BSD).
+    """
+
+    _clock = staticmethod(time.time)
+
+    def __init__(self, path: str, rate: float = 1.0, burst: int = 60) -> None:
+        """
+        Parameters:
+            - path: str - Path of the bucket file, created if it does not exist.
+            - rate: float - Requests per second the bucket refills at.
+            - burst: int - Maximum number of requests that can be sent at once.
+
+        Processes should use the same rate and burst, the rate stored in the
+        file is only ever lowered (by X-RateLimit-Limit responses).
+        """
+        if fcntl is None:
+            raise RuntimeError("FileRateLimiter requires fcntl, which is not available")
+        super().__init__(rate=rate, burst=burst)
+        self.path: str = path
+        self._fd: int | None = None
+        self._pid: int | None = None
+
+    def _file(self) -> int:
+        """Returns the file descriptor of the bucket file in this process."""
+        if self._fd is None or self._pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        return self._fd
+
+    @contextlib.contextmanager
+    def _state(self) -> Iterator[None]:
+        """
+        Holds the thread lock and the file lock while the bucket state is
+        read into the instance, and writes it back afterwards.
+        """
+        with self._lock:
+            fd = self._file()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                data = os.pread(fd, _STATE.size, 0)
+                if len(data) == _STATE.size:
+                    rate, self.tokens, self.updated = _STATE.unpack(data)
+                    self.rate = min(self.rate, rate)
+                else:
+                    self.tokens, self.updated = float(self.burst), self._clock()
+                state = (self.rate, self.tokens, self.updated)
+                yield
+                if (self.rate, self.tokens, self.updated) != state:
+                    os.pwrite(fd, _STATE.pack(self.rate, self.tokens, self.updated), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
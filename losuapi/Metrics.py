@@ -0,0 +1,287 @@
+import bisect
+import threading
+import warnings
+from time import perf_counter
+from typing import Any, Callable, NamedTuple
+
+# upper bounds of the latency buckets in seconds, 100us to 60s
+TIME_BOUNDS = tuple(
+    round(base * 10**exp, 6) for exp in range(-4, 2) for base in (1, 2.5, 5)
+) + (60.0,)
+# upper bounds of the response size buckets in bytes, 1KiB to 64MiB
+SIZE_BOUNDS = tuple(float(2**exp) for exp in range(10, 27, 2))
+
+# phases timed for every request, in the order they happen
+PHASES = ("limiter", "auth", "connect", "ttfb", "download", "decode", "validate")
+
+
+class Histogram:
+    """
+    Fixed bucket histogram of observed values.
+
+    Percentiles are estimated as the upper bound of the bucket holding them,
+    or the maximum observed value for the last bucket.
+    """
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """
+        Parameters:
+            - bounds: tuple[float] - Sorted upper bounds of the buckets.
+        """
+        self.bounds: tuple[float, ...] = bounds
+        self.counts: list[int] = [0] * (len(bounds) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+        self.min: float = float("inf")
+        self.max: float = 0.0
+
+    def observe(self, value: float) -> None:
+        """Adds a value to the histogram."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """
+        Returns the estimated value below which q percent of the observations fall.
+        """
+        if not self.count:
+            return 0.0
+        rank, seen = q / 100 * self.count, 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if index == len(self.bounds):
+                    return self.max
+                return min(self.bounds[index], self.max)
+        return self.max
+
+    def snapshot(self) -> dict[str, float]:
+        """Returns the count, sum, mean, min, max and p50/p90/p99 estimates."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+
+class RequestRecord(NamedTuple):
+    """
+    Measurements of one client method call, passed to Metrics exporters.
+
+    - endpoint: str - Client method name.
+    - status: int | None - Http status of the last attempt, None if served from a cache.
+    - size: int - Response body bytes, 0 if served from a cache.
+    - cache: str - 'hit', 'miss' or 'shared' (joined an identical request
+      already in flight).
+    - attempts: int - Number of http attempts, 0 if served from a cache.
+    - timings: dict[str, float] - Seconds spent in each of PHASES plus 'total'.
+    - error: str | None - Name of the exception the call raised (e.g.
+      'ConnectTimeout', 'CircuitOpenError'), None if it returned.
+    """
+
+    endpoint: str
+    status: int | None
+    size: int
+    cache: str
+    attempts: int
+    timings: dict[str, float]
+    error: str | None = None
+
+
+class RequestTimer:
+    """
+    Collects the timings of one client method call, created by Metrics.timer.
+    """
+
+    __slots__ = ("metrics", "endpoint", "started", "timings", "attempts", "_trace")
+
+    def __init__(self, metrics: "Metrics", endpoint: str) -> None:
+        self.metrics = metrics
+        self.endpoint: str = endpoint
+        self.started: float = perf_counter()
+        self.timings: dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.attempts: int = 0
+        self._trace: dict[str, float] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Adds seconds to a phase."""
+        self.timings[phase] += seconds
+
+    def trace(self, event: str, info: dict) -> None:
+        """
+        httpcore trace extension callback, times new connections (tcp and tls).
+        """
+        if not event.startswith("connection."):
+            return
+        name, _, state = event.rpartition(".")
+        if state == "started":
+            self._trace[name] = perf_counter()
+        elif (started := self._trace.pop(name, None)) is not None:
+            self.timings["connect"] += perf_counter() - started
+
+    async def atrace(self, event: str, info: dict) -> None:
+        """Async version of trace for AsyncOsuApi."""
+        self.trace(event, info)
+
+    def extensions(self, is_async: bool = False) -> dict:
+        """Returns the httpx request extensions that report to this timer."""
+        return {"trace": self.atrace if is_async else self.trace}
+
+    def finish(
+        self, response=None, cache: str = "miss", error: BaseException = None
+    ) -> None:
+        """
+        Records the call with the response of its last attempt, or the
+        exception it raised.
+        """
+        self.timings["total"] = perf_counter() - self.started
+        # the wait for the response headers includes the connection setup
+        self.timings["ttfb"] = max(0.0, self.timings["ttfb"] - self.timings["connect"])
+        self.metrics.record(
+            RequestRecord(
+                endpoint=self.endpoint,
+                status=None if response is None else response.status_code,
+                size=0 if response is None else len(response.content),
+                cache=cache,
+                attempts=self.attempts,
+                timings=self.timings,
+                error=None if error is None else type(error).__name__,
+            )
+        )
+
+
+class _NoTimer:
+    """Timer used when a client has no Metrics, every method does nothing."""
+
+    __slots__ = ("attempts",)
+
+    def __init__(self) -> None:
+        self.attempts = 0
+
+    def add(self, phase: str, seconds: float) -> None:
+        pass
+
+    def extensions(self, is_async: bool = False) -> dict:
+        return {}
+
+    def finish(
+        self, response=None, cache: str = "miss", error: BaseException = None
+    ) -> None:
+        pass
+
+
+NO_TIMER = _NoTimer()
+
+
+class Metrics:
+    """
+    In-process histograms of request timings, response sizes, status codes
+    and cache results, tagged by endpoint.
+
+    One instance can be shared by several clients. Exporters are called with
+    a RequestRecord after every client method call, e.g. to forward the
+    measurements to Prometheus or StatsD.
+    """
+
+    def __init__(
+        self,
+        exporters: list[Callable[[RequestRecord], Any]] = None,
+        time_bounds: tuple[float, ...] = TIME_BOUNDS,
+        size_bounds: tuple[float, ...] = SIZE_BOUNDS,
+    ) -> None:
+        """
+        Parameters:
+            - exporters: list[callable] | None - Called with every RequestRecord.
+            - time_bounds: tuple[float] - Upper bounds in seconds of the timing buckets.
+            - size_bounds: tuple[float] - Upper bounds in bytes of the size buckets.
+        """
+        self.exporters: list[Callable[[RequestRecord], Any]] = list(exporters or [])
+        self.time_bounds: tuple[float, ...] = time_bounds
+        self.size_bounds: tuple[float, ...] = size_bounds
+        self._histograms: dict[tuple[str, str], Histogram] = {}
+        self._counters: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def timer(self, endpoint: str) -> RequestTimer:
+        """Returns a timer for one call of an endpoint."""
+        return RequestTimer(self, endpoint)
+
+    def add_exporter(self, exporter: Callable[[RequestRecord], Any]) -> None:
+        """Adds a callback that receives every RequestRecord."""
+        self.exporters.append(exporter)
+
+    def _observe(self, endpoint: str, name: str, value: float, bounds) -> None:
+        if (histogram := self._histograms.get((endpoint, name))) is None:
+            histogram = self._histograms[(endpoint, name)] = Histogram(bounds)
+        histogram.observe(value)
+
+    def _count(self, endpoint: str, name: str) -> None:
+        self._counters[(endpoint, name)] = self._counters.get((endpoint, name), 0) + 1
+
+    def record(self, record: RequestRecord) -> None:
+        """
+        Adds the measurements of a call to the histograms and passes it to the
+        exporters. Exporter errors are turned into warnings.
+        """
+        with self._lock:
+            self._count(record.endpoint, "calls")
+            self._count(record.endpoint, f"cache_{record.cache}")
+            if record.error is not None:
+                self._count(record.endpoint, "errors")
+                self._count(record.endpoint, f"error_{record.error}")
+            if record.status is not None:
+                self._count(record.endpoint, f"status_{record.status}")
+                self._observe(record.endpoint, "size", record.size, self.size_bounds)
+            for phase, seconds in record.timings.items():
+                if (
+                    record.status is not None
+                    or phase in ("auth", "total")
+                    # failed calls only report the phases they reached
+                    or (record.error is not None and seconds > 0)
+                ):
+                    self._observe(record.endpoint, phase, seconds, self.time_bounds)
+        for exporter in self.exporters:
+            try:
+                exporter(record)
+            except Exception as e:
+                warnings.warn(f"metrics exporter {exporter!r} failed: {e!r}")
+
+    def histogram(self, endpoint: str, name: str) -> Histogram | None:
+        """
+        Returns the histogram of a phase ('total', one of PHASES) or of the
+        response 'size' of an endpoint.
+        """
+        return self._histograms.get((endpoint, name))
+
+    def counter(self, endpoint: str, name: str) -> int:
+        """
+        Returns a counter of an endpoint: 'calls', 'cache_hit', 'cache_miss',
+        'cache_shared', 'status_<code>', 'errors' or 'error_<exception name>'.
+        """
+        return self._counters.get((endpoint, name), 0)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Returns every counter and histogram snapshot, by endpoint then name.
+        """
+        with self._lock:
+            result: dict[str, dict[str, Any]] = {}
+            for (endpoint, name), value in self._counters.items():
+                result.setdefault(endpoint, {})[name] = value
+            for (endpoint, name), histogram in self._histograms.items():
+                result.setdefault(endpoint, {})[name] = histogram.snapshot()
+            return result
+
+    def reset(self) -> None:
+        """Removes every measurement."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
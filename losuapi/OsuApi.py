@@ -1,425 +1,237 @@
-from typing import Type, TypeVar
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Iterator, Type, TypeVar
 import functools
+import inspect
+import itertools
+import time
 import httpx
-from pydantic import parse_obj_as
-from .BaseOsuApi import BaseOsuApi
-from .types import (
-    Beatmap,
-    Beatmaps,
-    Rankings,
-    User,
-    Scores,
-    Score,
-    ScoreTypes,
-    GameMode,
-    GameModeInt,
-    RankingType,
-    ScoreTypes,
-    BeatmapUserScore,
-    BeatmapScores,
-    Attributes,
-    KudosuHistory,
-    BeatmapType,
-    BeatmapPlaycount,
-    Beatmapset,
-    Users,
-    Event,
-    Spotlights,
-)
+from .BaseOsuApi import BaseOsuApi, BatchResult
+from .Metrics import NO_TIMER
+from .endpoints import ENDPOINTS, Endpoint
+from .utility import chunked, request_key
 
 T = TypeVar("T")
 
 
 class OsuApi(BaseOsuApi):
-    def __init__(self, client_id: int, client_secret: str):
-        self.Client = httpx.Client(timeout=None)
-        super().__init__(client_id=client_id, client_secret=client_secret)
-
-    def request(Type: Type[T]):
-        """non-async http request"""
-
-        def decorator(func):
-            @functools.wraps(func)
-            def wrapper(self, *args, **kwargs):
-                data = func(self, *args, **kwargs)
-                response = self.Client.request(
-                    method=data["method"],
-                    url=data["url"],
-                    params=data["params"],
-                    headers=data["headers"],
-                )
-                if "error" in (res := response.json()) or "authentication" in res:
-                    return None
-                return parse_obj_as(type_=Type, obj=response.json())
-
-            return wrapper
-
-        return decorator
-
-    ##########
-    #
-    # Beatmap methods
-    #
-    #########
-    @request(Type=Beatmap)
-    def lookup_beatmap(
-        self, beatmap_id: int, checksum: str = None, filename: str = None
-    ) -> Beatmap:
-        """
-        Returns beatmap information.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#lookup-beatmap
-
-        Parameters:
-            - beatmap_id: int - ID of an Osu! beatmap.
-            - checksum: str | None - Osu! beatmap checksum value.
-            - filename: str | None - Filename to lookup.
-
-        Returns: losuapi.types.Beatmap
-
-        Returns None if http request errors out.
-        """
-        return super().lookup_beatmap(
-            beatmap_id=beatmap_id, checksum=checksum, filename=filename
-        )
-
-    @request(Type=BeatmapUserScore)
-    def user_beatmap_score(
-        self,
-        beatmap_id: int,
-        user_id: int,
-        mode: GameMode | str = None,
-        mods: str = None,
-    ) -> BeatmapUserScore:
-        """
-        Return a User's score on a Beatmap.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-a-user-beatmap-score
-
-        Parameters:
-            - beatmap_id: int - ID of an Osu! beatmap.
-            - user_id: int - ID of an Osu! user.
-            - mode: GameMode | str | None - Osu! gamemode.
-                - (osu, taiko, mania, fruits)
-            - mods: str | None - String of mods (undocumented).
-
-        Returns: losuapi.types.BeatmapUserScore
-
-        Returns None if http request errors out.
-        """
-        return super().user_beatmap_score(
-            beatmap_id=beatmap_id, user_id=user_id, mode=mode, mods=mods
-        )
-
-    @request(Type=Scores)
-    def user_beatmap_scores(
-        self, beatmap_id: int, user_id: int, mode: GameMode | str = None
-    ) -> Scores:
+    def __init__(self, client_id: int, client_secret: str, **kwargs):
         """
-        Return a User's scores on a Beatmap.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-a-user-beatmap-scores
-
         Parameters:
-            - beatmap_id: int - ID of an Osu! beatmap.
-            - user_id: int - ID of an Osu! user.
-            - mode: GameMode | str | None - Osu! gamemode.
-                - (osu, taiko, mania, fruits)
-
-        - Returns: losuapi.types.Scores
-
-        Returns None if http request errors out.
+            - client_id: int - Osu! OAuth client ID.
+            - client_secret: str - Osu! OAuth client secret.
+            - **kwargs - Client options, see BaseOsuApi.__init__.
         """
-        return super().user_beatmap_scores(
-            beatmap_id=beatmap_id, user_id=user_id, mode=mode
-        )
+        super().__init__(client_id=client_id, client_secret=client_secret, **kwargs)
+        self.Client = httpx.Client(**self._client_options())
 
-    @request(Type=BeatmapScores)
-    def beatmap_scores(
-        self,
-        beatmap_id: int,
-        mode: GameMode | str = None,
-        mods: str = None,
-        Type: str = None,
-    ) -> BeatmapScores:
-        """
-        Returns the top scores for a beatmap.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-beatmap-scores
-
-        Parameters:
-            - beatmap_id: int - ID of an Osu! beatmap.
-            - mode: GameMode | str | None - Osu! gamemode.
-                - (osu, taiko, mania, fruits)
-            - mods: str | None - String of mods (undocumented).
-            - Type: str | None - Beatmap score ranking type (undocumented).
+    def close(self) -> None:
+        """Closes the pooled connections of the client."""
+        self.Client.close()
 
-        Returns: losuapi.types.BeatmapScores
-
-        Returns None if http request errors out.
-        """
-        return super().beatmap_scores(
-            beatmap_id=beatmap_id, mode=mode, mods=mods, Type=Type
-        )
-
-    @request(Type=Beatmaps)
-    def beatmaps(self, beatmap_ids: list[int]) -> Beatmaps:
+    def map(
+        self, method: str, calls: Iterable[dict], max_workers: int = 8
+    ) -> Iterator[BatchResult]:
         """
-        Returns a list of beatmaps.
+        Runs many calls of a client method on a thread pool and yields their
+        results in order.
 
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-beatmaps
+        The threads share the connection pool, auth token, rate limiter and
+        caches of this instance.
 
         Parameters:
-            - beatmap_ids: list[int] - Array of beatmap IDs.
-
-        Returns: losuapi.types.Beatmaps
-
-        Returns None if http request errors out.
-        """
-        return super().beatmaps(beatmap_ids=beatmap_ids)
-
-    @request(Type=Beatmap)
-    def beatmap(self, beatmap_id: int) -> Beatmap:
-        """
-        Gets beatmap data for the specified beatmap ID.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-beatmap
-
-        Parameters:
-            - beatmap_id: int - ID of an Osu! beatmap.
-
-        - Returns: losuapi.types.Beatmap
-
-        Returns None if http request errors out.
-        """
-        return super().beatmap(beatmap_id=beatmap_id)
-
-    @request(Type=Attributes)
-    def beatmap_attributes(
-        self,
-        beatmap_id: int,
-        mods: list[str] = None,
-        ruleset: GameMode | str = None,
-        ruleset_id: GameModeInt | int = None,
-    ) -> Attributes:
-        """
-        Returns difficulty attributes of beatmap with specific mode and mods combination.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-beatmap-attributes
+            - method: str - Name of the method to call, e.g. 'user'.
+            - calls: Iterable[dict] - Keyword arguments of each call, e.g. {"username": 2}.
+                - calls are read lazily, at most 2 * max_workers are queued at once.
+            - max_workers: int - Number of threads sending requests.
+
+        Yields: losuapi.BatchResult, in the order of calls.
+
+        An exception raised by a call is reported in its BatchResult.error
+        instead of being raised.
+        """
+        if max_workers < 1:
+            raise ValueError("param<max_workers> must be at least 1")
+        function = getattr(self, method)
+
+        def run(index: int, kwargs: dict) -> BatchResult:
+            try:
+                return BatchResult(index, (method, kwargs), function(**kwargs), None)
+            except Exception as e:
+                return BatchResult(index, (method, kwargs), None, e)
+
+        pending = enumerate(calls)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = deque(
+                executor.submit(run, index, kwargs)
+                for index, kwargs in itertools.islice(pending, 2 * max_workers)
+            )
+            while futures:
+                result = futures.popleft().result()
+                for index, kwargs in itertools.islice(pending, 1):
+                    futures.append(executor.submit(run, index, kwargs))
+                yield result
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def paginate(
+        self, endpoint: str, max_items: int = None, page_size: int = None, **kwargs
+    ) -> Iterator[Any]:
+        """
+        Yields the items of every page of a paginated endpoint.
+
+        The next page is requested on a background thread while the items of
+        the current one are consumed.
 
         Parameters:
-            - beatmap_id: int - ID of an Osu! beatmap.
-            - mods: list[str] | None - Array of mod strings.
-            - ruleset: GameMode | str | None - Osu! gamemode.
-                - (osu, taiko, mania, fruits)
-            - ruleset_id: GameModeInt | int | None - Osu! gamemode int.
-                - (osu=0,taiko=1,mania=2,fruits=3)
-
-        Returns: losuapi.types.Attributes
-
-        Returns None if http request errors out.
-        """
-        return super().beatmap_attributes(
-            beatmap_id=beatmap_id, mods=mods, ruleset=ruleset, ruleset_id=ruleset_id
-        )
-
-    ##########
-    #
-    # User methods
-    #
-    #########
-    @request(Type=list[KudosuHistory])
-    def user_kudosu(
-        self, user_id: int, limit: int = None, offset: str = None
-    ) -> list[KudosuHistory]:
-        """
-        Returns kudosu history.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-user-kudosu
-
-        Parameters:
-            user_id: int - ID of an Osu! user.
-            limit: int | None - Maximum numbers of results.
-            offset: str | None - Result offset for pagination.
-
-        Returns: list[losuapi.types.KudosuHistory]
-
-        Returns None if http request errors out.
-        """
-        return super().user_kudosu(user_id, limit, offset)
-
-    @request(Type=list[Score])
-    def user_scores(
-        self,
-        user_id: int,
-        Type: ScoreTypes | str,
-        include_fails: bool = False,
-        mode: GameMode | str = None,
-        limit: int = None,
-        offset: int = None,
-    ) -> list[Score]:
-        """
-        Returns an array of scores of a specified user.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-user-scores
-
-        Parameters:
-            - user_id: int - ID of an Osu! user.
-            - Type: ScoreTypes | str - Score type.
-                - ('best', 'first', 'recent')
-            - include_fails: bool | None - Only for recent score type, include scores of failed plays, defaults to False.
-            - mode: GameMode | str | None - Game mode of scores to be returned.
-            - limit: int | None - Maximum numbers of results.
-            - offset: int | None - Result offset for pagination.
-
-        Returns: list[losuapi.types.Score]
-
-        Returns None if http request errors out.
-        """
-        return super().user_scores(user_id, Type, include_fails, mode, limit, offset)
-
-    @request(Type=list[BeatmapPlaycount])
-    def user_beatmaps(
-        self,
-        user_id: int,
-        Type: BeatmapType | str,
-        limit: int = None,
-        offset: int = None,
-    ) -> list[BeatmapPlaycount] | list[Beatmapset]:
-        """
-        Returns the beatmaps of a specified user.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-user-beatmaps
-
-        Parameters:
-            - user_id: int - ID of an Osu! user.
-            - Type: BeatmapType | str - Osu! beatmap status.
-                - (favourite, graveyard, loved, most_played, pending, ranked)
-            - limit: int | None - Maximum numbers of results.
-            - offset: int | None - Result offset for pagination.
-
-        Returns: list[losuapi.types.BeatmapPlaycount] | list[losuapi.types.BeatmapPlaycount]
-
-        Returns None if http request errors out.
-        """
-        return super().user_beatmaps(
-            user_id=user_id, Type=Type, limit=limit, offset=offset
-        )
-
-    @request(Type=list[Event])
-    def user_recent_activity(
-        self, user_id: int, limit: int = None, offset: str = None
-    ) -> list[Event]:
-        """
-        Returns recent activity.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-user-recent-activity
-
-        Parameters:
-            - user_id: int - ID of an Osu! user.
-            - limit: int | None - Maximum numbers of results.
-            - offset: int | None - Result offset for pagination.
-
-        Returns: list[losuapi.types.Event]
-
-        Returns None if http request errors out.
-        """
-        return super().user_recent_activity(user_id=user_id, limit=limit, offset=offset)
-
-    @request(Type=User)
-    def user(
-        self, username: int | str, mode: GameMode | str = "", key: str = ""
-    ) -> User:
-        """
-        Returns the detail of a specified user.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-user
-
-        Parameters:
-            - username: int | str - ID or username of an Osu! user.
-            - mode: GameMode | str | None - Osu! gamemode.
-                - (osu, taiko, mania, fruits)
-            - key: str | None - type of username given.
-                - ('id', 'username')
-
-        Returns: losuapi.types.User
-
-        Returns None if http request errors out.
-        """
-        return super().user(username=username, mode=mode, key=key)
+            - endpoint: str - Name of the method to page through.
+                - ('user_scores', 'user_beatmaps', 'user_kudosu', 'user_recent_activity', 'ranking')
+            - max_items: int | None - Stop after this many items.
+            - page_size: int | None - Items per request for offset endpoints, defaults to PAGE_SIZE.
+            - **kwargs - Arguments of the endpoint method, offset/cursor set the first page.
+
+        Yields: the items the endpoint returns, Rankings pages yield their ranking entries
+        (or beatmapsets for 'charts').
+
+        Stops early if an http request errors out.
+        """
+        position, kwargs = self._page_start(endpoint, kwargs)
+        method = getattr(self, endpoint)
+        page_size = page_size or self.PAGE_SIZE
+        remaining = max_items
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page = self._page_kwargs(endpoint, kwargs, position, page_size, remaining)
+            future = executor.submit(method, **page)
+            while future is not None:
+                items, position = self._page_items(
+                    endpoint, page, position, future.result()
+                )
+                future = None
+                if remaining is not None:
+                    items = items[:remaining]
+                    remaining -= len(items)
+                if position is not None and remaining != 0:
+                    page = self._page_kwargs(
+                        endpoint, kwargs, position, page_size, remaining
+                    )
+                    future = executor.submit(method, **page)
+                yield from items
+
+    def _send(self, endpoint: str, data: dict, timer=NO_TIMER) -> httpx.Response:
+        """
+        Sends a request built by BaseOsuApi, again after a failure if the
+        retry policy allows it.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            timer.attempts = attempt
+            self._check_circuit()
+            if self.rate_limiter:
+                started = time.perf_counter()
+                self.rate_limiter.acquire()
+                timer.add("limiter", time.perf_counter() - started)
+            request = self.Client.build_request(
+                method=data["method"],
+                url=data["url"],
+                params=data["params"],
+                headers=data["headers"],
+                timeout=self._timeout(endpoint),
+                extensions=timer.extensions(),
+            )
+            try:
+                response = self._receive(request, timer)
+            except httpx.TransportError:
+                if (delay := self._retry_delay(data, attempt)) is None:
+                    raise
+            else:
+                if self.rate_limiter:
+                    self.rate_limiter.update(response.status_code, response.headers)
+                if (delay := self._retry_delay(data, attempt, response)) is None:
+                    return response
+            time.sleep(delay)
+
+    def _receive(self, request: httpx.Request, timer=NO_TIMER) -> httpx.Response:
+        """
+        Sends a request and reads its body, timing the wait for the response
+        headers and the download separately.
+        """
+        started = time.perf_counter()
+        response = self.Client.send(request, stream=True)
+        received = time.perf_counter()
+        try:
+            response.read()
+        finally:
+            response.close()
+        timer.add("ttfb", received - started)
+        timer.add("download", time.perf_counter() - received)
+        return response
 
-    @request(Type=Users)
-    def users(self, user_ids: list[int]) -> Users:
-        """
-        Returns list of user information.
+    def request(Type: Type[T]):
+        """non-async http request"""
 
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-users
+        def decorator(func):
+            endpoint = func.__name__.lstrip("_")
 
-        Parameters:
-            - user_ids: list[int] - List of Osu! user IDs.
+            @functools.wraps(func)
+            def wrapper(self, *args, **kwargs):
+                timer = self._timer(endpoint)
+                response = None
+                try:
+                    response_type = self._response_type(
+                        Type, kwargs.pop("fields", None)
+                    )
+                    started = time.perf_counter()
+                    data = func(self, *args, **kwargs)
+                    timer.add("auth", time.perf_counter() - started)
+                    key = request_key(data)
+                    cached = self._cached(endpoint, key, response_type)
+                    if cached is not None:
+                        timer.finish(cache="hit")
+                        return cached
+                    response = self._send(endpoint, data, timer)
+                    result = self._parse_response(
+                        endpoint,
+                        key,
+                        response_type,
+                        response.content,
+                        response.status_code,
+                        timer,
+                    )
+                except Exception as e:
+                    # timeouts, transport errors and open circuits are recorded too
+                    timer.finish(response, error=e)
+                    raise
+                timer.finish(response)
+                return result
 
-        Returns: losuapi.types.Users
+            return wrapper
 
-        Returns None if http request errors out.
-        """
-        return super().users(user_ids=user_ids)
+        return decorator
 
-    ##########
-    #
-    # Ranking methods
-    #
-    #########
-    @request(Type=Rankings)
-    def ranking(
-        self,
-        mode: GameMode | str,
-        Type: RankingType | str,
-        Filter: str = "all",
-        country: int = None,
-        cursor: int = None,
-        spotlight_id: int = None,
-        variant: str = None,
-    ) -> Rankings:
+    @classmethod
+    def _chunked_method(
+        cls, endpoint: Endpoint, method, chunked_signature: inspect.Signature
+    ):
         """
-        Gets the current ranking for the specified type and game mode.
-
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-ranking
-
-        Parameters:
-            - mode: GameMode | str | None - Osu! gamemode.
-                - (osu, taiko, mania, fruits)
-            - Type: RankingType | str - Ranking type.
-                - ('charts', 'country', 'performance', 'score')
-            - Filter: str | None - 'all' or 'friends', defaults to 'all'.
-            - country: int | None - Country code, only available for Type 'performance'.
-            - cursor: int | None - https://osu.ppy.sh/docs/index.html#cursor
-            - spotlight_id: int | None - ID of the spotlight if Type is 'charts'. Ranking for latest spotlight if not specified.
-            - variant: str | None - Filter ranking by specified mode variant, only for mode of 'mania', Type must be 'performance'.
-
-        Returns: losuapi.types.Rankings
-
-        Returns None if http request errors out.
+        Returns the public method of an id list endpoint, requesting the
+        chunks one after another.
         """
-        return super().ranking(
-            mode=mode,
-            Type=Type,
-            Filter=Filter,
-            country=country,
-            cursor=cursor,
-            spotlight_id=spotlight_id,
-            variant=variant,
-        )
 
-    @request(Type=Spotlights)
-    def spotlights(self) -> Spotlights:
-        """
-        Gets the list of spotlights.
+        def chunked_method(self, *args, **kwargs):
+            ids, fields, _ = self._chunk_arguments(
+                endpoint, chunked_signature, args, kwargs
+            )
+            results = [
+                method(self, chunk, fields=fields)
+                for chunk in chunked(ids, self.MAX_IDS)
+            ]
+            return self._chunked_result(endpoint, ids, results)
 
-        Api documentation: https://osu.ppy.sh/docs/index.html#get-spotlights
+        return chunked_method
 
-        Parameters: None
-        Returns: losuapi.types.Spotlights
 
-        Returns None if http request errors out.
-        """
-        return super().spotlights()
+for endpoint in ENDPOINTS:
+    OsuApi._add_endpoint(endpoint)
@@ -0,0 +1,47 @@
+import functools
+from .BaseOsuApiPool import BaseOsuApiPool
+from .OsuApi import OsuApi
+from .endpoints import ENDPOINTS
+
+
+class OsuApiPool(BaseOsuApiPool):
+    """
+    OsuApi that spreads its requests over several OAuth clients.
+
+    Has the endpoint methods of OsuApi and is safe to share between threads.
+    """
+
+    client_class = OsuApi
+
+    def _call(self, name: str, args: tuple, kwargs: dict):
+        tried = set()
+        while True:
+            index = self._acquire(tried)
+            try:
+                result = getattr(self.clients[index], name)(*args, **kwargs)
+            finally:
+                self._release(index)
+            if not self._fail_over(index, result, tried):
+                return result
+
+    map = OsuApi.map
+
+    def close(self) -> None:
+        """Closes the pooled connections of every client."""
+        for client in self.clients:
+            client.close()
+
+    @classmethod
+    def _add_endpoint(cls, name: str) -> None:
+        """Adds a method dispatching an OsuApi endpoint method to a credential."""
+
+        @functools.wraps(getattr(OsuApi, name))
+        def method(self, *args, **kwargs):
+            return self._call(name, args, kwargs)
+
+        method.__qualname__ = f"{cls.__name__}.{name}"
+        setattr(cls, name, method)
+
+
+for endpoint in ENDPOINTS:
+    OsuApiPool._add_endpoint(endpoint.name)
@@ -0,0 +1,130 @@
+import asyncio
+import contextlib
+import threading
+import time
+from typing import Iterator, Mapping
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter for the Osu! api.
+
+    One instance can be passed to any number of OsuApi and AsyncOsuApi
+    objects in the same process, they then share a single request budget.
+
+    Api documentation: https://osu.ppy.sh/docs/index.html#terms-of-use
+    """
+
+    # time source of the bucket, the updated timestamp is in its units
+    _clock = staticmethod(time.monotonic)
+
+    def __init__(self, rate: float = 1.0, burst: int = 60) -> None:
+        """
+        Parameters:
+            - rate: float - Requests per second the bucket refills at.
+            - burst: int - Maximum number of requests that can be sent at once.
+        """
+        if rate <= 0:
+            raise ValueError("param<rate> must be greater than 0")
+        if burst < 1:
+            raise ValueError("param<burst> must be at least 1")
+        self.rate: float = rate
+        self.burst: int = burst
+        self.tokens: float = float(burst)
+        self.updated: float = self._clock()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _state(self) -> Iterator[None]:
+        """Holds the lock of the bucket state (rate, tokens, updated)."""
+        with self._lock:
+            yield
+
+    def reserve(self) -> float:
+        """
+        Takes one token from the bucket.
+
+        Returns the number of seconds the caller has to wait before sending
+        its request, 0 if it can be sent straight away.
+        """
+        with self._state():
+            now = self._clock()
+            if now > self.updated:
+                self.tokens = min(
+                    self.burst, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+            self.tokens -= 1
+            return max(0.0, self.updated - now) + max(0.0, -self.tokens) / self.rate
+
+    def wait_time(self) -> float:
+        """
+        Returns the number of seconds a request sent now would have to wait,
+        without taking a token.
+        """
+        with self._state():
+            now = self._clock()
+            tokens = self.tokens
+            if now > self.updated:
+                tokens = min(self.burst, tokens + (now - self.updated) * self.rate)
+            return max(0.0, self.updated - now) + max(0.0, 1 - tokens) / self.rate
+
+    @property
+    def throttled(self) -> bool:
+        """True if the bucket is empty or paused by a 429 or Retry-After."""
+        return self.wait_time() > 0
+
+    def acquire(self) -> None:
+        """Blocks until a request may be sent."""
+        if wait := self.reserve():
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Waits without blocking the event loop until a request may be sent."""
+        if wait := self.reserve():
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Empties the bucket and stops it from refilling for the given number
+        of seconds.
+        """
+        with self._state():
+            self.tokens = min(self.tokens, 0.0)
+            self.updated = max(self.updated, self._clock() + seconds)
+
+    def update(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """
+        Adjusts the bucket from the headers of an api response.
+
+        - Retry-After pauses the bucket for the given number of seconds.
+        - X-RateLimit-Limit (requests per minute) lowers the refill rate if it
+          is set higher than the api allows.
+        - X-RateLimit-Remaining caps the tokens left in the bucket.
+        """
+        if (limit := headers.get("X-RateLimit-Limit")) is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                limit = 0
+            if limit > 0:
+                with self._state():
+                    self.rate = min(self.rate, limit / 60)
+
+        if (remaining := headers.get("X-RateLimit-Remaining")) is not None:
+            try:
+                remaining = int(remaining)
+            except ValueError:
+                remaining = None
+            if remaining is not None:
+                with self._state():
+                    self.tokens = min(self.tokens, remaining)
+
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                self.pause(float(retry_after))
+            except ValueError:
+                self.pause(1 / self.rate)
+        elif status_code == 429:
+            self.pause(1 / self.rate)
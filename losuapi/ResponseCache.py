@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+# seconds a response stays cached, by client method name
+DEFAULT_TTLS = {
+    "lookup_beatmap": 3600,
+    "beatmap": 3600,
+    "beatmaps": 3600,
+    "beatmap_attributes": 3600,
+    "beatmap_scores": 60,
+    "user_beatmap_score": 60,
+    "user_beatmap_scores": 60,
+    "user": 300,
+    "users": 300,
+    "user_kudosu": 300,
+    "user_beatmaps": 300,
+    "user_scores": 30,
+    "user_recent_activity": 10,
+    "ranking": 300,
+    "spotlights": 3600,
+}
+
+
+class ResponseCache:
+    """
+    In-memory cache of parsed api responses with per-endpoint expiry and
+    least recently used eviction.
+
+    Entries are keyed on the endpoint name and the method, url and params of
+    the request built by BaseOsuApi. Cached objects are shared between
+    callers and should be treated as read-only.
+    """
+
+    def __init__(
+        self, maxsize: int = 1024, ttl: float = 60, ttls: dict[str, float] = None
+    ) -> None:
+        """
+        Parameters:
+            - maxsize: int - Maximum number of cached responses.
+            - ttl: float - Seconds to keep responses of endpoints without their own ttl.
+            - ttls: dict[str, float] | None - Per endpoint ttl overrides, by client method name.
+                - a ttl of 0 disables caching for that endpoint.
+        """
+        if maxsize < 1:
+            raise ValueError("param<maxsize> must be at least 1")
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self.ttls: dict[str, float] = {**DEFAULT_TTLS, **(ttls or {})}
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Returns the ttl in seconds used for the given endpoint."""
+        return self.ttls.get(endpoint, self.ttl)
+
+    def get(self, endpoint: str, key: Hashable) -> Any | None:
+        """
+        Returns the cached response for a request, None on a miss.
+        """
+        if self.ttl_for(endpoint) <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get((endpoint, key))
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[(endpoint, key)]
+                self.misses += 1
+                return None
+            self._entries.move_to_end((endpoint, key))
+            self.hits += 1
+            return entry[1]
+
+    def set(self, endpoint: str, key: Hashable, value: Any) -> None:
+        """
+        Caches a response, evicting the least recently used entries when full.
+        """
+        if value is None or (ttl := self.ttl_for(endpoint)) <= 0:
+            return
+        with self._lock:
+            self._entries[(endpoint, key)] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end((endpoint, key))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes every cached response and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """Returns the hit and miss counters and the current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
@@ -0,0 +1,72 @@
+import random
+from typing import Mapping
+
+
+class Retry:
+    """
+    Retry policy for failed api requests.
+
+    Only idempotent requests are retried, after a transport error (timeout,
+    refused or dropped connection) or a retryable status code. The wait
+    before each retry is drawn uniformly between 0 and a capped exponential
+    backoff ("full jitter"), so clients that failed together do not retry
+    together. A Retry-After header is honoured instead when present.
+    """
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        statuses: tuple[int, ...] = (429, 500, 502, 503, 504),
+        methods: tuple[str, ...] = ("GET",),
+    ) -> None:
+        """
+        Parameters:
+            - attempts: int - Maximum number of attempts, including the first one.
+            - backoff: float - Seconds of the first backoff, doubled on every retry.
+            - max_backoff: float - Cap of the backoff and of Retry-After waits.
+            - statuses: tuple[int] - Response status codes that are retried.
+            - methods: tuple[str] - Http methods that are safe to send again.
+        """
+        if attempts < 1:
+            raise ValueError("param<attempts> must be at least 1")
+        if backoff < 0 or max_backoff < 0:
+            raise ValueError(
+                "param<backoff> and param<max_backoff> must not be negative"
+            )
+        self.attempts: int = attempts
+        self.backoff: float = backoff
+        self.max_backoff: float = max_backoff
+        self.statuses: frozenset[int] = frozenset(statuses)
+        self.methods: frozenset[str] = frozenset(method.upper() for method in methods)
+
+    def retries(self, method: str, attempt: int, status_code: int | None) -> bool:
+        """
+        True if a request should be sent again.
+
+        Parameters:
+            - method: str - Http method of the request.
+            - attempt: int - Number of attempts made so far.
+            - status_code: int | None - Response status, None after a transport error.
+        """
+        if attempt >= self.attempts or method not in self.methods:
+            return False
+        return status_code is None or status_code in self.statuses
+
+    def delay(self, attempt: int, headers: Mapping[str, str] | None = None) -> float:
+        """
+        Returns the seconds to wait before the next attempt.
+
+        Parameters:
+            - attempt: int - Number of attempts made so far.
+            - headers: Mapping[str, str] | None - Headers of the failed response.
+        """
+        if headers is not None and (retry_after := headers.get("Retry-After")):
+            try:
+                return min(self.max_backoff, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        )
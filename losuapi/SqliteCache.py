@@ -0,0 +1,150 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Hashable, NamedTuple
+
+RANKED_STATUSES = ("ranked", "approved")
+
+
+class CacheRule(NamedTuple):
+    """
+    When and for how long responses of an endpoint are stored.
+
+    - ttl: float | None - Seconds a stored response stays valid, None for forever.
+    - when: callable | None - Called with the decoded response, the response
+      is only stored if it returns True.
+    """
+
+    ttl: float | None = None
+    when: Callable[[Any], bool] | None = None
+
+
+def _is_ranked(beatmap: dict) -> bool:
+    return beatmap.get("status") in RANKED_STATUSES
+
+
+# rules by client method name, endpoints without a rule are never stored
+DEFAULT_RULES = {
+    "beatmap": CacheRule(when=_is_ranked),
+    "lookup_beatmap": CacheRule(when=_is_ranked),
+    "beatmaps": CacheRule(
+        when=lambda res: all(_is_ranked(beatmap) for beatmap in res["beatmaps"])
+    ),
+    # attribute responses do not include the ranked status of the beatmap, so
+    # they expire to pick up star rating changes on unranked beatmaps
+    "beatmap_attributes": CacheRule(ttl=30 * 24 * 3600),
+    "spotlights": CacheRule(ttl=24 * 3600),
+}
+
+
+class SqliteCache:
+    """
+    On-disk cache of raw api responses for endpoints that rarely change.
+
+    The database uses write-ahead logging so several processes can read and
+    write the same file at once, a freshly started process reuses whatever
+    the others have stored. AsyncOsuApi reads and writes it on worker threads
+    so waiting for another process's write lock does not block the event loop.
+    """
+
+    def __init__(
+        self, path: str, rules: dict[str, CacheRule] = None, timeout: float = 30
+    ) -> None:
+        """
+        Parameters:
+            - path: str - Path of the sqlite database file.
+            - rules: dict[str, CacheRule] | None - Per endpoint rule overrides, by client method name.
+                - a rule of None disables storing for that endpoint.
+            - timeout: float - Seconds to wait for another process holding a write lock.
+        """
+        self.path: str = path
+        self.timeout: float = timeout
+        self.rules: dict[str, CacheRule] = {
+            endpoint: rule
+            for endpoint, rule in {**DEFAULT_RULES, **(rules or {})}.items()
+            if rule is not None
+        }
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "endpoint TEXT NOT NULL, "
+                "key TEXT NOT NULL, "
+                "body BLOB NOT NULL, "
+                "expires REAL, "
+                "PRIMARY KEY (endpoint, key))"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns the sqlite connection of the current thread and process."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        return json.dumps(key, default=str)
+
+    def stores(self, endpoint: str) -> bool:
+        """True if responses of the endpoint can be stored."""
+        return endpoint in self.rules
+
+    def get(self, endpoint: str, key: Hashable) -> bytes | None:
+        """
+        Returns the stored response body for a request, None if there is no
+        valid one.
+        """
+        if endpoint not in self.rules:
+            return None
+        row = (
+            self._connection()
+            .execute(
+                "SELECT body FROM responses "
+                "WHERE endpoint = ? AND key = ? AND (expires IS NULL OR expires > ?)",
+                (endpoint, self._key(key), time.time()),
+            )
+            .fetchone()
+        )
+        return None if row is None else row[0]
+
+    def set(self, endpoint: str, key: Hashable, body: bytes, decoded: Any) -> None:
+        """
+        Stores a response body if the endpoint's rule allows it.
+        """
+        if (rule := self.rules.get(endpoint)) is None:
+            return
+        if rule.when is not None and not rule.when(decoded):
+            return
+        expires = None if rule.ttl is None else time.time() + rule.ttl
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (endpoint, key, body, expires) "
+                "VALUES (?, ?, ?, ?)",
+                (endpoint, self._key(key), body, expires),
+            )
+
+    def invalidate(self, endpoint: str = None) -> None:
+        """
+        Deletes every stored response of an endpoint, or all of them if no
+        endpoint is given.
+        """
+        with self._connection() as conn:
+            if endpoint is None:
+                conn.execute("DELETE FROM responses")
+            else:
+                conn.execute("DELETE FROM responses WHERE endpoint = ?", (endpoint,))
+
+    def purge(self) -> None:
+        """Deletes expired responses from the database."""
+        with self._connection() as conn:
+            conn.execute(
+                "DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?",
+                (time.time(),),
+            )
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+class TokenCache:
+    """
+    File of client credentials tokens shared by every process on a machine.
+
+    A new process reuses a token that is still valid instead of requesting
+    its own. Tokens are keyed on the client id and a hash of the client
+    secret, so a rotated secret never picks up an old token. The file is
+    rewritten atomically and only readable by its owner.
+    """
+
+    def __init__(self, path: str = None, margin: float = 60) -> None:
+        """
+        Parameters:
+            - path: str | None - Path of the json token file, defaults to
+              ~/.cache/losuapi/tokens.json.
+            - margin: float - Tokens expiring within this many seconds are not reused.
+        """
+        if path is None:
+            path = os.path.join(
+                os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                "losuapi",
+                "tokens.json",
+            )
+        self.path: str = path
+        self.margin: float = margin
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(client_id: int, client_secret: str) -> str:
+        digest = hashlib.sha256(str(client_secret).encode()).hexdigest()[:16]
+        return f"{client_id}:{digest}"
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "rb") as file:
+                tokens = json.loads(file.read())
+        except (OSError, ValueError):
+            return {}
+        return tokens if isinstance(tokens, dict) else {}
+
+    def get(self, client_id: int, client_secret: str) -> tuple[str, float] | None:
+        """
+        Returns the stored "Bearer {{ token }}" string and its expiry time
+        (seconds since the epoch), None if there is no token valid for at
+        least margin seconds.
+        """
+        entry = self._read().get(self._key(client_id, client_secret))
+        if not isinstance(entry, dict):
+            return None
+        authorization, expires = entry.get("authorization"), entry.get("expires")
+        if not isinstance(authorization, str) or not isinstance(expires, (int, float)):
+            return None
+        if expires - self.margin <= time.time():
+            return None
+        return authorization, expires
+
+    def set(
+        self, client_id: int, client_secret: str, authorization: str, expires: float
+    ) -> None:
+        """
+        Stores a token, dropping the expired tokens of other clients.
+        """
+        now = time.time()
+        with self._lock:
+            tokens = {
+                key: entry
+                for key, entry in self._read().items()
+                if isinstance(entry, dict) and entry.get("expires", 0) > now
+            }
+            tokens[self._key(client_id, client_secret)] = {
+                "authorization": authorization,
+                "expires": expires,
+            }
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tokens-")
+            try:
+                with os.fdopen(fd, "w") as file:
+                    json.dump(tokens, file)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    def clear(self) -> None:
+        """Deletes the token file."""
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
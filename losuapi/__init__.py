@@ -1,4 +1,16 @@
 from .OsuApi import OsuApi
-from .AsyncOsuApi import AsyncOsuApi
+from .AsyncOsuApi import AsyncOsuApi, BatchResult
+from .OsuApiPool import OsuApiPool
+from .AsyncOsuApiPool import AsyncOsuApiPool
+from .RateLimiter import RateLimiter
+from .FileRateLimiter import FileRateLimiter
+from .ResponseCache import ResponseCache
+from .SqliteCache import SqliteCache, CacheRule
+from .Retry import Retry
+from .CircuitBreaker import CircuitBreaker, CircuitOpenError
+from .TokenCache import TokenCache
+from .Metrics import Metrics, RequestRecord
+from .CassetteTransport import CassetteTransport, CassetteMissError
 import losuapi.utility
+import losuapi.columnar
 import types
@@ -0,0 +1,171 @@
+import functools
+import math
+from datetime import datetime
+from typing import Any
+from .types import Mods
+
+# (column name, numpy dtype, arrow type name)
+SCORE_COLUMNS = (
+    ("id", "i8", "int64"),
+    ("user_id", "i8", "int64"),
+    ("beatmap_id", "i8", "int64"),
+    ("score", "i8", "int64"),
+    ("pp", "f8", "float64"),
+    ("accuracy", "f8", "float64"),
+    ("max_combo", "i4", "int32"),
+    ("created_at", "M8[ms]", "timestamp"),
+    ("mods", "u4", "uint32"),
+    ("count_300", "i4", "int32"),
+    ("count_100", "i4", "int32"),
+    ("count_50", "i4", "int32"),
+    ("count_geki", "i4", "int32"),
+    ("count_katu", "i4", "int32"),
+    ("count_miss", "i4", "int32"),
+)
+
+RANKING_COLUMNS = (
+    ("global_rank", "i8", "int64"),
+    ("pp", "f8", "float64"),
+    ("hit_accuracy", "f8", "float64"),
+    ("play_count", "i8", "int64"),
+    ("play_time", "i8", "int64"),
+    ("ranked_score", "i8", "int64"),
+    ("total_score", "i8", "int64"),
+    ("total_hits", "i8", "int64"),
+    ("maximum_combo", "i4", "int32"),
+    ("level", "i4", "int32"),
+    ("grade_ss", "i4", "int32"),
+    ("grade_ssh", "i4", "int32"),
+    ("grade_s", "i4", "int32"),
+    ("grade_sh", "i4", "int32"),
+    ("grade_a", "i4", "int32"),
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _mods(acronyms: tuple[str, ...]) -> int:
+    return int(Mods.from_acronyms(acronyms))
+
+
+def _timestamp_ms(value: datetime | None) -> int | None:
+    if value is None:
+        return None
+    return int(value.timestamp() * 1000)
+
+
+def _float(value: float | None) -> float:
+    return math.nan if value is None else value
+
+
+def _score_row(score) -> tuple:
+    statistics = score.statistics
+    beatmap = score.beatmap
+    return (
+        score.id,
+        score.user_id,
+        -1 if beatmap is None else beatmap.id,
+        score.score,
+        _float(score.pp),
+        score.accuracy,
+        score.max_combo,
+        _timestamp_ms(score.created_at),
+        _mods(tuple(score.mods)),
+        statistics.count_300,
+        statistics.count_100,
+        statistics.count_50,
+        statistics.count_geki,
+        statistics.count_katu,
+        statistics.count_miss,
+    )
+
+
+def _ranking_row(statistics) -> tuple:
+    grades = statistics.grade_counts
+    return (
+        -1 if statistics.global_rank is None else statistics.global_rank,
+        _float(statistics.pp),
+        _float(statistics.hit_accuracy),
+        statistics.play_count,
+        statistics.play_time,
+        statistics.ranked_score,
+        statistics.total_score,
+        statistics.total_hits,
+        statistics.maximum_combo,
+        statistics.level.current,
+        grades.ss,
+        grades.ssh,
+        grades.s,
+        grades.sh,
+        grades.a,
+    )
+
+
+def _rows(obj: Any) -> tuple[tuple, list[tuple]]:
+    """
+    Returns the column spec and the rows of a score or ranking collection.
+    """
+    if (ranking := getattr(obj, "ranking", None)) is not None:
+        return RANKING_COLUMNS, [_ranking_row(entry) for entry in ranking]
+    if (scores := getattr(obj, "scores", None)) is not None:
+        obj = scores
+    if not isinstance(obj, list):
+        raise TypeError(
+            "expected Scores, BeatmapScores, Rankings or a list of Score/UserStatistics"
+            f" not type<{type(obj).__name__}>"
+        )
+    if obj and not hasattr(obj[0], "mods"):
+        return RANKING_COLUMNS, [_ranking_row(entry) for entry in obj]
+    return SCORE_COLUMNS, [_score_row(score) for score in obj]
+
+
+def to_numpy(obj: Any):
+    """
+    Converts scores or rankings into a NumPy structured array.
+
+    parameters:
+        obj: Scores, BeatmapScores, list[Score], Rankings or list[UserStatistics]
+            - models from any parse mode can be given
+    returns:
+        numpy structured array with SCORE_COLUMNS or RANKING_COLUMNS fields
+
+    mods are a legacy bitmask (losuapi.types.Mods), missing pp is NaN and a
+    missing beatmap id or global rank is -1.
+    """
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError("to_numpy requires numpy (pip install losuapi[numpy])") from e
+    columns, rows = _rows(obj)
+    dtype = np.dtype([(name, np_type) for name, np_type, _ in columns])
+    return np.array(rows, dtype=dtype)
+
+
+def to_arrow(obj: Any):
+    """
+    Converts scores or rankings into a pyarrow Table.
+
+    parameters:
+        obj: Scores, BeatmapScores, list[Score], Rankings or list[UserStatistics]
+            - models from any parse mode can be given
+    returns:
+        pyarrow.Table with SCORE_COLUMNS or RANKING_COLUMNS columns
+
+    created_at is a UTC millisecond timestamp column, the other columns
+    follow to_numpy.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError(
+            "to_arrow requires pyarrow (pip install losuapi[arrow])"
+        ) from e
+    columns, rows = _rows(obj)
+    values = list(zip(*rows)) if rows else [()] * len(columns)
+    arrays = {}
+    for (name, _, arrow_type), column in zip(columns, values):
+        if arrow_type == "timestamp":
+            type_ = pa.timestamp("ms", tz="UTC")
+        else:
+            type_ = getattr(pa, arrow_type)()
+        arrays[name] = pa.array(column, type=type_)
+    return pa.table(arrays)
@@ -0,0 +1,619 @@
+import functools
+import inspect
+import operator
+from enum import Enum
+from typing import Any, Callable, NamedTuple
+from .types import (
+    Beatmap,
+    Beatmaps,
+    Rankings,
+    User,
+    Scores,
+    Score,
+    ScoreTypes,
+    GameMode,
+    GameModeInt,
+    RankingType,
+    BeatmapUserScore,
+    BeatmapScores,
+    Attributes,
+    KudosuHistory,
+    BeatmapType,
+    BeatmapPlaycount,
+    Users,
+    Event,
+    Spotlights,
+)
+from .utility import c_TypeError
+
+
+class Param(NamedTuple):
+    """
+    One argument of an endpoint method.
+
+    - name: str - Argument name.
+    - types: tuple[type] - Accepted types, checked with isinstance.
+    - doc: str - Description used in the generated docstring.
+    - required: bool - Optional arguments are skipped when falsy.
+    - default: Any - Default of optional arguments.
+    - query: str | None - Query param name, None for arguments of the url path.
+    - enum: type[Enum] | None - Enum whose members are replaced by their value.
+    - elements: tuple[type] | None - Accepted element types of list arguments.
+    - choices: tuple | None - Allowed values.
+    - check: callable | None - Extra check called with the value.
+    - convert: callable | None - Applied to the value before it is sent.
+    """
+
+    name: str
+    types: tuple[type, ...]
+    doc: str
+    required: bool = False
+    default: Any = None
+    query: str | None = None
+    enum: type[Enum] | None = None
+    elements: tuple[type, ...] | None = None
+    choices: tuple | None = None
+    check: Callable[[Any], None] | None = None
+    convert: Callable[[Any], Any] | None = None
+
+
+class Endpoint(NamedTuple):
+    """
+    One Osu! api endpoint, the client methods are generated from it.
+
+    - name: str - Client method name.
+    - method: str - Http method.
+    - path: str - Url path relative to BASE_URL, with {param} placeholders.
+    - params: tuple[Param] - Method arguments, in signature order.
+    - response: type - Model the response is parsed into.
+    - doc: str - First line of the docstring.
+    - anchor: str - Anchor of the endpoint in the api documentation.
+    - check: callable | None - Cross argument check, called with the validated arguments.
+    - paging: str | None - 'offset' or 'cursor' for endpoints paginate() supports.
+    - chunked: str | None - Response field of id list endpoints split into MAX_IDS chunks.
+    """
+
+    name: str
+    method: str
+    path: str
+    params: tuple[Param, ...]
+    response: Any
+    doc: str
+    anchor: str
+    check: Callable[[dict], None] | None = None
+    paging: str | None = None
+    chunked: str | None = None
+
+
+def _type_name(types: tuple[type, ...]) -> str:
+    return "|".join(type_.__name__ for type_ in types)
+
+
+def _not_blank(value) -> None:
+    if not str(value).strip():
+        raise ValueError("param<username> cannot be blank")
+
+
+def _not_negative(value) -> None:
+    if value < 0:
+        raise ValueError("param<cursor> must be greater that -1")
+
+
+def _check_user_scores(values: dict) -> None:
+    if values["include_fails"] and values["Type"] != ScoreTypes.RECENT.value:
+        raise ValueError("param<Type> must be 'recent' in order to set include_fails")
+
+
+def _check_ranking(values: dict) -> None:
+    Type = values["Type"]
+    if values["country"] and Type != RankingType.PERFORMANCE.value:
+        raise ValueError(
+            "param<Type> must be 'performance' in order to set a country code."
+        )
+    if values["spotlight_id"] and Type != RankingType.CHARTS.value:
+        raise ValueError("param<Type> must be 'charts' in order to set a spotlight_id.")
+    if values["variant"]:
+        if Type != RankingType.PERFORMANCE.value:
+            raise ValueError("param<Type> must be 'performance' to use variant")
+        if values["mode"] != GameMode.MANIA.value:
+            raise ValueError("param<mode> must be 'mania' to use variant")
+
+
+def _mode(doc: str = "Osu! gamemode.", name: str = "mode", **kwargs) -> Param:
+    return Param(
+        name=name,
+        types=(GameMode, str),
+        doc=f"{doc}\n    - (osu, taiko, mania, fruits)",
+        enum=GameMode,
+        **kwargs,
+    )
+
+
+def _id(name: str, doc: str, **kwargs) -> Param:
+    return Param(name=name, types=(int,), doc=doc, required=True, **kwargs)
+
+
+def _limit() -> Param:
+    return Param("limit", (int,), "Maximum numbers of results.", query="limit")
+
+
+def _offset(types: tuple[type, ...]) -> Param:
+    return Param("offset", types, "Result offset for pagination.", query="offset")
+
+
+ENDPOINTS = (
+    ##########
+    #
+    # Beatmap endpoints
+    #
+    #########
+    Endpoint(
+        name="lookup_beatmap",
+        method="GET",
+        path="/beatmaps/lookup",
+        params=(
+            _id("beatmap_id", "ID of an Osu! beatmap.", query="id"),
+            Param("checksum", (str,), "Osu! beatmap checksum value.", query="checksum"),
+            Param("filename", (str,), "Filename to lookup.", query="filename"),
+        ),
+        response=Beatmap,
+        doc="Returns beatmap information.",
+        anchor="lookup-beatmap",
+    ),
+    Endpoint(
+        name="user_beatmap_score",
+        method="GET",
+        path="/beatmaps/{beatmap_id}/scores/users/{user_id}",
+        params=(
+            _id("beatmap_id", "ID of an Osu! beatmap."),
+            _id("user_id", "ID of an Osu! user."),
+            _mode(query="mode"),
+            Param("mods", (str,), "String of mods (undocumented).", query="mods"),
+        ),
+        response=BeatmapUserScore,
+        doc="Return a User's score on a Beatmap.",
+        anchor="get-a-user-beatmap-score",
+    ),
+    Endpoint(
+        name="user_beatmap_scores",
+        method="GET",
+        path="/beatmaps/{beatmap_id}/scores/users/{user_id}/all",
+        params=(
+            _id("beatmap_id", "ID of an Osu! beatmap."),
+            _id("user_id", "ID of an Osu! user."),
+            _mode(query="mode"),
+        ),
+        response=Scores,
+        doc="Return a User's scores on a Beatmap.",
+        anchor="get-a-user-beatmap-scores",
+    ),
+    Endpoint(
+        name="beatmap_scores",
+        method="GET",
+        path="/beatmaps/{beatmap_id}/scores",
+        params=(
+            _id("beatmap_id", "ID of an Osu! beatmap."),
+            _mode(query="mode"),
+            Param("mods", (str,), "String of mods (undocumented).", query="mods"),
+            Param(
+                "Type",
+                (str,),
+                "Beatmap score ranking type (undocumented).",
+                query="type",
+            ),
+        ),
+        response=BeatmapScores,
+        doc="Returns the top scores for a beatmap.",
+        anchor="get-beatmap-scores",
+    ),
+    Endpoint(
+        name="beatmaps",
+        method="GET",
+        path="/beatmaps",
+        params=(
+            Param(
+                "beatmap_ids",
+                (list,),
+                "Array of beatmap IDs.",
+                required=True,
+                query="ids[]",
+                elements=(int,),
+            ),
+        ),
+        response=Beatmaps,
+        doc="Returns a list of beatmaps.",
+        anchor="get-beatmaps",
+        chunked="beatmaps",
+    ),
+    Endpoint(
+        name="beatmap",
+        method="GET",
+        path="/beatmaps/{beatmap_id}",
+        params=(_id("beatmap_id", "ID of an Osu! beatmap."),),
+        response=Beatmap,
+        doc="Gets beatmap data for the specified beatmap ID.",
+        anchor="get-beatmap",
+    ),
+    Endpoint(
+        name="beatmap_attributes",
+        method="POST",
+        path="/beatmaps/{beatmap_id}/attributes",
+        params=(
+            _id("beatmap_id", "ID of an Osu! beatmap."),
+            Param(
+                "mods",
+                (list,),
+                "Array of mod acronyms or mod bitmasks.",
+                query="mods",
+                elements=(str, int),
+            ),
+            _mode(name="ruleset", query="ruleset"),
+            Param(
+                "ruleset_id",
+                (GameModeInt, int),
+                "Osu! gamemode int.\n    - (osu=0,taiko=1,mania=2,fruits=3)",
+                query="ruleset_id",
+                convert=int,
+            ),
+        ),
+        response=Attributes,
+        doc="Returns difficulty attributes of beatmap with specific mode and mods combination.",
+        anchor="get-beatmap-attributes",
+    ),
+    ##########
+    #
+    # User endpoints
+    #
+    #########
+    Endpoint(
+        name="user_kudosu",
+        method="GET",
+        path="/users/{user_id}/kudosu",
+        params=(_id("user_id", "ID of an Osu! user."), _limit(), _offset((str,))),
+        response=list[KudosuHistory],
+        doc="Returns kudosu history.",
+        anchor="get-user-kudosu",
+        paging="offset",
+    ),
+    Endpoint(
+        name="user_scores",
+        method="GET",
+        path="/users/{user_id}/scores/{Type}",
+        params=(
+            _id("user_id", "ID of an Osu! user."),
+            Param(
+                "Type",
+                (ScoreTypes, str),
+                "Score type.\n    - ('best', 'firsts', 'recent')",
+                required=True,
+                enum=ScoreTypes,
+                choices=tuple(ScoreTypes.list()),
+            ),
+            Param(
+                "include_fails",
+                (bool,),
+                "Only for recent score type, include scores of failed plays, defaults to False.",
+                default=False,
+                query="include_fails",
+                convert=int,
+            ),
+            _mode("Game mode of scores to be returned.", query="mode"),
+            _limit(),
+            _offset((int,)),
+        ),
+        response=list[Score],
+        doc="Returns an array of scores of a specified user.",
+        anchor="get-user-scores",
+        check=_check_user_scores,
+        paging="offset",
+    ),
+    Endpoint(
+        name="user_beatmaps",
+        method="GET",
+        path="/users/{user_id}/beatmapsets/{Type}",
+        params=(
+            _id("user_id", "ID of an Osu! user."),
+            Param(
+                "Type",
+                (BeatmapType, str),
+                "Osu! beatmap status.\n    - (favourite, graveyard, loved, most_played, pending, ranked)",
+                required=True,
+                enum=BeatmapType,
+            ),
+            _limit(),
+            _offset((int,)),
+        ),
+        response=list[BeatmapPlaycount],
+        doc="Returns the beatmaps of a specified user.",
+        anchor="get-user-beatmaps",
+        paging="offset",
+    ),
+    Endpoint(
+        name="user_recent_activity",
+        method="GET",
+        path="/users/{user_id}/recent_activity",
+        params=(_id("user_id", "ID of an Osu! user."), _limit(), _offset((str,))),
+        response=list[Event],
+        doc="Returns recent activity.",
+        anchor="get-user-recent-activity",
+        paging="offset",
+    ),
+    Endpoint(
+        name="user",
+        method="GET",
+        path="/users/{username}/{mode}",
+        params=(
+            Param(
+                "username",
+                (int, str),
+                "ID or username of an Osu! user.",
+                required=True,
+                check=_not_blank,
+            ),
+            _mode(default=""),
+            Param(
+                "key",
+                (str,),
+                "type of username given.\n    - ('id', 'username')",
+                default="",
+                query="key",
+                choices=("id", "username"),
+            ),
+        ),
+        response=User,
+        doc="Returns the detail of a specified user.",
+        anchor="get-user",
+    ),
+    Endpoint(
+        name="users",
+        method="GET",
+        path="/users",
+        params=(
+            Param(
+                "user_ids",
+                (list,),
+                "List of Osu! user IDs.",
+                required=True,
+                query="ids[]",
+                elements=(int,),
+            ),
+        ),
+        response=Users,
+        doc="Returns list of user information.",
+        anchor="get-users",
+        chunked="users",
+    ),
+    ##########
+    #
+    # Ranking endpoints
+    #
+    #########
+    Endpoint(
+        name="ranking",
+        method="GET",
+        path="/rankings/{mode}/{Type}",
+        params=(
+            _mode(required=True),
+            Param(
+                "Type",
+                (RankingType, str),
+                "Ranking type.\n    - ('charts', 'country', 'performance', 'score')",
+                required=True,
+                enum=RankingType,
+            ),
+            Param(
+                "Filter",
+                (str,),
+                "'all' or 'friends', defaults to 'all'.",
+                default="all",
+                query="filter",
+                choices=("all", "friends"),
+            ),
+            Param(
+                "country",
+                (int,),
+                "Country code, only available for Type 'performance'.",
+                query="country",
+            ),
+            Param(
+                "cursor",
+                (int,),
+                "https://osu.ppy.sh/docs/index.html#cursor",
+                query="cursor[page]",
+                check=_not_negative,
+            ),
+            Param(
+                "spotlight_id",
+                (int,),
+                "ID of the spotlight if Type is 'charts'. Ranking for latest spotlight if not specified.",
+                query="spotlight",
+            ),
+            Param(
+                "variant",
+                (str,),
+                "Filter ranking by specified mode variant, only for mode of 'mania', Type must be 'performance'.",
+                query="variant",
+                choices=("4k", "7k"),
+            ),
+        ),
+        response=Rankings,
+        doc="Gets the current ranking for the specified type and game mode.",
+        anchor="get-ranking",
+        check=_check_ranking,
+        paging="cursor",
+    ),
+    Endpoint(
+        name="spotlights",
+        method="GET",
+        path="/spotlights",
+        params=(),
+        response=Spotlights,
+        doc="Gets the list of spotlights.",
+        anchor="get-spotlights",
+    ),
+)
+
+
+def _type_error(name: str, types: tuple[type, ...], value) -> TypeError:
+    return c_TypeError(
+        param_name=name, correct=_type_name(types), wrong=type(value).__name__
+    )
+
+
+def _choice_error(name: str, choices: tuple) -> ValueError:
+    return ValueError(f"param<{name}> must be one of {', '.join(map(repr, choices))}")
+
+
+def _check_elements(name: str, types: tuple[type, ...], values: list) -> None:
+    for value in values:
+        if not isinstance(value, types):
+            raise _type_error(f"{name}[elements]", types, value)
+
+
+def _param_source(index: int, param: Param, namespace: dict) -> list[str]:
+    """
+    Returns the source lines validating one argument, the objects they use
+    are added to namespace.
+    """
+    name = param.name
+    lines = [
+        f"if not isinstance({name}, _types{index}):",
+        f"    raise _type_error({name!r}, _types{index}, {name})",
+    ]
+    namespace[f"_types{index}"] = param.types
+    if param.enum is not None:
+        namespace[f"_enum{index}"] = param.enum
+        lines.append(f"if isinstance({name}, _enum{index}): {name} = {name}.value")
+    if param.elements is not None:
+        namespace[f"_elements{index}"] = param.elements
+        lines.append(f"_check_elements({name!r}, _elements{index}, {name})")
+    if param.choices is not None:
+        namespace[f"_choices{index}"] = param.choices
+        lines.append(
+            f"if {name} not in _choices{index}: "
+            f"raise _choice_error({name!r}, _choices{index})"
+        )
+    if param.check is not None:
+        namespace[f"_check{index}"] = param.check
+        lines.append(f"_check{index}({name})")
+    if param.convert is not None:
+        namespace[f"_convert{index}"] = param.convert
+        lines.append(f"{name} = _convert{index}({name})")
+    if param.query is not None:
+        lines.append(f"query_params[{param.query!r}] = {name}")
+    if param.required:
+        return lines
+    # optional arguments are skipped when falsy, like the api's own defaults
+    skip = None if param.query is not None else ""
+    return [
+        f"if {name}:",
+        *(f"    {line}" for line in lines),
+        f"else: {name} = {skip!r}",
+    ]
+
+
+def compile_builder(endpoint: Endpoint) -> Callable[..., dict]:
+    """
+    Returns the function building the request dictionary of an endpoint.
+
+    The function is generated from the endpoint's params so every argument
+    check runs inline, it takes (self, headers, *arguments) and returns
+    {"method", "url", "params", "headers"}.
+    """
+    namespace = {
+        "_type_error": _type_error,
+        "_choice_error": _choice_error,
+        "_check_elements": _check_elements,
+        "_cross_check": endpoint.check,
+    }
+    arguments, body = [], ["query_params = {}"]
+    for index, param in enumerate(endpoint.params):
+        if param.required:
+            arguments.append(param.name)
+        else:
+            namespace[f"_default{index}"] = param.default
+            arguments.append(f"{param.name}=_default{index}")
+        body.extend(_param_source(index, param, namespace))
+    if endpoint.check is not None:
+        values = ", ".join(f"{param.name!r}: {param.name}" for param in endpoint.params)
+        body.append(f"_cross_check({{{values}}})")
+    body.append(
+        f"return {{'method': {endpoint.method!r}, "
+        f"'url': self.BASE_URL + f{endpoint.path!r}, "
+        "'params': query_params, 'headers': headers}"
+    )
+    source = "\n".join(
+        [
+            f"def {endpoint.name}({', '.join(['self', 'headers', *arguments])}):",
+            *(f"    {line}" for line in body),
+        ]
+    )
+    exec(compile(source, f"<endpoint {endpoint.name}>", "exec"), namespace)
+    return namespace[endpoint.name]
+
+
+FIELDS_DOC = "- fields: list[str] | None - Only parse these fields, e.g. ['id', 'beatmapset.title']."
+FIELDS_PARAMETER = inspect.Parameter(
+    "fields", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=list[str] | None
+)
+CHUNK_DOC = (
+    "Any number of IDs can be given, they are requested in chunks of\n"
+    "BaseOsuApi.MAX_IDS."
+)
+
+
+def signature(endpoint: Endpoint, *extra: inspect.Parameter) -> inspect.Signature:
+    """
+    Returns the signature of the client method of an endpoint, extra
+    parameters are appended.
+    """
+    parameters = [inspect.Parameter("self", inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+    for param in endpoint.params:
+        annotation = functools.reduce(operator.or_, param.types)
+        parameters.append(
+            inspect.Parameter(
+                param.name,
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                default=inspect.Parameter.empty if param.required else param.default,
+                annotation=annotation if param.required else annotation | None,
+            )
+        )
+    parameters.extend(extra)
+    return inspect.Signature(parameters, return_annotation=endpoint.response)
+
+
+def _annotation_name(param: Param) -> str:
+    if param.elements:
+        return f"list[{' | '.join(type_.__name__ for type_ in param.elements)}]"
+    return " | ".join(type_.__name__ for type_ in param.types)
+
+
+def docstring(endpoint: Endpoint, *extra: str, note: str = None) -> str:
+    """
+    Returns the docstring of the client method of an endpoint, extra lines
+    are added to the parameter list and a note below the api link.
+    """
+    lines = [
+        endpoint.doc,
+        "",
+        f"Api documentation: https://osu.ppy.sh/docs/index.html#{endpoint.anchor}",
+        "",
+    ]
+    if note:
+        lines.extend([note, ""])
+    params = [
+        f"- {param.name}: {_annotation_name(param)}"
+        f"{'' if param.required else ' | None'} - {param.doc}"
+        for param in endpoint.params
+    ]
+    params.extend(extra)
+    lines.append("Parameters:" if params else "Parameters: None")
+    lines.extend(f"    {line}" for param in params for line in param.split("\n"))
+    if getattr(endpoint.response, "__origin__", None) is list:
+        response = f"list[losuapi.types.{endpoint.response.__args__[0].__name__}]"
+    else:
+        response = f"losuapi.types.{endpoint.response.__name__}"
+    lines.extend(
+        ["", f"Returns: {response}", "", "Returns None if http request errors out."]
+    )
+    return "\n".join(lines)
@@ -0,0 +1,448 @@
+import functools
+import json
+from datetime import datetime
+from enum import Enum
+from types import UnionType
+from typing import Any, Callable, Union, get_args, get_origin
+from pydantic import BaseModel, Field, ValidationError, create_model, parse_obj_as
+from pydantic.datetime_parse import parse_datetime
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import MissingError
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON, ModelField
+
+DECODERS = ("json", "orjson", "msgspec")
+PARSE_MODES = ("validate", "lazy", "msgspec", "construct")
+
+_MISSING = object()
+
+
+def get_decoder(name: str = "json") -> Callable[[bytes], Any]:
+    """
+    Returns a function that decodes a JSON response body from bytes.
+
+    parameters:
+        name: str - decoder backend, one of 'json', 'orjson' or 'msgspec'
+    returns:
+        callable taking the raw response bytes and returning python objects
+
+    'orjson' and 'msgspec' are optional dependencies and must be installed
+    separately.
+    """
+    if name == "json":
+        return json.loads
+    if name == "orjson":
+        try:
+            import orjson
+        except ImportError as e:
+            raise ImportError(
+                "json_decoder='orjson' requires the orjson package (pip install losuapi[orjson])"
+            ) from e
+        return orjson.loads
+    if name == "msgspec":
+        try:
+            import msgspec
+        except ImportError as e:
+            raise ImportError(
+                "json_decoder='msgspec' requires the msgspec package (pip install losuapi[msgspec])"
+            ) from e
+        return msgspec.json.Decoder().decode
+    raise ValueError(f"param<json_decoder> must be one of {', '.join(DECODERS)}")
+
+
+def is_error(obj: Any) -> bool:
+    """
+    Returns True if a decoded response body is an api error message.
+    """
+    return isinstance(obj, dict) and ("error" in obj or "authentication" in obj)
+
+
+def _model_type(field: ModelField) -> type[BaseModel] | None:
+    """
+    Returns the model class of a field holding a model or a list of models.
+    """
+    if isinstance(field.type_, type) and issubclass(field.type_, BaseModel):
+        if field.shape in (SHAPE_SINGLETON, SHAPE_LIST):
+            return field.type_
+    return None
+
+
+class LazyModel:
+    """
+    Read-only stand-in for a pydantic model that validates each field the
+    first time it is read.
+
+    Fields holding models or lists of models become LazyModels themselves, so
+    only the parts of a response that are used get validated. Validation
+    errors are raised on access instead of when the response is parsed.
+    """
+
+    __slots__ = ("_model", "_raw", "_values")
+
+    def __init__(self, model: type[BaseModel], raw: dict) -> None:
+        self._model = model
+        self._raw = raw
+        self._values = {}
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name in self._values:
+            return self._values[name]
+        field = self._model.__fields__.get(name)
+        if field is None:
+            raise AttributeError(
+                f"'{self._model.__name__}' object has no attribute '{name}'"
+            )
+        value = self._values[name] = self._validate(field)
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in LazyModel.__slots__:
+            return object.__setattr__(self, name, value)
+        raise TypeError(f"'{self._model.__name__}' lazy model is read-only")
+
+    def __repr__(self) -> str:
+        return f"Lazy{self._model.__name__}()"
+
+    def _validate(self, field: ModelField) -> Any:
+        if (raw := self._raw.get(field.alias, _MISSING)) is _MISSING:
+            if field.required:
+                raise ValidationError(
+                    [ErrorWrapper(MissingError(), loc=field.alias)], self._model
+                )
+            return field.get_default()
+        if (model := _model_type(field)) is not None:
+            if field.shape == SHAPE_SINGLETON and isinstance(raw, dict):
+                return LazyModel(model, raw)
+            if field.shape == SHAPE_LIST and isinstance(raw, list):
+                if all(isinstance(item, dict) for item in raw):
+                    return [LazyModel(model, item) for item in raw]
+        value, errors = field.validate(raw, {}, loc=field.alias, cls=self._model)
+        if errors:
+            raise ValidationError([errors], self._model)
+        return value
+
+    @property
+    def model(self) -> type[BaseModel]:
+        """The pydantic model class this object stands in for."""
+        return self._model
+
+    def materialize(self) -> BaseModel:
+        """Validates the whole response and returns the pydantic model."""
+        return self._model.parse_obj(self._raw)
+
+    def dict(self, **kwargs) -> dict:
+        """Same as BaseModel.dict on the materialized model."""
+        return self.materialize().dict(**kwargs)
+
+
+def parse_lazy(Type: Any, obj: Any) -> Any:
+    """
+    Wraps a decoded response in LazyModels instead of validating it.
+
+    parameters:
+        Type: response type, a model class or list of model classes
+        obj: decoded json response
+    returns:
+        LazyModel, list of LazyModels, or the validated value for other types
+    """
+    if get_origin(Type) is list and isinstance(obj, list):
+        (item_type,) = get_args(Type)
+        return [parse_lazy(item_type, item) for item in obj]
+    if isinstance(Type, type) and issubclass(Type, BaseModel) and isinstance(obj, dict):
+        return LazyModel(Type, obj)
+    return parse_obj_as(Type, obj)
+
+
+def parse(Type: Any, obj: Any, mode: str = "validate") -> Any:
+    """
+    Builds the response type from a decoded response.
+
+    parameters:
+        Type: response type
+        obj: decoded json response
+        mode: str - one of PARSE_MODES
+            - 'validate': pydantic models, validated up front
+            - 'lazy': LazyModels, validated field by field on access
+            - 'construct': pydantic models built without validation
+
+    'msgspec' responses are decoded straight from bytes with decode_struct.
+    """
+    if mode == "lazy":
+        return parse_lazy(Type, obj)
+    if mode == "construct":
+        return parse_construct(Type, obj)
+    return parse_obj_as(Type, obj)
+
+
+def _nested_model(field: ModelField) -> type[BaseModel] | None:
+    """
+    Returns the model class fields of a projection path are looked up on,
+    the first model of a union field.
+    """
+    if (model := _model_type(field)) is not None:
+        return model
+    for sub_field in field.sub_fields or ():
+        if isinstance(sub_field.type_, type) and issubclass(sub_field.type_, BaseModel):
+            return sub_field.type_
+    return None
+
+
+def _project_model(model: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    paths: dict[str, list[str] | None] = {}
+    for path in fields:
+        name, _, rest = path.partition(".")
+        if not rest:
+            paths[name] = None
+        elif paths.get(name, []) is not None:
+            paths.setdefault(name, []).append(rest)
+
+    definitions = {}
+    for name, rest in paths.items():
+        if (field := model.__fields__.get(name)) is None:
+            raise ValueError(f"{model.__name__} has no field '{name}'")
+        type_ = field.outer_type_
+        if rest:
+            if (nested := _nested_model(field)) is None:
+                raise ValueError(f"{model.__name__}.{name} has no nested fields")
+            type_ = _project_model(nested, tuple(rest))
+            if field.shape == SHAPE_LIST:
+                type_ = list[type_]
+        definitions[name] = (type_ | None, Field(None, alias=field.alias))
+    return create_model(
+        f"{model.__name__}Projection",
+        __config__=model.__config__,
+        __module__=__name__,
+        **definitions,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def projection(Type: Any, fields: tuple[str, ...]) -> Any:
+    """
+    Returns a slim version of a response type holding only the given fields.
+
+    parameters:
+        Type: response type, a model class or list of model classes
+        fields: tuple[str] - field names, nested fields are joined with dots
+            - e.g. ('pp', 'beatmap.id', 'created_at') for list[Score]
+    returns:
+        model class (or list of it) with every selected field optional
+
+    Projections are built once per (Type, fields) and reused.
+    """
+    if get_origin(Type) is list:
+        (item_type,) = get_args(Type)
+        return list[projection(item_type, fields)]
+    if not (isinstance(Type, type) and issubclass(Type, BaseModel)):
+        raise ValueError(f"fields cannot be selected on {Type}")
+    return _project_model(Type, fields)
+
+
+def _import_msgspec():
+    try:
+        import msgspec
+    except ImportError as e:
+        raise ImportError(
+            "parse_mode='msgspec' requires the msgspec package (pip install losuapi[msgspec])"
+        ) from e
+    return msgspec
+
+
+def _struct_annotation(type_: Any, use_enum_values: bool) -> Any:
+    """
+    Converts a pydantic field type into the matching msgspec type.
+    """
+    if isinstance(type_, type) and issubclass(type_, BaseModel):
+        return struct_type(type_)
+    if isinstance(type_, type) and issubclass(type_, Enum):
+        if use_enum_values:
+            return type(next(iter(type_)).value)
+        return type_
+    if type_ is int:
+        # pydantic truncates floats sent for int fields, msgspec keeps them
+        return int | float
+    if (origin := get_origin(type_)) is list:
+        (item_type,) = get_args(type_) or (Any,)
+        return list[_struct_annotation(item_type, use_enum_values)]
+    if origin in (Union, UnionType):
+        models = [
+            arg
+            for arg in get_args(type_)
+            if isinstance(arg, type) and issubclass(arg, BaseModel)
+        ]
+        others = [arg for arg in get_args(type_) if arg not in models]
+        # msgspec unions can hold a single struct type, a union of models
+        # decodes into the first model with every field optional
+        if len(models) > 1:
+            models = [struct_type(models[0], relaxed=True)]
+        else:
+            models = [struct_type(model) for model in models]
+        args = models + [_struct_annotation(arg, use_enum_values) for arg in others]
+        return Union[tuple(args)]
+    return type_
+
+
+@functools.lru_cache(maxsize=None)
+def struct_type(model: type[BaseModel], relaxed: bool = False) -> Any:
+    """
+    Returns a msgspec Struct class with the same field names, aliases and
+    nesting as a pydantic model.
+
+    parameters:
+        model: pydantic model class
+        relaxed: bool - make every field optional
+    returns:
+        slotted msgspec.Struct subclass, built once per model and reused
+
+    Structs are created with gc=False as decoded responses hold no
+    reference cycles, which keeps them small and out of the garbage
+    collector's way.
+    """
+    msgspec = _import_msgspec()
+    use_enum_values = getattr(model.__config__, "use_enum_values", False)
+    fields, rename = [], {}
+    for name, field in model.__fields__.items():
+        annotation = _struct_annotation(field.outer_type_, use_enum_values)
+        if field.allow_none:
+            annotation = annotation | None
+        if field.required and not relaxed:
+            fields.append((name, annotation))
+        else:
+            fields.append((name, annotation | None, field.default))
+        if field.alias != name:
+            rename[name] = field.alias
+    return msgspec.defstruct(
+        model.__name__ if not relaxed else f"{model.__name__}Relaxed",
+        fields,
+        module=__name__,
+        rename=rename,
+        kw_only=True,
+        gc=False,
+    )
+
+
+def decode_struct(Type: Any, content: bytes) -> Any:
+    """
+    Decodes and validates a response body straight into msgspec Structs.
+
+    parameters:
+        Type: response type, a model class or list of model classes
+        content: bytes - raw json response body
+    returns:
+        Struct, or list of Structs, mirroring Type
+    raises:
+        msgspec.ValidationError if the body does not match Type
+    """
+    return _struct_decoder(Type).decode(content)
+
+
+@functools.lru_cache(maxsize=None)
+def _struct_decoder(Type: Any) -> Any:
+    msgspec = _import_msgspec()
+    if get_origin(Type) is list:
+        (item_type,) = get_args(Type)
+        target = list[_struct_annotation(item_type, False)]
+    else:
+        target = _struct_annotation(Type, False)
+    return msgspec.json.Decoder(target, strict=False)
+
+
+def _models_of(field: ModelField) -> list[type[BaseModel]]:
+    if (model := _model_type(field)) is not None:
+        return [model]
+    return [
+        sub_field.type_
+        for sub_field in field.sub_fields or ()
+        if isinstance(sub_field.type_, type) and issubclass(sub_field.type_, BaseModel)
+    ]
+
+
+def _value_converter(field: ModelField, use_enum_values: bool) -> Callable | None:
+    """
+    Returns the function turning a trusted raw value of a field into the
+    value validation would produce, None if the raw value can be used as is.
+    """
+    if models := _models_of(field):
+        if len(models) == 1:
+            (model,) = models
+
+            def convert_item(value):
+                return construct_model(model, value)
+
+        else:
+            # unions of models pick the first model whose required fields are
+            # all present, the same choice validation makes
+            required = [
+                (model, {f.alias for f in model.__fields__.values() if f.required})
+                for model in models
+            ]
+
+            def convert_item(value):
+                for model, aliases in required:
+                    if aliases <= value.keys():
+                        return construct_model(model, value)
+                return construct_model(models[-1], value)
+
+    elif field.type_ is datetime:
+
+        def convert_item(value):
+            # the parser validation uses: "Z" suffixes on every python version
+            # and unix timestamps
+            return None if value is None else parse_datetime(value)
+
+    elif isinstance(field.type_, type) and issubclass(field.type_, Enum):
+        if use_enum_values:
+            return None
+        convert_item = field.type_
+    else:
+        return None
+
+    if field.shape == SHAPE_LIST:
+        return lambda value: [convert_item(item) for item in value]
+    return convert_item
+
+
+@functools.lru_cache(maxsize=None)
+def _construct_plan(model: type[BaseModel]) -> tuple:
+    use_enum_values = getattr(model.__config__, "use_enum_values", False)
+    return tuple(
+        (name, field.alias, _value_converter(field, use_enum_values), field)
+        for name, field in model.__fields__.items()
+    )
+
+
+def construct_model(model: type[BaseModel], raw: dict) -> BaseModel:
+    """
+    Builds a pydantic model from a trusted decoded response without
+    validating it.
+
+    Like BaseModel.construct, but nested models, lists of models, aliases,
+    datetime strings and enums are converted the way validation would.
+    Values are otherwise used as they are, so wrong types are not caught.
+    """
+    values, fields_set = {}, set()
+    for name, alias, convert, field in _construct_plan(model):
+        if (value := raw.get(alias, _MISSING)) is _MISSING:
+            values[name] = field.get_default()
+            continue
+        fields_set.add(name)
+        values[name] = value if convert is None or value is None else convert(value)
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__fields_set__", fields_set)
+    instance._init_private_attributes()
+    return instance
+
+
+def parse_construct(Type: Any, obj: Any) -> Any:
+    """
+    Builds the response type from a trusted decoded response without
+    validation, see construct_model.
+    """
+    if get_origin(Type) is list and isinstance(obj, list):
+        (item_type,) = get_args(Type)
+        return [parse_construct(item_type, item) for item in obj]
+    if isinstance(Type, type) and issubclass(Type, BaseModel) and isinstance(obj, dict):
+        return construct_model(Type, obj)
+    return parse_obj_as(Type, obj)
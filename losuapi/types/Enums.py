@@ -1,4 +1,4 @@
-from enum import IntEnum, Enum
+from enum import IntEnum, IntFlag, Enum
 
 
 class ExtendedEnum(Enum):
@@ -71,3 +71,60 @@ class UserListViews(ExtendedEnum):
     CARD = "card"
     LIST = "list"
     BRICK = "brick"
+
+
+# https://github.com/ppy/osu-api/wiki#mods
+class Mods(IntFlag):
+    NONE = 0
+    NF = 1
+    EZ = 2
+    TD = 4
+    HD = 8
+    HR = 16
+    SD = 32
+    DT = 64
+    RX = 128
+    HT = 256
+    NC = 512
+    FL = 1024
+    AT = 2048
+    SO = 4096
+    AP = 8192
+    PF = 16384
+    K4 = 32768
+    K5 = 65536
+    K6 = 131072
+    K7 = 262144
+    K8 = 524288
+    FI = 1048576
+    RD = 2097152
+    CN = 4194304
+    TP = 8388608
+    K9 = 16777216
+    CO = 33554432
+    K1 = 67108864
+    K3 = 134217728
+    K2 = 268435456
+    V2 = 536870912
+    MR = 1073741824
+
+    @classmethod
+    def from_acronyms(cls, acronyms: list[str]) -> "Mods":
+        """
+        Returns the legacy mods bitmask of a list of mod acronyms.
+
+        NC and PF also set DT and SD, like the legacy api. Acronyms
+        without a legacy bit are ignored.
+        """
+        bits = cls.NONE
+        for acronym in acronyms:
+            bits |= _MOD_ACRONYMS.get(acronym.upper(), cls.NONE)
+        return bits
+
+
+_MOD_ACRONYMS = {
+    **{mod.name: mod for mod in Mods if mod.name and not mod.name.startswith("K")},
+    **{f"{mod.name[1]}K": mod for mod in Mods if mod.name and mod.name.startswith("K")},
+    "NC": Mods.NC | Mods.DT,
+    "PF": Mods.PF | Mods.SD,
+}
@@ -13,6 +13,7 @@ from .Enums import (
     RankingType,
     BeatmapsetDownload,
     BeatmapType,
+    Mods,
 )
 from .Extras import (
     GradeCounts,
@@ -10,3 +10,34 @@ def c_TypeError(param_name: str, correct: str, wrong: str) -> TypeError:
         TypeError(prebuilt message)
     """
     return TypeError(f"param:{param_name} must be type<{correct}> not type<{wrong}>")
+
+
+def chunked(items: list, size: int) -> list[list]:
+    """
+    Splits a list into consecutive chunks of at most size elements
+
+    parameters:
+        items: list - list to split
+        size: int - maximum chunk length
+    returns:
+        list of chunks, in order
+    """
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def request_key(data: dict) -> tuple:
+    """
+    Returns a hashable key for a request built by BaseOsuApi
+
+    parameters:
+        data: dict - request dictionary with method, url and params
+    returns:
+        tuple of the method, url and sorted params, headers are left out
+    """
+    params = tuple(
+        sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in data["params"].items()
+        )
+    )
+    return (data["method"], data["url"], params)
@@ -0,0 +1,154 @@
+import importlib.util
+import httpx
+import pytest
+import losuapi
+from losuapi.parsing import PARSE_MODES
+
+requires_msgspec = pytest.mark.skipif(
+    importlib.util.find_spec("msgspec") is None, reason="msgspec is not installed"
+)
+# every parse mode, msgspec is skipped when it is not installed
+parse_modes = [
+    pytest.param(mode, marks=requires_msgspec) if mode == "msgspec" else mode
+    for mode in PARSE_MODES
+]
+
+USER_COMPACT = {
+    "avatar_url": "https://a.ppy.sh/2",
+    "country_code": "AU",
+    "default_group": "default",
+    "id": 2,
+    "is_active": True,
+    "is_bot": False,
+    "is_deleted": False,
+    "is_online": False,
+    "is_supporter": True,
+    "last_visit": "2023-01-01T00:00:00Z",
+    "pm_friends_only": False,
+    "profile_colour": None,
+    "username": "peppy",
+}
+STATISTICS = {
+    "grade_counts": {"a": 1, "s": 2, "sh": 3, "ss": 4, "ssh": 5},
+    "hit_accuracy": 98.5,
+    "is_ranked": True,
+    "level": {"current": 100, "progress": 5},
+    "maximum_combo": 2000,
+    "play_count": 1000,
+    "play_time": 100000,
+    "pp": 12000.5,
+    "global_rank": 1,
+    "ranked_score": 10**9,
+    "replays_watched_by_others": 5,
+    "total_hits": 10**6,
+    "total_score": 10**10,
+}
+BEATMAP = {
+    "beatmapset_id": 1,
+    "difficulty_rating": 5.5,
+    "id": 75,
+    "mode": "osu",
+    "status": "ranked",
+    "total_length": 100,
+    "user_id": 2,
+    "version": "Hard",
+    "accuracy": 7,
+    "ar": 9,
+    "bpm": 180,
+    "convert": False,
+    "count_circles": 1,
+    "count_sliders": 2,
+    "count_spinners": 0,
+    "cs": 4,
+    "deleted_at": None,
+    "drain": 6,
+    "hit_length": 90,
+    "is_scoreable": True,
+    "last_updated": "2020-01-01T00:00:00Z",
+    "mode_int": 0,
+    "passcount": 5,
+    "playcount": 10,
+    "ranked": 1,
+    "url": "https://osu.ppy.sh/beatmaps/75",
+}
+
+
+def user(user_id: int = 2) -> dict:
+    return dict(
+        USER_COMPACT,
+        id=user_id,
+        cover_url="https://assets.ppy.sh/cover.jpg",
+        discord=None,
+        has_supported=True,
+        interests=None,
+        join_date="2007-08-28T03:09:12Z",
+        kudosu={"total": 1, "available": 1},
+        location=None,
+        max_blocks=50,
+        max_friends=250,
+        occupation=None,
+        playmode="osu",
+        playstyle=["mouse"],
+        post_count=1,
+        profile_order=["me"],
+        title=None,
+        title_url=None,
+        twitter=None,
+        website=None,
+        statistics=STATISTICS,
+        badges=[],
+        monthly_playcounts=[{"start_date": "2020-01-01", "count": 5}],
+        rank_history={"mode": "osu", "data": [1, 2, 3]},
+        favourite_beatmapset_count=3,
+    )
+
+
+TOKEN = {"token_type": "Bearer", "access_token": "test", "expires_in": 86400}
+
+
+class MockApi:
+    """
+    httpx.MockTransport answering token requests itself and every api request
+    with handler, counting the api requests.
+    """
+
+    def __init__(self, handler) -> None:
+        self.handler = handler
+        self.requests: list[httpx.Request] = []
+        self.token_requests: int = 0
+        self.transport = httpx.MockTransport(self._handle)
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/oauth/token":
+            self.token_requests += 1
+            return httpx.Response(200, json=TOKEN)
+        self.requests.append(request)
+        return self.handler(request)
+
+
+@pytest.fixture
+def mock_api():
+    """Returns a function building a MockApi from a request handler."""
+    return MockApi
+
+
+@pytest.fixture
+def sync_client():
+    clients = []
+
+    def build(mock: MockApi, **kwargs) -> losuapi.OsuApi:
+        client = losuapi.OsuApi(1, "secret", transport=mock.transport, **kwargs)
+        clients.append(client)
+        return client
+
+    yield build
+    for client in clients:
+        client.close()
+
+
+@pytest.fixture
+def async_client():
+    def build(mock: MockApi, **kwargs) -> losuapi.AsyncOsuApi:
+        return losuapi.AsyncOsuApi(1, "secret", transport=mock.transport, **kwargs)
+
+    return build
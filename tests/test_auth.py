@@ -0,0 +1,49 @@
+import asyncio
+import httpx
+from losuapi import TokenCache
+from conftest import user
+
+
+def ok(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=user())
+
+
+def test_no_token_is_requested_before_the_first_call(mock_api, sync_client):
+    mock = mock_api(ok)
+    api = sync_client(mock)
+    assert mock.token_requests == 0
+    api.user(2)
+    api.user(2)
+    assert mock.token_requests == 1
+    assert mock.requests[0].headers["Authorization"] == "Bearer test"
+
+
+def test_concurrent_async_callers_share_one_token_request(mock_api, async_client):
+    mock = mock_api(ok)
+    handle = mock.transport.handler
+
+    async def slow_token(request: httpx.Request) -> httpx.Response:
+        # lets every caller reach the auth check before the token arrives
+        if request.url.path == "/oauth/token":
+            await asyncio.sleep(0.01)
+        return handle(request)
+
+    mock.transport = httpx.MockTransport(slow_token)
+
+    async def main():
+        api = async_client(mock, coalesce=False)
+        await asyncio.gather(*(api.user(2) for _ in range(20)))
+        await api.aclose()
+
+    asyncio.run(main())
+    assert mock.token_requests == 1
+    assert len(mock.requests) == 20
+
+
+def test_token_cache_is_reused_by_new_clients(mock_api, sync_client, tmp_path):
+    mock = mock_api(ok)
+    cache = TokenCache(str(tmp_path / "tokens.json"))
+    sync_client(mock, token_cache=cache).user(2)
+    sync_client(mock, token_cache=cache).user(2)
+    assert mock.token_requests == 1
+    assert len(mock.requests) == 2
@@ -0,0 +1,90 @@
+import asyncio
+import httpx
+import pytest
+from conftest import user
+
+
+def test_batch_keeps_submission_order(mock_api, async_client):
+    async def reversed_latency(request):
+        # later users answer first, so calls complete out of order
+        user_id = int(request.url.path.split("/")[-2])
+        await asyncio.sleep((10 - user_id) / 1000)
+        return httpx.Response(200, json=user(user_id))
+
+    mock = mock_api(reversed_latency)
+
+    async def main():
+        api = async_client(mock)
+        calls = [("user", {"username": i}) for i in range(1, 10)]
+        completed = [item async for item in api.batch_as_completed(calls)]
+        results = await api.batch(calls)
+        await api.aclose()
+        return completed, results
+
+    completed, results = asyncio.run(main())
+    assert [item.index for item in completed] != list(range(9))
+    assert [item.index for item in results] == list(range(9))
+    assert [item.result.id for item in results] == list(range(1, 10))
+    assert all(item.error is None for item in results)
+
+
+def test_batch_reports_errors_per_item(mock_api, async_client):
+    mock = mock_api(lambda request: httpx.Response(200, json=user()))
+
+    async def main():
+        api = async_client(mock)
+        results = await api.batch(
+            [
+                ("user", {"username": 2}),
+                ("no_such_method", {}),
+                ("user", {"username": 2, "unknown": 1}),
+                ("user", {"username": 2.5}),
+            ]
+        )
+        await api.aclose()
+        return results
+
+    results = asyncio.run(main())
+    assert results[0].result.id == 2
+    assert isinstance(results[1].error, AttributeError)
+    assert isinstance(results[2].error, TypeError)
+    assert isinstance(results[3].error, TypeError)
+    assert [item.result for item in results[1:]] == [None, None, None]
+    assert results[1].call == ("no_such_method", {})
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_batch_bounds_calls_in_flight(mock_api, async_client, max_concurrency):
+    in_flight = peak = 0
+
+    async def counting(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.002)
+        in_flight -= 1
+        return httpx.Response(200, json=user())
+
+    mock = mock_api(counting)
+
+    async def main():
+        api = async_client(mock, coalesce=False)
+        results = await api.batch(
+            [("user", {"username": 2})] * 12, max_concurrency=max_concurrency
+        )
+        await api.aclose()
+        return results
+
+    results = asyncio.run(main())
+    assert len(results) == 12
+    assert peak == max_concurrency
+
+
+def test_batch_rejects_max_concurrency_below_one(mock_api, async_client):
+    async def main():
+        api = async_client(mock_api(lambda request: None))
+        with pytest.raises(ValueError):
+            await api.batch([("user", {"username": 2})], max_concurrency=0)
+        await api.aclose()
+
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+import asyncio
+import gzip
+import json
+import httpx
+import pytest
+import losuapi
+from losuapi import CassetteMissError, CassetteTransport
+from conftest import BEATMAP, MockApi, user
+
+
+def api_responses(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/beatmaps"):
+        ids = [int(i) for i in request.url.params.get_list("ids[]")]
+        beatmaps = [dict(BEATMAP, id=beatmap_id) for beatmap_id in ids]
+        return httpx.Response(200, json={"beatmaps": beatmaps})
+    return httpx.Response(200, json=user(int(request.url.path.split("/")[-2])))
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / "osu.jsonl.gz")
+
+
+def client(transport: CassetteTransport) -> losuapi.OsuApi:
+    return losuapi.OsuApi(1, "secret", transport=transport)
+
+
+def entries(path: str) -> list[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_recorded_responses_are_replayed(path):
+    mock = MockApi(api_responses)
+    api = client(CassetteTransport(path, mode="record", transport=mock.transport))
+    recorded = [api.user(2), api.user(3), api.beatmaps([1, 2])]
+    api.close()
+    assert len(mock.requests) == 3
+
+    cassette = CassetteTransport(path)
+    assert len(cassette) == 3
+    api = client(cassette)
+    assert api.user(2) == recorded[0]
+    assert api.user(3) == recorded[1]
+    assert api.beatmaps([1, 2]) == recorded[2]
+    api.close()
+
+
+def test_token_requests_are_never_recorded(path):
+    mock = MockApi(api_responses)
+    api = client(CassetteTransport(path, mode="record", transport=mock.transport))
+    api.user(2)
+    api.close()
+    assert mock.token_requests == 1
+    assert [entry["url"] for entry in entries(path)] == [
+        "https://osu.ppy.sh/api/v2/users/2/"
+    ]
+    assert all("access_token" not in entry["body"] for entry in entries(path))
+
+
+def test_id_lists_are_keyed_on_every_id_in_order(path):
+    mock = MockApi(api_responses)
+    api = client(CassetteTransport(path, mode="record", transport=mock.transport))
+    api.beatmaps([1])
+    api.beatmaps([1, 2])
+    api.close()
+    assert [entry["params"] for entry in entries(path)] == [
+        [["ids[]", ["1"]]],
+        [["ids[]", ["1", "2"]]],
+    ]
+
+    api = client(CassetteTransport(path))
+    assert [beatmap.id for beatmap in api.beatmaps([1]).beatmaps] == [1]
+    assert [beatmap.id for beatmap in api.beatmaps([1, 2]).beatmaps] == [1, 2]
+    with pytest.raises(CassetteMissError) as error:
+        api.beatmaps([2, 1])
+    assert error.value.key[2] == (("ids[]", ("2", "1")),)
+    api.close()
+
+
+def test_repeated_requests_replay_in_recording_order(path):
+    answers = iter([4, 5, 6])
+    mock = MockApi(lambda request: httpx.Response(200, json=user(next(answers))))
+    api = client(CassetteTransport(path, mode="record", transport=mock.transport))
+    for _ in range(3):
+        api.user(2)
+    api.close()
+
+    api = client(CassetteTransport(path))
+    # the last recorded response is repeated once they run out
+    assert [api.user(2).id for _ in range(4)] == [4, 5, 6, 6]
+    api.close()
+
+
+def test_unrecorded_request_raises(path):
+    mock = MockApi(api_responses)
+    api = client(CassetteTransport(path, mode="record", transport=mock.transport))
+    api.user(2)
+    api.close()
+
+    api = client(CassetteTransport(path))
+    with pytest.raises(CassetteMissError):
+        api.user(3)
+    with pytest.raises(CassetteMissError):
+        api.user(2, mode="osu")
+    api.close()
+
+
+def test_async_record_and_replay(path):
+    mock = MockApi(api_responses)
+
+    async def run(cassette: CassetteTransport) -> list[int]:
+        api = losuapi.AsyncOsuApi(1, "secret", transport=cassette)
+        users = await asyncio.gather(api.user(2), api.user(3))
+        await api.aclose()
+        return [item.id for item in users]
+
+    recorder = CassetteTransport(path, mode="record", async_transport=mock.transport)
+    assert asyncio.run(run(recorder)) == [2, 3]
+    assert asyncio.run(run(CassetteTransport(path))) == [2, 3]
+    assert len(mock.requests) == 2
@@ -0,0 +1,83 @@
+import asyncio
+import httpx
+import pytest
+from losuapi.types import Beatmaps, Users
+from conftest import BEATMAP, USER_COMPACT, requires_msgspec
+
+
+def shuffled_beatmaps(request: httpx.Request) -> httpx.Response:
+    # the api returns the items of a chunk in its own order
+    ids = request.url.params.get_list("ids[]")
+    return httpx.Response(
+        200, json={"beatmaps": [dict(BEATMAP, id=int(i)) for i in reversed(ids)]}
+    )
+
+
+def users(request: httpx.Request) -> httpx.Response:
+    ids = request.url.params.get_list("ids[]")
+    return httpx.Response(
+        200, json={"users": [dict(USER_COMPACT, id=int(i)) for i in ids]}
+    )
+
+
+def test_chunks_are_merged_in_id_order(mock_api, sync_client):
+    mock = mock_api(shuffled_beatmaps)
+    api = sync_client(mock)
+    ids = list(range(120, 0, -1)) + [5, 7]
+    result = api.beatmaps(ids)
+    assert isinstance(result, Beatmaps)
+    assert [beatmap.id for beatmap in result.beatmaps] == list(range(120, 0, -1))
+    assert [len(r.url.params.get_list("ids[]")) for r in mock.requests] == [50, 50, 20]
+
+
+def test_async_chunks_are_merged_in_id_order(mock_api, async_client):
+    mock = mock_api(shuffled_beatmaps)
+
+    async def main():
+        api = async_client(mock)
+        result = await api.beatmaps(list(range(1, 131)), max_concurrency=2)
+        await api.aclose()
+        return result
+
+    result = asyncio.run(main())
+    assert [beatmap.id for beatmap in result.beatmaps] == list(range(1, 131))
+    assert len(mock.requests) == 3
+
+
+def test_failed_chunk_returns_none(mock_api, sync_client):
+    def second_chunk_fails(request):
+        if request.url.params.get_list("ids[]")[0] == "51":
+            return httpx.Response(500, json={"error": None})
+        return users(request)
+
+    api = sync_client(mock_api(second_chunk_fails))
+    assert api.users(list(range(1, 101))) is None
+
+
+@requires_msgspec
+@pytest.mark.parametrize("Type", [Beatmaps, Users])
+def test_msgspec_mode_returns_structs(mock_api, sync_client, async_client, Type):
+    import msgspec
+
+    handler, method, name = (
+        (shuffled_beatmaps, "beatmaps", "beatmaps")
+        if Type is Beatmaps
+        else (users, "users", "users")
+    )
+    mock = mock_api(handler)
+    ids = list(range(1, 61))
+
+    async def fetch_async():
+        api = async_client(mock, parse_mode="msgspec")
+        result = await getattr(api, method)(ids)
+        await api.aclose()
+        return result
+
+    for result in (
+        getattr(sync_client(mock, parse_mode="msgspec"), method)(ids),
+        asyncio.run(fetch_async()),
+    ):
+        assert isinstance(result, msgspec.Struct)
+        assert type(result).__name__ == Type.__name__
+        assert [item.id for item in getattr(result, name)] == ids
+        assert all(isinstance(item, msgspec.Struct) for item in getattr(result, name))
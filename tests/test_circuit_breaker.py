@@ -0,0 +1,79 @@
+import httpx
+import pytest
+from losuapi import CircuitBreaker, CircuitOpenError, Retry
+from conftest import user
+
+
+def expire(breaker: CircuitBreaker) -> None:
+    """Moves the opening of a breaker past its reset_timeout."""
+    breaker.opened_at -= breaker.reset_timeout + 1
+
+
+def test_opens_at_the_threshold_and_fails_fast():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.check()
+    assert error.value.retry_in == pytest.approx(30)
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_trial_closes_or_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    expire(breaker)
+    breaker.check()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    expire(breaker)
+    breaker.check()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.check()
+
+
+def test_open_circuit_stops_requests(mock_api, sync_client):
+    mock = mock_api(lambda request: httpx.Response(503, json={"error": None}))
+    api = sync_client(mock, circuit_breaker=CircuitBreaker(failure_threshold=2))
+    assert api.user(2) is None
+    assert api.user(2) is None
+    with pytest.raises(CircuitOpenError):
+        api.user(2)
+    assert len(mock.requests) == 2
+
+
+def test_retry_sends_again_after_5xx(mock_api, sync_client):
+    statuses = iter([503, 502, 200])
+
+    def flaky(request):
+        status = next(statuses)
+        if status != 200:
+            return httpx.Response(status, json={"error": None})
+        return httpx.Response(200, json=user())
+
+    mock = mock_api(flaky)
+    api = sync_client(mock, retry=Retry(attempts=3, backoff=0))
+    assert api.user(2).id == 2
+    assert len(mock.requests) == 3
+
+
+def test_retry_gives_up_after_its_attempts(mock_api, sync_client):
+    mock = mock_api(lambda request: httpx.Response(500, json={"error": None}))
+    api = sync_client(mock, retry=Retry(attempts=2, backoff=0))
+    assert api.user(2) is None
+    assert len(mock.requests) == 2
@@ -0,0 +1,87 @@
+import asyncio
+import httpx
+from losuapi.types import User
+from conftest import user
+
+
+def slow_user(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=user(int(request.url.path.split("/")[4])))
+
+
+def test_identical_requests_share_one_http_call(mock_api, async_client):
+    mock = mock_api(slow_user)
+
+    async def main():
+        api = async_client(mock)
+        results = await asyncio.gather(*(api.user(2) for _ in range(5)))
+        await api.aclose()
+        return results
+
+    results = asyncio.run(main())
+    assert len(mock.requests) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_different_fields_are_not_shared(mock_api, async_client):
+    mock = mock_api(slow_user)
+
+    async def main():
+        api = async_client(mock)
+        results = await asyncio.gather(api.user(2, fields=["id"]), api.user(2))
+        await api.aclose()
+        return results
+
+    projected, full = asyncio.run(main())
+    assert len(mock.requests) == 2
+    assert not isinstance(projected, User)
+    assert projected.id == 2
+    assert isinstance(full, User)
+    assert full.username == "peppy"
+    assert full.statistics.global_rank == 1
+
+
+def test_coalesce_off_sends_every_request(mock_api, async_client):
+    mock = mock_api(slow_user)
+
+    async def main():
+        api = async_client(mock, coalesce=False)
+        await asyncio.gather(*(api.user(2) for _ in range(3)))
+        await api.aclose()
+
+    asyncio.run(main())
+    assert len(mock.requests) == 3
+
+
+def test_failure_reaches_every_joined_caller(mock_api, async_client):
+    mock = mock_api(lambda request: httpx.Response(200, content=b"not json"))
+
+    async def main():
+        api = async_client(mock)
+        results = await asyncio.gather(
+            *(api.user(2) for _ in range(3)), return_exceptions=True
+        )
+        await api.aclose()
+        return results
+
+    results = asyncio.run(main())
+    assert len(mock.requests) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_request(mock_api, async_client):
+    mock = mock_api(slow_user)
+
+    async def main():
+        api = async_client(mock)
+        first = asyncio.ensure_future(api.user(2))
+        second = asyncio.ensure_future(api.user(2))
+        await asyncio.sleep(0)
+        first.cancel()
+        result = await second
+        await api.aclose()
+        return first, result
+
+    first, result = asyncio.run(main())
+    assert first.cancelled()
+    assert result.id == 2
+    assert len(mock.requests) == 1
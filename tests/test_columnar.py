@@ -0,0 +1,161 @@
+import importlib.util
+import json
+import math
+import pytest
+from losuapi.columnar import RANKING_COLUMNS, SCORE_COLUMNS, to_arrow, to_numpy
+from losuapi.parsing import decode_struct, parse
+from losuapi.types import BeatmapScores, Mods, Rankings, Score, Scores
+from conftest import BEATMAP, STATISTICS, parse_modes
+
+requires_numpy = pytest.mark.skipif(
+    importlib.util.find_spec("numpy") is None, reason="numpy is not installed"
+)
+requires_pyarrow = pytest.mark.skipif(
+    importlib.util.find_spec("pyarrow") is None, reason="pyarrow is not installed"
+)
+
+SCORE_NAMES = [column[0] for column in SCORE_COLUMNS]
+RANKING_NAMES = [column[0] for column in RANKING_COLUMNS]
+
+
+def score(score_id: int = 1, mods: tuple | list = (), **fields) -> dict:
+    return {
+        "id": score_id,
+        "best_id": score_id,
+        "user_id": 2,
+        "accuracy": 0.99,
+        "mods": list(mods),
+        "score": 10**6,
+        "max_combo": 500,
+        "perfect": False,
+        "statistics": {
+            "count_300": 300,
+            "count_100": 10,
+            "count_50": 5,
+            "count_geki": 40,
+            "count_katu": 4,
+            "count_miss": 1,
+        },
+        "passed": True,
+        "pp": 250.5,
+        "rank": "A",
+        "created_at": "2020-01-01T00:00:00Z",
+        "mode": "osu",
+        "mode_int": 0,
+        "replay": False,
+        "beatmap": dict(BEATMAP, id=75 + score_id),
+        **fields,
+    }
+
+
+def build(Type, payload, parse_mode: str):
+    """Builds Type like the clients do, msgspec Structs are decoded from bytes."""
+    if parse_mode == "msgspec":
+        return decode_struct(Type, json.dumps(payload).encode())
+    return parse(Type, payload, parse_mode)
+
+
+def rankings(*statistics: dict) -> dict:
+    return {"cursor": {"page": 2}, "ranking": list(statistics), "total": 10}
+
+
+@requires_numpy
+@pytest.mark.parametrize("parse_mode", parse_modes)
+def test_scores_to_numpy(parse_mode):
+    import numpy as np
+
+    scores = build(list[Score], [score(1, ["HD"]), score(2)], parse_mode)
+    array = to_numpy(scores)
+    assert list(array.dtype.names) == SCORE_NAMES
+    assert array["id"].tolist() == [1, 2]
+    assert array["beatmap_id"].tolist() == [76, 77]
+    assert array["pp"].tolist() == [250.5, 250.5]
+    assert array["mods"].tolist() == [int(Mods.HD), 0]
+    assert array["count_miss"].tolist() == [1, 1]
+    assert array["created_at"][0] == np.datetime64("2020-01-01T00:00:00", "ms")
+
+
+@requires_numpy
+@pytest.mark.parametrize(
+    "mods,bits",
+    [
+        (["NC"], Mods.NC | Mods.DT),
+        (["PF"], Mods.PF | Mods.SD),
+        (["HD", "DT"], Mods.HD | Mods.DT),
+        (["4K", "fl"], Mods.K4 | Mods.FL),
+        # lazer only mods have no legacy bit
+        (["CL"], Mods.NONE),
+        ([], Mods.NONE),
+    ],
+)
+def test_mods_are_a_legacy_bitmask(mods, bits):
+    array = to_numpy(parse(list[Score], [score(mods=mods)]))
+    assert array["mods"][0] == int(bits)
+
+
+@requires_numpy
+def test_missing_values_of_constructed_models():
+    # the api sends null pp for unranked scores, only construct keeps them
+    scores = parse(list[Score], [score(pp=None, beatmap=None)], "construct")
+    array = to_numpy(scores)
+    assert math.isnan(array["pp"][0])
+    assert array["beatmap_id"][0] == -1
+
+    ranking = parse(Rankings, rankings(dict(STATISTICS, global_rank=None)))
+    assert to_numpy(ranking)["global_rank"][0] == -1
+
+
+@requires_numpy
+@pytest.mark.parametrize("parse_mode", parse_modes)
+def test_collections_are_unwrapped(parse_mode):
+    payload = {"scores": [score(1), score(2)]}
+    for Type in (Scores, BeatmapScores):
+        array = to_numpy(build(Type, payload, parse_mode))
+        assert array["id"].tolist() == [1, 2]
+
+    ranking = build(Rankings, rankings(STATISTICS, STATISTICS), parse_mode)
+    for obj in (ranking, ranking.ranking):
+        array = to_numpy(obj)
+        assert list(array.dtype.names) == RANKING_NAMES
+        assert array["global_rank"].tolist() == [1, 1]
+        assert array["level"].tolist() == [100, 100]
+        assert array["grade_ssh"].tolist() == [5, 5]
+
+
+@requires_numpy
+def test_empty_input():
+    for obj in ([], Scores(scores=[])):
+        array = to_numpy(obj)
+        assert len(array) == 0
+        assert list(array.dtype.names) == SCORE_NAMES
+
+
+@requires_numpy
+def test_other_types_are_rejected():
+    with pytest.raises(TypeError):
+        to_numpy({"scores": None})
+
+
+@requires_pyarrow
+@pytest.mark.parametrize("parse_mode", parse_modes)
+def test_scores_to_arrow(parse_mode):
+    import pyarrow as pa
+
+    scores = build(list[Score], [score(1, ["NC"]), score(2)], parse_mode)
+    table = to_arrow(scores)
+    assert table.column_names == SCORE_NAMES
+    assert table.schema.field("created_at").type == pa.timestamp("ms", tz="UTC")
+    assert table.schema.field("mods").type == pa.uint32()
+    assert table.column("mods").to_pylist() == [int(Mods.NC | Mods.DT), 0]
+    assert table.column("beatmap_id").to_pylist() == [76, 77]
+
+
+@requires_pyarrow
+def test_rankings_and_empty_input_to_arrow():
+    table = to_arrow(parse(Rankings, rankings(STATISTICS), "construct"))
+    assert table.column_names == RANKING_NAMES
+    assert table.column("pp").to_pylist() == [12000.5]
+
+    table = to_arrow(BeatmapScores(scores=[], userScore=None))
+    assert table.num_rows == 0
+    assert table.column_names == SCORE_NAMES
@@ -0,0 +1,290 @@
+import time
+import pytest
+from losuapi.BaseOsuApi import BaseOsuApi
+from losuapi.endpoints import ENDPOINTS
+from losuapi.types import BeatmapType, GameMode, GameModeInt, RankingType, ScoreTypes
+
+# (method, kwargs, http method, url path, query params) of the hand-written
+# builders the endpoint table replaced
+BUILDS = [
+    (
+        "lookup_beatmap",
+        {"beatmap_id": 75, "checksum": "a5b9", "filename": "map.osu"},
+        "GET",
+        "/beatmaps/lookup",
+        {"id": 75, "checksum": "a5b9", "filename": "map.osu"},
+    ),
+    (
+        "user_beatmap_score",
+        {"beatmap_id": 75, "user_id": 2, "mode": GameMode.TAIKO, "mods": "HD"},
+        "GET",
+        "/beatmaps/75/scores/users/2",
+        {"mode": "taiko", "mods": "HD"},
+    ),
+    (
+        "user_beatmap_scores",
+        {"beatmap_id": 75, "user_id": 2, "mode": "osu"},
+        "GET",
+        "/beatmaps/75/scores/users/2/all",
+        {"mode": "osu"},
+    ),
+    # type was validated but never sent by the hand-written builder
+    (
+        "beatmap_scores",
+        {"beatmap_id": 75, "mode": "osu", "mods": "HD", "Type": "country"},
+        "GET",
+        "/beatmaps/75/scores",
+        {"mode": "osu", "mods": "HD", "type": "country"},
+    ),
+    ("beatmaps", {"beatmap_ids": [1, 2]}, "GET", "/beatmaps", {"ids[]": [1, 2]}),
+    ("beatmap", {"beatmap_id": 75}, "GET", "/beatmaps/75", {}),
+    (
+        "beatmap_attributes",
+        {
+            "beatmap_id": 75,
+            "mods": ["HD", 64],
+            "ruleset": GameMode.MANIA,
+            "ruleset_id": GameModeInt.MANIA,
+        },
+        "POST",
+        "/beatmaps/75/attributes",
+        {"mods": ["HD", 64], "ruleset": "mania", "ruleset_id": 3},
+    ),
+    (
+        "user_kudosu",
+        {"user_id": 2, "limit": 10, "offset": "5"},
+        "GET",
+        "/users/2/kudosu",
+        {"limit": 10, "offset": "5"},
+    ),
+    ("user_scores", {"user_id": 2, "Type": "best"}, "GET", "/users/2/scores/best", {}),
+    (
+        "user_scores",
+        {
+            "user_id": 2,
+            "Type": ScoreTypes.RECENT,
+            "include_fails": True,
+            "mode": "fruits",
+            "limit": 5,
+            "offset": 10,
+        },
+        "GET",
+        "/users/2/scores/recent",
+        {"include_fails": 1, "mode": "fruits", "limit": 5, "offset": 10},
+    ),
+    (
+        "user_beatmaps",
+        {"user_id": 2, "Type": BeatmapType.MOST_PLAYED, "limit": 5, "offset": 5},
+        "GET",
+        "/users/2/beatmapsets/most_played",
+        {"limit": 5, "offset": 5},
+    ),
+    (
+        "user_recent_activity",
+        {"user_id": 2, "limit": 0, "offset": "3"},
+        "GET",
+        "/users/2/recent_activity",
+        {"offset": "3"},
+    ),
+    ("user", {"username": 2}, "GET", "/users/2/", {}),
+    (
+        "user",
+        {"username": "peppy", "mode": GameMode.MANIA, "key": "username"},
+        "GET",
+        "/users/peppy/mania",
+        {"key": "username"},
+    ),
+    ("users", {"user_ids": [2, 3]}, "GET", "/users", {"ids[]": [2, 3]}),
+    (
+        "ranking",
+        {"mode": "osu", "Type": RankingType.SCORE},
+        "GET",
+        "/rankings/osu/score",
+        {"filter": "all"},
+    ),
+    (
+        "ranking",
+        {
+            "mode": GameMode.MANIA,
+            "Type": "performance",
+            "Filter": "friends",
+            "country": 36,
+            "cursor": 2,
+            "variant": "4k",
+        },
+        "GET",
+        "/rankings/mania/performance",
+        {"filter": "friends", "country": 36, "cursor[page]": 2, "variant": "4k"},
+    ),
+    (
+        "ranking",
+        {"mode": "osu", "Type": "charts", "spotlight_id": 5},
+        "GET",
+        "/rankings/osu/charts",
+        {"filter": "all", "spotlight": 5},
+    ),
+    ("spotlights", {}, "GET", "/spotlights", {}),
+]
+
+# (method, kwargs, exception, message)
+ERRORS = [
+    (
+        "lookup_beatmap",
+        {"beatmap_id": "75"},
+        TypeError,
+        "param:beatmap_id must be type<int> not type<str>",
+    ),
+    (
+        "user_beatmap_score",
+        {"beatmap_id": 75, "user_id": "2"},
+        TypeError,
+        "param:user_id must be type<int>",
+    ),
+    (
+        "user_beatmap_score",
+        {"beatmap_id": 75, "user_id": 2, "mode": 1},
+        TypeError,
+        "param:mode must be type<GameMode|str> not type<int>",
+    ),
+    (
+        "beatmap_scores",
+        {"beatmap_id": 75, "Type": 1},
+        TypeError,
+        "param:Type must be type<str>",
+    ),
+    (
+        "beatmaps",
+        {"beatmap_ids": (1, 2)},
+        TypeError,
+        "param:beatmap_ids must be type<list> not type<tuple>",
+    ),
+    # every element is checked, the hand-written builder only checked the first
+    (
+        "beatmaps",
+        {"beatmap_ids": [1, "2"]},
+        TypeError,
+        "param:beatmap_ids[elements] must be type<int> not type<str>",
+    ),
+    (
+        "users",
+        {"user_ids": [2, None]},
+        TypeError,
+        "param:user_ids[elements] must be type<int> not type<NoneType>",
+    ),
+    (
+        "beatmap_attributes",
+        {"beatmap_id": 75, "mods": [1.5]},
+        TypeError,
+        "param:mods[elements] must be type<str|int> not type<float>",
+    ),
+    (
+        "user_kudosu",
+        {"user_id": 2, "offset": 5},
+        TypeError,
+        "param:offset must be type<str> not type<int>",
+    ),
+    (
+        "user_scores",
+        {"user_id": 2, "Type": "worst"},
+        ValueError,
+        "param<Type> must be one of 'best', 'firsts', 'recent'",
+    ),
+    (
+        "user_scores",
+        {"user_id": 2, "Type": "best", "include_fails": True},
+        ValueError,
+        "param<Type> must be 'recent' in order to set include_fails",
+    ),
+    (
+        "user_scores",
+        {"user_id": 2, "Type": "best", "offset": "5"},
+        TypeError,
+        "param:offset must be type<int> not type<str>",
+    ),
+    (
+        "user_beatmaps",
+        {"user_id": 2, "Type": 1},
+        TypeError,
+        "param:Type must be type<BeatmapType|str>",
+    ),
+    ("user", {"username": "  "}, ValueError, "param<username> cannot be blank"),
+    ("user", {"username": 2.5}, TypeError, "param:username must be type<int|str>"),
+    (
+        "user",
+        {"username": 2, "key": "name"},
+        ValueError,
+        "param<key> must be one of 'id', 'username'",
+    ),
+    (
+        "ranking",
+        {"mode": "osu", "Type": "performance", "Filter": "none"},
+        ValueError,
+        "param<Filter> must be one of 'all', 'friends'",
+    ),
+    (
+        "ranking",
+        {"mode": "osu", "Type": "performance", "cursor": -1},
+        ValueError,
+        "param<cursor> must be greater that -1",
+    ),
+    (
+        "ranking",
+        {"mode": "osu", "Type": "score", "country": 36},
+        ValueError,
+        "param<Type> must be 'performance' in order to set a country code.",
+    ),
+    (
+        "ranking",
+        {"mode": "osu", "Type": "performance", "spotlight_id": 5},
+        ValueError,
+        "param<Type> must be 'charts' in order to set a spotlight_id.",
+    ),
+    (
+        "ranking",
+        {"mode": "mania", "Type": "score", "variant": "4k"},
+        ValueError,
+        "param<Type> must be 'performance' to use variant",
+    ),
+    (
+        "ranking",
+        {"mode": "osu", "Type": "performance", "variant": "4k"},
+        ValueError,
+        "param<mode> must be 'mania' to use variant",
+    ),
+    (
+        "ranking",
+        {"mode": "mania", "Type": "performance", "variant": "5k"},
+        ValueError,
+        "param<variant> must be one of '4k', '7k'",
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def api() -> BaseOsuApi:
+    api = BaseOsuApi(1, "secret")
+    api.authorization = "Bearer test"
+    api.expired_time = time.time() + 10**6
+    return api
+
+
+def test_every_endpoint_is_covered():
+    names = {endpoint.name for endpoint in ENDPOINTS}
+    assert names == {build[0] for build in BUILDS}
+    assert {error[0] for error in ERRORS} <= names
+
+
+@pytest.mark.parametrize("name,kwargs,method,path,params", BUILDS)
+def test_builder(api, name, kwargs, method, path, params):
+    data = getattr(api, name)(**kwargs)
+    assert data["method"] == method
+    assert data["url"] == api.BASE_URL + path
+    assert data["params"] == params
+    assert data["headers"]["Authorization"] == "Bearer test"
+
+
+@pytest.mark.parametrize("name,kwargs,exception,message", ERRORS)
+def test_builder_errors(api, name, kwargs, exception, message):
+    with pytest.raises(exception) as error:
+        getattr(api, name)(**kwargs)
+    assert str(error.value).startswith(message)
@@ -0,0 +1,34 @@
+import httpx
+import pytest
+from conftest import parse_modes, user
+
+
+def unauthorized(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(401, json={"authentication": "basic"})
+
+
+def not_found(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(404, json={"error": None})
+
+
+@pytest.mark.parametrize("parse_mode", parse_modes)
+def test_error_body_of_all_optional_model_returns_none(
+    mock_api, sync_client, parse_mode
+):
+    api = sync_client(mock_api(unauthorized), parse_mode=parse_mode)
+    assert api.ranking("osu", "performance") is None
+
+
+@pytest.mark.parametrize("parse_mode", parse_modes)
+def test_error_body_of_projection_returns_none(mock_api, sync_client, parse_mode):
+    api = sync_client(mock_api(not_found), parse_mode=parse_mode)
+    assert api.user(2, fields=["id", "statistics"]) is None
+
+
+@pytest.mark.parametrize("parse_mode", parse_modes)
+def test_success_is_parsed(mock_api, sync_client, parse_mode):
+    api = sync_client(
+        mock_api(lambda request: httpx.Response(200, json=user())),
+        parse_mode=parse_mode,
+    )
+    assert api.user(2).username == "peppy"
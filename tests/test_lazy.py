@@ -0,0 +1,86 @@
+import httpx
+import pytest
+from pydantic import ValidationError, parse_obj_as
+from losuapi.parsing import LazyModel, parse_lazy
+from losuapi.types import Beatmap, User
+from conftest import BEATMAP, user
+
+
+def test_unread_fields_are_never_validated():
+    lazy = parse_lazy(User, dict(user(), join_date="not a date", playstyle=5))
+    assert lazy.username == "peppy"
+    assert lazy.id == 2
+    with pytest.raises(ValidationError):
+        lazy.join_date
+
+
+def test_fields_are_validated_once():
+    lazy = parse_lazy(User, user())
+    assert lazy.join_date is lazy.join_date
+    assert lazy.join_date.year == 2007
+
+
+def test_nested_models_and_lists_become_lazy_models():
+    lazy = parse_lazy(User, user())
+    assert isinstance(lazy.statistics, LazyModel)
+    assert lazy.statistics.model.__name__ == "UserStatistics"
+    assert lazy.statistics.grade_counts.ssh == 5
+    assert [type(item) for item in lazy.monthly_playcounts] == [LazyModel]
+    assert lazy.monthly_playcounts[0].count == 5
+    # fields holding other types are validated as usual
+    assert lazy.playstyle == ["mouse"]
+    assert lazy.badges == []
+
+
+def test_lists_of_responses_become_lists_of_lazy_models():
+    lazy = parse_lazy(list[Beatmap], [BEATMAP, dict(BEATMAP, id=76)])
+    assert [type(item) for item in lazy] == [LazyModel, LazyModel]
+    assert [beatmap.id for beatmap in lazy] == [75, 76]
+
+
+def test_aliased_fields_are_read_by_their_alias():
+    lazy = parse_lazy(User, dict(user(), profile_colour="#ff66aa"))
+    assert lazy.profile_color == "#ff66aa"
+    assert lazy.favorite_beatmapset_count == 3
+    with pytest.raises(AttributeError):
+        lazy.profile_colour
+
+
+def test_missing_fields():
+    payload = user()
+    del payload["username"]
+    lazy = parse_lazy(User, payload)
+    assert lazy.id == 2
+    with pytest.raises(ValidationError) as error:
+        lazy.username
+    assert error.value.errors()[0]["loc"] == ("username",)
+    # optional fields fall back to their default
+    assert lazy.groups is None
+
+
+def test_lazy_models_are_read_only():
+    lazy = parse_lazy(User, user())
+    with pytest.raises(TypeError):
+        lazy.username = "someone"
+    with pytest.raises(AttributeError):
+        lazy.no_such_field
+
+
+def test_materialize_equals_validation():
+    payload = user()
+    lazy = parse_lazy(User, payload)
+    # fields read beforehand make no difference
+    assert lazy.statistics.pp == 12000
+    assert lazy.materialize() == parse_obj_as(User, payload)
+    assert lazy.dict() == parse_obj_as(User, payload).dict()
+    with pytest.raises(ValidationError):
+        parse_lazy(User, dict(payload, join_date="not a date")).materialize()
+
+
+def test_client_lazy_parse_mode(mock_api, sync_client):
+    mock = mock_api(lambda request: httpx.Response(200, json=user()))
+    api = sync_client(mock, parse_mode="lazy")
+    result = api.user(2)
+    assert isinstance(result, LazyModel)
+    assert result.model is User
+    assert result.statistics.global_rank == 1
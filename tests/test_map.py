@@ -0,0 +1,96 @@
+import time
+import httpx
+import pytest
+from conftest import user
+
+
+def user_id(request: httpx.Request) -> int:
+    return int(request.url.path.split("/")[-2])
+
+
+def ok(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=user(user_id(request)))
+
+
+def test_map_yields_results_in_order(mock_api, sync_client):
+    def reversed_latency(request):
+        # later users answer first, so calls complete out of order
+        time.sleep((10 - user_id(request)) / 1000)
+        return ok(request)
+
+    api = sync_client(mock_api(reversed_latency))
+    calls = [{"username": i} for i in range(1, 10)]
+    results = list(api.map("user", calls, max_workers=4))
+    assert [item.index for item in results] == list(range(9))
+    assert [item.result.id for item in results] == list(range(1, 10))
+    assert [item.call for item in results] == [("user", call) for call in calls]
+    assert all(item.error is None for item in results)
+
+
+def test_map_reports_errors_per_item(mock_api, sync_client):
+    def missing_user_3(request):
+        if user_id(request) == 3:
+            return httpx.Response(404, json={"error": None})
+        return ok(request)
+
+    api = sync_client(mock_api(missing_user_3))
+    calls = [{"username": 2}, {"username": 2.5}, {"username": 3}, {"user": 2}]
+    results = list(api.map("user", calls, max_workers=2))
+    assert results[0].result.id == 2
+    assert isinstance(results[1].error, TypeError)
+    # an error response is a None result, like a direct call
+    assert results[2].result is None and results[2].error is None
+    assert isinstance(results[3].error, TypeError)
+
+
+def test_map_rejects_max_workers_below_one(mock_api, sync_client):
+    api = sync_client(mock_api(ok))
+    with pytest.raises(ValueError):
+        next(api.map("user", [{"username": 2}], max_workers=0))
+
+
+def test_stopping_early_cancels_queued_calls(mock_api, sync_client):
+    read = 0
+
+    def calls():
+        nonlocal read
+        for _ in range(100):
+            read += 1
+            yield {"username": 2}
+
+    def slow(request):
+        time.sleep(0.01)
+        return ok(request)
+
+    mock = mock_api(slow)
+    api = sync_client(mock)
+    results = api.map("user", calls(), max_workers=1)
+    assert next(results).result.id == 2
+    results.close()
+    # calls are read lazily, the one running finishes and the queued one
+    # never runs
+    assert read == 3
+    time.sleep(0.05)
+    assert len(mock.requests) == 2
+
+
+def test_workers_share_one_refresh_of_an_expired_token(mock_api, sync_client):
+    mock = mock_api(ok)
+    handle = mock.transport.handler
+
+    def slow_token(request: httpx.Request) -> httpx.Response:
+        # lets every worker reach the auth check before the token arrives
+        if request.url.path == "/oauth/token":
+            time.sleep(0.05)
+        return handle(request)
+
+    mock.transport = httpx.MockTransport(slow_token)
+    api = sync_client(mock)
+    api.authorization = "Bearer expired"
+    api.expired_time = time.time() - 1
+    results = list(api.map("user", [{"username": 2}] * 16, max_workers=8))
+    assert all(item.result.id == 2 for item in results)
+    assert mock.token_requests == 1
+    assert {request.headers["Authorization"] for request in mock.requests} == {
+        "Bearer test"
+    }
@@ -0,0 +1,68 @@
+import asyncio
+import httpx
+import pytest
+from losuapi import CircuitBreaker, CircuitOpenError, Metrics
+from conftest import user
+
+
+def timeout(request: httpx.Request) -> httpx.Response:
+    raise httpx.ConnectTimeout("timed out", request=request)
+
+
+def test_success_is_recorded(mock_api, sync_client):
+    records = []
+    metrics = Metrics(exporters=[records.append])
+    api = sync_client(
+        mock_api(lambda request: httpx.Response(200, json=user())), metrics=metrics
+    )
+    api.user(2)
+    api.user(2)
+    assert metrics.counter("user", "calls") == 2
+    assert metrics.counter("user", "status_200") == 2
+    assert metrics.histogram("user", "validate").count == 2
+    assert [record.error for record in records] == [None, None]
+
+
+def test_failed_calls_are_recorded(mock_api, sync_client):
+    records = []
+    metrics = Metrics(exporters=[records.append])
+    api = sync_client(
+        mock_api(timeout),
+        metrics=metrics,
+        circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60),
+    )
+    with pytest.raises(httpx.ConnectTimeout):
+        api.user(2)
+    with pytest.raises(CircuitOpenError):
+        api.user(2)
+
+    assert [(r.status, r.error) for r in records] == [
+        (None, "ConnectTimeout"),
+        (None, "CircuitOpenError"),
+    ]
+    assert metrics.counter("user", "calls") == 2
+    assert metrics.counter("user", "errors") == 2
+    assert metrics.counter("user", "error_ConnectTimeout") == 1
+    assert metrics.histogram("user", "total").count == 2
+
+
+def test_async_failed_calls_are_recorded(mock_api, async_client):
+    records = []
+    metrics = Metrics(exporters=[records.append])
+
+    async def main(coalesce):
+        api = async_client(mock_api(timeout), metrics=metrics, coalesce=coalesce)
+        results = await asyncio.gather(api.user(2), api.user(2), return_exceptions=True)
+        await api.aclose()
+        return results
+
+    for coalesce in (True, False):
+        results = asyncio.run(main(coalesce))
+        assert all(isinstance(r, httpx.ConnectTimeout) for r in results)
+    # the second coalesced caller joins the first request
+    assert sorted((r.cache, r.error) for r in records) == [
+        ("miss", "ConnectTimeout"),
+        ("miss", "ConnectTimeout"),
+        ("miss", "ConnectTimeout"),
+        ("shared", "ConnectTimeout"),
+    ]
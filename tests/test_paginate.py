@@ -0,0 +1,151 @@
+import asyncio
+import httpx
+import pytest
+from conftest import STATISTICS, parse_modes
+
+KUDOSU_TOTAL = 120
+RANKING_PAGES = 3
+
+
+def kudosu(request: httpx.Request) -> httpx.Response:
+    offset = int(request.url.params.get("offset", 0))
+    limit = int(request.url.params["limit"])
+    return httpx.Response(
+        200,
+        json=[
+            {
+                "id": i,
+                "action": "vote.give",
+                "account": None,
+                "model": "beatmap_discussion",
+                "created_at": "2020-01-01T00:00:00Z",
+                "giver": {"url": "https://osu.ppy.sh/users/2", "username": "peppy"},
+                "post": {"url": None, "title": "Title"},
+            }
+            for i in range(offset, min(offset + limit, KUDOSU_TOTAL))
+        ],
+    )
+
+
+def ranking(request: httpx.Request) -> httpx.Response:
+    page = int(request.url.params.get("cursor[page]", 1))
+    return httpx.Response(
+        200,
+        json={
+            "ranking": [
+                dict(STATISTICS, global_rank=(page - 1) * 50 + i + 1) for i in range(50)
+            ],
+            "cursor": {"page": page + 1} if page < RANKING_PAGES else None,
+            "total": 50 * RANKING_PAGES,
+        },
+    )
+
+
+def pages(mock, name: str) -> list:
+    return [request.url.params.get(name) for request in mock.requests]
+
+
+def test_offset_pages_until_a_short_page(mock_api, sync_client):
+    mock = mock_api(kudosu)
+    api = sync_client(mock)
+    items = list(api.paginate("user_kudosu", user_id=2, page_size=50))
+    assert [item.id for item in items] == list(range(KUDOSU_TOTAL))
+    assert pages(mock, "offset") == [None, "50", "100"]
+    assert pages(mock, "limit") == ["50", "50", "50"]
+
+
+def test_offset_pages_stop_at_max_items(mock_api, sync_client):
+    mock = mock_api(kudosu)
+    api = sync_client(mock)
+    items = list(
+        api.paginate("user_kudosu", user_id=2, offset="10", max_items=45, page_size=20)
+    )
+    assert [item.id for item in items] == list(range(10, 55))
+    assert pages(mock, "offset") == ["10", "30", "50"]
+    assert pages(mock, "limit") == ["20", "20", "5"]
+
+
+def test_cursor_pages_until_the_cursor_is_null(mock_api, sync_client):
+    mock = mock_api(ranking)
+    api = sync_client(mock)
+    items = list(api.paginate("ranking", mode="osu", Type="performance"))
+    assert [item.global_rank for item in items] == list(range(1, 151))
+    assert pages(mock, "cursor[page]") == [None, "2", "3"]
+
+
+def test_cursor_pages_start_at_the_cursor(mock_api, sync_client):
+    mock = mock_api(ranking)
+    api = sync_client(mock)
+    items = list(
+        api.paginate("ranking", mode="osu", Type="performance", cursor=2, max_items=60)
+    )
+    assert [item.global_rank for item in items] == list(range(51, 111))
+    assert pages(mock, "cursor[page]") == ["2", "3"]
+
+
+def test_error_response_stops_paging(mock_api, sync_client):
+    def second_page_fails(request):
+        if request.url.params.get("offset"):
+            return httpx.Response(500, json={"error": None})
+        return kudosu(request)
+
+    mock = mock_api(second_page_fails)
+    api = sync_client(mock)
+    items = list(api.paginate("user_kudosu", user_id=2, page_size=50))
+    assert len(items) == 50
+    assert len(mock.requests) == 2
+
+
+def test_async_paginate(mock_api, async_client):
+    def routes(request):
+        if "rankings" in request.url.path:
+            return ranking(request)
+        return kudosu(request)
+
+    mock = mock_api(routes)
+
+    async def main():
+        api = async_client(mock)
+        items = [
+            item
+            async for item in api.paginate(
+                "user_kudosu", user_id=2, max_items=70, page_size=50
+            )
+        ]
+        ranks = [
+            item.global_rank
+            async for item in api.paginate("ranking", mode="osu", Type="performance")
+        ]
+        await api.aclose()
+        return items, ranks
+
+    items, ranks = asyncio.run(main())
+    assert [item.id for item in items] == list(range(70))
+    assert ranks == list(range(1, 151))
+    assert pages(mock, "offset")[:2] == [None, "50"]
+    assert pages(mock, "limit")[:2] == ["50", "20"]
+
+
+@pytest.mark.parametrize("parse_mode", parse_modes)
+def test_cursor_pages_of_a_projection(mock_api, sync_client, async_client, parse_mode):
+    mock = mock_api(ranking)
+    api = sync_client(mock, parse_mode=parse_mode)
+    items = list(
+        api.paginate("ranking", mode="osu", Type="performance", fields=["ranking.pp"])
+    )
+    assert len(items) == 150
+    assert int(items[0].pp) == 12000
+    assert pages(mock, "cursor[page]") == [None, "2", "3"]
+
+    async def main():
+        api = async_client(mock, parse_mode=parse_mode)
+        items = [
+            item
+            async for item in api.paginate(
+                "ranking", mode="osu", Type="performance", fields=["ranking.pp"]
+            )
+        ]
+        await api.aclose()
+        return items
+
+    assert len(asyncio.run(main())) == 150
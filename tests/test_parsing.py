@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+import pytest
+from pydantic import parse_obj_as
+from losuapi.parsing import parse
+from losuapi.types import Beatmap, User
+from conftest import BEATMAP, user
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["2007-08-28T03:09:12Z", "2007-08-28T03:09:12+00:00", 1188270552, "1188270552"],
+)
+def test_construct_parses_datetimes_like_validation(value):
+    payload = dict(user(), join_date=value)
+    constructed = parse(User, payload, "construct")
+    assert constructed.join_date == parse_obj_as(User, payload).join_date
+    assert constructed.join_date == datetime(2007, 8, 28, 3, 9, 12, tzinfo=timezone.utc)
+
+
+def test_construct_keeps_missing_datetimes():
+    beatmap = parse(Beatmap, dict(BEATMAP, deleted_at=None), "construct")
+    assert beatmap.deleted_at is None
+    assert beatmap.last_updated == datetime(2020, 1, 1, tzinfo=timezone.utc)
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import httpx
+from losuapi import AsyncOsuApiPool, OsuApiPool
+from conftest import TOKEN, MockApi, user
+
+CREDENTIALS = [(1, "one"), (2, "two"), (3, "three")]
+
+
+class PoolApi(MockApi):
+    """MockApi giving every client_id its own token, "Bearer {client_id}"."""
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/oauth/token":
+            self.token_requests += 1
+            client_id = json.loads(request.content)["client_id"]
+            return httpx.Response(200, json=dict(TOKEN, access_token=str(client_id)))
+        return super()._handle(request)
+
+    def credentials(self) -> list[int]:
+        """client_id of every api request, in order."""
+        return [
+            int(request.headers["Authorization"].split()[1])
+            for request in self.requests
+        ]
+
+
+def ok(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=user())
+
+
+def test_throttled_request_fails_over_to_another_credential():
+    def first_is_limited(request):
+        if request.headers["Authorization"] == "Bearer 1":
+            return httpx.Response(
+                429, json={"error": None}, headers={"Retry-After": "60"}
+            )
+        return ok(request)
+
+    mock = PoolApi(first_is_limited)
+    pool = OsuApiPool(CREDENTIALS[:2], transport=mock.transport)
+    assert pool.user(2).id == 2
+    assert mock.credentials() == [1, 2]
+    assert pool.stats()[0]["throttled"]
+    # the paused credential is passed over until its Retry-After is up
+    assert pool.user(2).id == 2
+    assert mock.credentials() == [1, 2, 2]
+    pool.close()
+
+
+def test_error_of_an_unthrottled_credential_is_returned():
+    mock = PoolApi(lambda request: httpx.Response(404, json={"error": None}))
+    pool = OsuApiPool(CREDENTIALS[:2], transport=mock.transport)
+    assert pool.user(2) is None
+    assert mock.credentials() == [1]
+    pool.close()
+
+
+def test_round_robin_skips_throttled_credentials():
+    mock = PoolApi(ok)
+    pool = OsuApiPool(CREDENTIALS, strategy="round_robin", transport=mock.transport)
+    for _ in range(4):
+        pool.user(2)
+    assert mock.credentials() == [1, 2, 3, 1]
+
+    pool.clients[1].rate_limiter.pause(60)
+    for _ in range(4):
+        pool.user(2)
+    assert mock.credentials()[4:] == [3, 1, 3, 1]
+    pool.close()
+
+
+def test_least_loaded_picks_the_credential_with_fewer_requests_in_flight():
+    release = asyncio.Event()
+
+    async def slow_user(request):
+        if request.url.path.endswith("/slow/"):
+            await release.wait()
+        return ok(request)
+
+    mock = PoolApi(slow_user)
+
+    async def main():
+        pool = AsyncOsuApiPool(CREDENTIALS[:2], transport=mock.transport)
+        slow = asyncio.ensure_future(pool.user("slow"))
+        while not mock.requests:
+            await asyncio.sleep(0)
+        assert pool.stats()[0]["in_flight"] == 1
+        for _ in range(3):
+            await pool.user(2)
+        release.set()
+        await slow
+        await pool.aclose()
+
+    asyncio.run(main())
+    assert mock.credentials() == [1, 2, 2, 2]
@@ -0,0 +1,68 @@
+import importlib.util
+import multiprocessing
+import pytest
+from losuapi import FileRateLimiter, RateLimiter
+
+requires_fcntl = pytest.mark.skipif(
+    importlib.util.find_spec("fcntl") is None, reason="fcntl is not available"
+)
+
+
+def test_burst_is_free_then_requests_wait():
+    limiter = RateLimiter(rate=10, burst=3)
+    assert [limiter.reserve() for _ in range(3)] == [0, 0, 0]
+    assert limiter.reserve() == pytest.approx(0.1, abs=0.01)
+    assert limiter.throttled
+
+
+def test_retry_after_pauses_the_bucket():
+    limiter = RateLimiter(rate=100, burst=10)
+    limiter.update(429, {"Retry-After": "2"})
+    assert limiter.wait_time() == pytest.approx(2, abs=0.05)
+
+
+def test_rate_limit_header_lowers_the_rate():
+    limiter = RateLimiter(rate=10, burst=10)
+    limiter.update(200, {"X-RateLimit-Limit": "60", "X-RateLimit-Remaining": "0"})
+    assert limiter.rate == 1
+    assert limiter.throttled
+
+
+@requires_fcntl
+def test_file_limiters_share_one_bucket(tmp_path):
+    path = str(tmp_path / "bucket")
+    first = FileRateLimiter(path, rate=1, burst=4)
+    second = FileRateLimiter(path, rate=1, burst=4)
+    assert [first.reserve(), second.reserve(), first.reserve(), second.reserve()] == [
+        0,
+        0,
+        0,
+        0,
+    ]
+    assert second.reserve() > 0.9
+    assert first.throttled
+
+
+def _reserve(path: str, start, free) -> None:
+    limiter = FileRateLimiter(path, rate=0.001, burst=40000)
+    start.wait()
+    free.put(sum(limiter.reserve() == 0 for _ in range(20000)))
+
+
+@requires_fcntl
+def test_processes_share_one_budget(tmp_path):
+    path = str(tmp_path / "bucket")
+    FileRateLimiter(path, rate=0.001, burst=40000)
+    context = multiprocessing.get_context("fork")
+    start, free = context.Event(), context.Queue()
+    processes = [
+        context.Process(target=_reserve, args=(path, start, free)) for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    start.set()
+    counts = [free.get(timeout=10) for _ in processes]
+    for process in processes:
+        process.join()
+    # 80000 reservations from 4 processes, only the burst of 40000 is free
+    assert sum(counts) == 40000
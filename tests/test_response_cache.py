@@ -0,0 +1,84 @@
+import sys
+import types
+import httpx
+import pytest
+from losuapi import ResponseCache
+from conftest import user
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the clock of ResponseCache with one the test moves forward."""
+    clock = types.SimpleNamespace(now=1000.0)
+    clock.monotonic = lambda: clock.now
+    monkeypatch.setattr(sys.modules["losuapi.ResponseCache"], "time", clock)
+    return clock
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = ResponseCache(ttl=60, ttls={"user": 10})
+    cache.set("user", "key", "peppy")
+    cache.set("other", "key", "value")
+    clock.now += 9
+    assert cache.get("user", "key") == "peppy"
+    clock.now += 2
+    assert cache.get("user", "key") is None
+    assert cache.get("other", "key") == "value"
+    clock.now += 50
+    assert cache.get("other", "key") is None
+    assert len(cache) == 0
+
+
+def test_ttl_of_zero_disables_an_endpoint():
+    cache = ResponseCache(ttls={"user": 0})
+    cache.set("user", "key", "peppy")
+    assert cache.get("user", "key") is None
+    assert len(cache) == 0
+    assert cache.stats()["misses"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(maxsize=2)
+    cache.set("beatmap", 1, "first")
+    cache.set("beatmap", 2, "second")
+    assert cache.get("beatmap", 1) == "first"
+    cache.set("beatmap", 3, "third")
+    assert cache.get("beatmap", 2) is None
+    assert cache.get("beatmap", 1) == "first"
+    assert cache.get("beatmap", 3) == "third"
+    assert len(cache) == 2
+
+
+def test_hit_and_miss_counters():
+    cache = ResponseCache(maxsize=8)
+    cache.get("beatmap", 1)
+    cache.set("beatmap", 1, "first")
+    cache.set("beatmap", 2, None)
+    cache.get("beatmap", 1)
+    cache.get("beatmap", 1)
+    cache.get("beatmap", 2)
+    assert cache.stats() == {"hits": 2, "misses": 2, "size": 1, "maxsize": 8}
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 8}
+
+
+def test_cache_hit_sends_no_request(mock_api, sync_client):
+    mock = mock_api(lambda request: httpx.Response(200, json=user()))
+    cache = ResponseCache()
+    api = sync_client(mock, cache=cache)
+    first = api.user(2)
+    assert api.user(2) is first
+    assert len(mock.requests) == 1
+    # other arguments and fields= selections are cached apart
+    api.user(2, mode="osu")
+    api.user(2, fields=["id"])
+    assert len(mock.requests) == 3
+    assert cache.stats()["hits"] == 1
+
+
+def test_error_responses_are_not_cached(mock_api, sync_client):
+    mock = mock_api(lambda request: httpx.Response(404, json={"error": None}))
+    api = sync_client(mock, cache=ResponseCache())
+    assert api.user(2) is None
+    assert api.user(2) is None
+    assert len(mock.requests) == 2
@@ -0,0 +1,125 @@
+import asyncio
+import sqlite3
+import sys
+import types
+import httpx
+import pytest
+from losuapi import CacheRule, SqliteCache
+from conftest import BEATMAP
+
+
+def beatmaps(request: httpx.Request) -> httpx.Response:
+    # beatmap ids above 100 are not ranked
+    if request.url.path.endswith("/beatmaps"):
+        ids = [int(i) for i in request.url.params.get_list("ids[]")]
+        return httpx.Response(200, json={"beatmaps": [beatmap(i) for i in ids]})
+    return httpx.Response(200, json=beatmap(int(request.url.path.split("/")[-1])))
+
+
+def beatmap(beatmap_id: int) -> dict:
+    return dict(
+        BEATMAP, id=beatmap_id, status="ranked" if beatmap_id <= 100 else "pending"
+    )
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / "cache.sqlite3")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the clock of SqliteCache with one the test moves forward."""
+    clock = types.SimpleNamespace(now=1000.0)
+    clock.time = lambda: clock.now
+    monkeypatch.setattr(sys.modules["losuapi.SqliteCache"], "time", clock)
+    return clock
+
+
+def test_ranked_beatmaps_are_stored(mock_api, sync_client, path):
+    mock = mock_api(beatmaps)
+    api = sync_client(mock, persistent_cache=SqliteCache(path))
+    assert api.beatmap(75).id == 75
+    assert api.beatmap(75).id == 75
+    assert api.beatmaps([1, 2]).beatmaps[1].id == 2
+    assert api.beatmaps([1, 2]).beatmaps[1].id == 2
+    assert len(mock.requests) == 2
+
+
+def test_unranked_beatmaps_are_not_stored(mock_api, sync_client, path):
+    mock = mock_api(beatmaps)
+    api = sync_client(mock, persistent_cache=SqliteCache(path))
+    api.beatmap(101)
+    api.beatmap(101)
+    # one unranked beatmap keeps the whole response out of the cache
+    api.beatmaps([1, 101])
+    api.beatmaps([1, 101])
+    assert len(mock.requests) == 4
+
+
+def test_endpoints_without_a_rule_are_not_stored(path):
+    cache = SqliteCache(path, rules={"beatmap": None})
+    assert not cache.stores("beatmap")
+    assert not cache.stores("user")
+    cache.set("user", "key", b"{}", {})
+    assert cache.get("user", "key") is None
+
+
+def test_responses_expire_after_their_ttl(path, clock):
+    cache = SqliteCache(path, rules={"spotlights": CacheRule(ttl=60)})
+    cache.set("spotlights", "key", b"{}", {})
+    clock.now += 59
+    assert cache.get("spotlights", "key") == b"{}"
+    clock.now += 2
+    assert cache.get("spotlights", "key") is None
+    cache.purge()
+    count = sqlite3.connect(path).execute("SELECT count(*) FROM responses")
+    assert count.fetchone() == (0,)
+
+
+def test_invalidate(path):
+    cache = SqliteCache(path)
+    cache.set("beatmap", "one", b"1", {"status": "ranked"})
+    cache.set("spotlights", "one", b"2", {})
+    cache.invalidate("beatmap")
+    assert cache.get("beatmap", "one") is None
+    assert cache.get("spotlights", "one") == b"2"
+    cache.invalidate()
+    assert cache.get("spotlights", "one") is None
+
+
+def test_new_client_warm_starts_from_the_file(mock_api, sync_client, path):
+    mock = mock_api(beatmaps)
+    sync_client(mock, persistent_cache=SqliteCache(path)).beatmap(75)
+    api = sync_client(mock, persistent_cache=SqliteCache(path), parse_mode="lazy")
+    assert api.beatmap(75).id == 75
+    assert len(mock.requests) == 1
+
+
+def test_async_client_waits_for_a_write_lock_off_the_event_loop(
+    mock_api, async_client, path
+):
+    mock = mock_api(beatmaps)
+    cache = SqliteCache(path, timeout=5)
+    lock = sqlite3.connect(path, isolation_level=None)
+    lock.execute("BEGIN IMMEDIATE")
+
+    async def release():
+        # only runs if the event loop is free while the write waits for the lock
+        await asyncio.sleep(0.1)
+        lock.rollback()
+
+    async def main():
+        api = async_client(mock, persistent_cache=cache)
+        task = asyncio.ensure_future(release())
+        result = await api.beatmap(75)
+        await task
+        cached = await api.beatmap(75)
+        await api.aclose()
+        return result, cached
+
+    result, cached = asyncio.run(main())
+    lock.close()
+    assert result.id == cached.id == 75
+    # the second call was read back from the file
+    assert len(mock.requests) == 1